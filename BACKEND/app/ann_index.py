@@ -0,0 +1,87 @@
+# Approximate nearest-neighbour retrieval over the L2-normalized TF-IDF rows
+# Random-hyperplane LSH: each table hashes a row to the signs of n_bits random projections,
+# rows sharing a bucket with the query (or a probed neighbour bucket) are re-ranked by exact cosine
+import numpy as np
+from scipy.sparse import csr_matrix
+
+ROWS_PER_BUCKET = 32  # Target bucket size used to pick n_bits from the row count (fewer bits: higher recall, more re-ranking)
+PROJECTION_CHUNK = 10000  # Rows projected at once while building, bounds the dense scratch space
+
+
+class LSHIndex:
+    """Sub-linear top-N cosine retrieval for a fixed sparse matrix"""
+
+    def __init__(self, matrix: csr_matrix, n_tables: int = 8, n_bits: int = None, n_probes: int = None, seed: int = 0):
+        self.matrix = matrix
+        self.n_tables = n_tables
+        self.n_bits = n_bits or int(np.clip(np.log2(max(matrix.shape[0], 1) / ROWS_PER_BUCKET), 4, 24))
+        self.n_probes = self.n_bits if n_probes is None else min(n_probes, self.n_bits)
+
+        # Only columns used by some row matter: a query term no row has cannot change any cosine
+        active_columns = np.unique(matrix.indices)
+        self.column_map = np.full(matrix.shape[1], -1, dtype=np.int64)
+        self.column_map[active_columns] = np.arange(len(active_columns))
+
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.standard_normal((len(active_columns), n_tables * self.n_bits)).astype(np.float32)
+        self._bit_weights = (np.uint64(1) << np.arange(self.n_bits, dtype=np.uint64))
+
+        # Bucket key of every row in every table, plus rows sorted by key for range lookups
+        keys = np.empty((matrix.shape[0], n_tables), dtype=np.uint64)
+        for start in range(0, matrix.shape[0], PROJECTION_CHUNK):
+            chunk = self._active(matrix[start:start + PROJECTION_CHUNK]).astype(np.float32)
+            keys[start:start + PROJECTION_CHUNK] = self._keys(np.asarray(chunk @ self.hyperplanes))
+        self.order = np.argsort(keys, axis=0, kind='stable').T.copy()  # (n_tables, rows)
+        self.sorted_keys = np.take_along_axis(keys, self.order.T, axis=0).T.copy()
+
+    @property
+    def nbytes(self) -> int:
+        return (self.hyperplanes.nbytes + self.column_map.nbytes +
+                self.order.nbytes + self.sorted_keys.nbytes)
+
+    def _active(self, vectors: csr_matrix) -> csr_matrix:
+        # Re-index columns to the active set, dropping the others
+        columns = self.column_map[vectors.indices]
+        keep = columns >= 0
+        rows = np.repeat(np.arange(vectors.shape[0]), np.diff(vectors.indptr))
+        return csr_matrix((vectors.data[keep], (rows[keep], columns[keep])),
+                          shape=(vectors.shape[0], self.hyperplanes.shape[0]))
+
+    def _keys(self, projections: np.ndarray) -> np.ndarray:
+        # Sign bits of the projections packed into one key per table
+        bits = (projections > 0).reshape(projections.shape[0], self.n_tables, self.n_bits).astype(np.uint64)
+        return (bits * self._bit_weights).sum(axis=2, dtype=np.uint64)
+
+    def _query_probes(self, vector: csr_matrix) -> np.ndarray:
+        # A query has few terms: project with just their hyperplane rows. Each table probes the
+        # query's bucket plus the n_probes buckets reached by flipping its least certain bits
+        # (projections closest to zero), where near neighbours that missed the bucket most likely are
+        columns = self.column_map[vector.indices]
+        keep = columns >= 0
+        projection = vector.data[keep].astype(np.float32) @ self.hyperplanes[columns[keep]]
+        keys = self._keys(projection[np.newaxis, :])[0]
+        uncertain = np.argsort(np.abs(projection).reshape(self.n_tables, self.n_bits), axis=1)[:, :self.n_probes]
+        flips = keys[:, np.newaxis] ^ self._bit_weights[uncertain]
+        return np.concatenate([keys[:, np.newaxis], flips], axis=1)
+
+    def candidates(self, vector: csr_matrix) -> np.ndarray:
+        """Rows in the query's bucket or one of its probed neighbour buckets, in any table"""
+        found = []
+        for table, probes in enumerate(self._query_probes(vector)):
+            lo = np.searchsorted(self.sorted_keys[table], probes, side='left')
+            hi = np.searchsorted(self.sorted_keys[table], probes, side='right')
+            for start, end in zip(lo, hi):
+                if end > start:
+                    found.append(self.order[table, start:end])
+        return np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+
+    def query(self, vector: csr_matrix, top_n: int) -> np.ndarray:
+        """Approximate top-N rows by cosine similarity to an L2-normalized query, best first"""
+        rows = self.candidates(vector)
+        if len(rows) == 0:
+            return rows
+        similarities = (self.matrix[rows] @ vector.T).toarray().ravel()
+        if len(rows) > top_n:
+            best = np.argpartition(-similarities, top_n - 1)[:top_n]
+            rows, similarities = rows[best], similarities[best]
+        return rows[np.argsort(-similarities, kind='stable')]
@@ -0,0 +1,411 @@
+# Cache backends: in-process LRU/TTL cache and shared stores for multi-worker deployments
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Backend selection: memory (per worker), sqlite (shared file) or redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "./cache.sqlite3")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class CacheBackend(ABC):
+    """Interface shared by all cache backends"""
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for key, default when missing or expired"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting as the limits require"""
+
+    @abstractmethod
+    def delete(self, key: Hashable):
+        """Drop key if present"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every entry of this cache"""
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Counters and current usage of the cache"""
+
+
+class LRUCache(CacheBackend):
+    """LRU cache with O(1) get/set/evict, a fixed TTL and limits on entry count and total bytes"""
+
+    def __init__(self, max_entries: int = 100, max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size), LRU first
+        self._expiry: "OrderedDict[Hashable, float]" = OrderedDict()  # key -> expires_at, oldest write first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # Larger than the whole budget, never cache it
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+            if self.ttl is not None:
+                self._expiry[key] = time.monotonic() + self.ttl
+
+            self._expire()
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expiry.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Counters and current usage of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def _remove(self, key: Hashable):
+        # Caller holds the lock
+        _, size = self._entries.pop(key)
+        self._expiry.pop(key, None)
+        self._bytes -= size
+
+    def _expire(self):
+        # TTL is fixed, so write order is expiry order and only the oldest writes need checking
+        now = time.monotonic()
+        while self._expiry:
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self._remove(key)
+            self.expirations += 1
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache in a local SQLite file shared by every worker on the host"""
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 100, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+
+        # Counters are per worker, entries and bytes come from the shared file
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_lru ON cache_entries (namespace, accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread, WAL lets readers and one writer work concurrently
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, str(key))
+        ).fetchone()
+
+        if row is None or (row[1] is not None and row[1] <= now):
+            if row is not None:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, str(key)))
+            self.misses += 1
+            return default
+
+        conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                     (now, self.namespace, str(key)))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key: Hashable, value: Any):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            return
+
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.namespace, str(key), payload, len(payload), expires_at, now)
+        )
+        self._evict(now)
+
+    def _evict(self, now: float):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?", (self.namespace, now))
+
+        entries, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        over_count = max(entries - self.max_entries, 0)
+        if self.max_bytes is not None and total_bytes > self.max_bytes:
+            # Count the least recently used entries that must go to get back under the budget
+            excess_bytes = total_bytes - self.max_bytes
+            over_bytes_count = 0
+            for (size,) in conn.execute(
+                "SELECT size FROM cache_entries WHERE namespace = ? ORDER BY accessed_at", (self.namespace,)
+            ):
+                if excess_bytes <= 0:
+                    break
+                excess_bytes -= size
+                over_bytes_count += 1
+            over_count = max(over_count, over_bytes_count)
+
+        if over_count:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                "SELECT rowid FROM cache_entries WHERE namespace = ? ORDER BY accessed_at LIMIT ?)",
+                (self.namespace, over_count)
+            )
+            self.evictions += over_count
+
+    def delete(self, key: Hashable):
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, str(key)))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def stats(self) -> Dict:
+        entries, total_bytes = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "worker_pid": os.getpid(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache in a Redis-protocol server shared by every worker
+    Entry sizes and last access times are tracked next to the entries so max_entries and max_bytes
+    are enforced least recently used first; entries the server expires are dropped from the totals
+    when next looked up or evicted, so the totals can briefly overstate usage, never understate it
+    """
+
+    def __init__(self, url: str, namespace: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, client=None):
+        if client is None and not REDIS_AVAILABLE:
+            raise RuntimeError("redis package not installed")
+        self.client = client if client is not None else redis.Redis.from_url(url)
+        self.url = url
+        self.prefix = f"cache:{namespace}:"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # Bookkeeping keys, outside the entry prefix so clear() and scans never mistake them for entries
+        self.lru_key = f"cache:{namespace}#lru"  # sorted set: entry key -> last access time
+        self.sizes_key = f"cache:{namespace}#sizes"  # hash: entry key -> payload bytes
+        self.bytes_key = f"cache:{namespace}#bytes"  # counter: sum of sizes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry_key = self.prefix + str(key)
+        payload = self.client.get(entry_key)
+        if payload is None:
+            self._forget([entry_key])  # Expired by the server, drop it from the totals
+            self.misses += 1
+            return default
+        self.client.zadd(self.lru_key, {entry_key: time.time()})
+        self.hits += 1
+        return pickle.loads(payload)
+
+    def set(self, key: Hashable, value: Any):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            return  # Larger than the whole budget, never cache it
+
+        entry_key = self.prefix + str(key)
+        old_size = int(self.client.hget(self.sizes_key, entry_key) or 0)
+        pipe = self.client.pipeline()
+        pipe.set(entry_key, payload, ex=int(self.ttl) if self.ttl else None)
+        pipe.hset(self.sizes_key, entry_key, len(payload))
+        pipe.zadd(self.lru_key, {entry_key: time.time()})
+        pipe.incrby(self.bytes_key, len(payload) - old_size)
+        pipe.execute()
+        self._evict()
+
+    def _evict(self, batch_size: int = 16):
+        while True:
+            excess_entries = self.client.zcard(self.lru_key) - self.max_entries if self.max_entries is not None else 0
+            excess_bytes = int(self.client.get(self.bytes_key) or 0) - self.max_bytes if self.max_bytes is not None else 0
+            if excess_entries <= 0 and excess_bytes <= 0:
+                return
+
+            # Least recently used first, only as many as it takes to get back under both limits
+            victims = []
+            for entry_key in self.client.zrange(self.lru_key, 0, batch_size - 1):
+                if excess_entries <= 0 and excess_bytes <= 0:
+                    break
+                victims.append(entry_key)
+                excess_entries -= 1
+                excess_bytes -= int(self.client.hget(self.sizes_key, entry_key) or 0)
+            if not victims:
+                return
+            self.evictions += self._forget(victims, delete=True)
+
+    def _forget(self, entry_keys, delete: bool = False) -> int:
+        # Remove entries from the bookkeeping (and the store), returns how many were tracked
+        sizes = [self.client.hget(self.sizes_key, entry_key) for entry_key in entry_keys]
+        tracked = [(entry_key, int(size)) for entry_key, size in zip(entry_keys, sizes) if size is not None]
+        if not tracked and not delete:
+            return 0
+        pipe = self.client.pipeline()
+        if delete:
+            pipe.delete(*entry_keys)
+        for entry_key, size in tracked:
+            pipe.hdel(self.sizes_key, entry_key)
+            pipe.zrem(self.lru_key, entry_key)
+            pipe.incrby(self.bytes_key, -size)
+        pipe.execute()
+        return len(tracked)
+
+    def delete(self, key: Hashable):
+        self._forget([self.prefix + str(key)], delete=True)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*", count=500))
+        for start in range(0, len(keys), 500):
+            self.client.delete(*keys[start:start + 500])
+        self.client.delete(self.lru_key, self.sizes_key, self.bytes_key)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "entries": self.client.zcard(self.lru_key),
+            "max_entries": self.max_entries,
+            "bytes": int(self.client.get(self.bytes_key) or 0),
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "worker_pid": os.getpid(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+
+def create_cache_backend(namespace: str, max_entries: int = 100, max_bytes: Optional[int] = None,
+                         ttl: Optional[float] = None, sizeof: Callable[[Any], int] = estimate_size,
+                         backend: str = CACHE_BACKEND) -> CacheBackend:
+    """Build the configured cache backend, falling back to the in-process cache"""
+    try:
+        if backend == "sqlite":
+            return SQLiteCacheBackend(CACHE_SQLITE_PATH, namespace, max_entries=max_entries,
+                                      max_bytes=max_bytes, ttl=ttl)
+        if backend == "redis":
+            return RedisCacheBackend(CACHE_REDIS_URL, namespace, max_entries=max_entries,
+                                     max_bytes=max_bytes, ttl=ttl)
+    except Exception as e:
+        logger.warning(f"Cache backend '{backend}' unavailable ({e}), using in-process cache")
+
+    return LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, sizeof=sizeof)
@@ -0,0 +1,200 @@
+# In-process columnar snapshot of the internship catalog used for scoring
+import os
+import time
+import threading
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from app import models
+from app.name_lookup import LOCATION_ALIASES, SECTOR_ALIASES, NameLookup
+from app.scoring import ScoringColumn
+from app.skill_index import SkillIndex
+
+logger = logging.getLogger(__name__)
+
+CATALOG_REFRESH_SECONDS = int(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+
+
+def _lookup_table(pairs) -> List[Optional[str]]:
+    # Dense id -> value list, index 0 (and gaps) stand for a missing row
+    pairs = list(pairs)
+    table = [None] * (max((pk for pk, _ in pairs), default=0) + 1)
+    for pk, value in pairs:
+        table[pk] = value
+    return table
+
+
+def _factorize(values: Sequence[Optional[str]]):
+    # Integer codes per row plus the distinct values they point to
+    lookup = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in values), dtype=np.int32, count=len(values))
+    return codes, list(lookup)
+
+
+class CatalogSnapshot:
+    """Read-only, array-backed view of all internships and their reference data"""
+
+    def __init__(self, rows: Sequence, skills: Dict[int, str], sectors: Dict[int, str],
+                 locations: Dict[int, str], educations: Dict[int, str],
+                 additional_skills: Dict[int, List[int]]):
+        # Reference data as dense id-indexed lookup tables
+        self.skill_names = _lookup_table(skills.items())
+        self.sector_names = _lookup_table(sectors.items())
+        self.location_names = _lookup_table(locations.items())
+        self.education_names = _lookup_table(educations.items())
+
+        # Preprocessed tokens for sector matching
+        self.sector_tokens = [name.lower() if name else "" for name in self.sector_names]
+
+        # Free-text sector/location preferences resolved to ids without touching the database
+        self.sector_lookup = NameLookup(sectors, SECTOR_ALIASES)
+        self.location_lookup = NameLookup(locations, LOCATION_ALIASES)
+
+        count = len(rows)
+        self.ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=count)
+        self.skill_ids = np.fromiter((row.skills_id or 0 for row in rows), dtype=np.int32, count=count)
+        self.sector_ids = np.fromiter((row.sector_id or 0 for row in rows), dtype=np.int32, count=count)
+        self.location_ids = np.fromiter((row.location_id or 0 for row in rows), dtype=np.int32, count=count)
+        self.edu_ids = np.fromiter((row.edu_id or 0 for row in rows), dtype=np.int32, count=count)
+
+        # Free-text columns are factorized so repeated values are stored once
+        self.title_codes, self.titles = _factorize([row.title for row in rows])
+        self.company_codes, self.companies = _factorize([row.company_name for row in rows])
+        self.duration_codes, self.durations = _factorize([row.duration for row in rows])
+        self.description_codes, self.descriptions = _factorize([row.description for row in rows])
+
+        self.additional_skill_ids = [
+            sorted(set(sid for sid in additional_skills.get(row.id, []) if 0 < sid < len(self.skill_names)))
+            for row in rows
+        ]
+
+        # Skill posting lists matching this snapshot, set by InternshipCatalog when it is published
+        self.skill_postings = None
+
+        self.built_at = time.time()
+        self._fingerprint = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of everything recommendations are computed from, equal across snapshots of unchanged data"""
+        if self._fingerprint is None:
+            digest = hashlib.md5()
+            for column in (self.ids, self.skill_ids, self.sector_ids, self.location_ids, self.edu_ids,
+                           self.title_codes, self.company_codes, self.duration_codes, self.description_codes):
+                digest.update(np.ascontiguousarray(column).tobytes())
+            digest.update(json.dumps([self.skill_names, self.sector_names, self.location_names, self.education_names,
+                                      self.titles, self.companies, self.durations, self.descriptions,
+                                      self.additional_skill_ids]).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def positions(self, internship_ids) -> np.ndarray:
+        """Snapshot positions of the given ids, ids missing from the snapshot are dropped"""
+        ids = np.asarray(internship_ids, dtype=np.int64)
+        pos = np.searchsorted(self.ids, ids)
+        pos = np.minimum(pos, max(len(self.ids) - 1, 0))
+        found = self.ids[pos] == ids if len(self.ids) else np.zeros(len(ids), dtype=bool)
+        return pos[found]
+
+    def scoring_columns(self, pos: np.ndarray) -> Dict[str, ScoringColumn]:
+        """Integer-coded columns for the batch scorers in app.scoring"""
+        return {
+            'skill': (self.skill_ids[pos], self.skill_names),
+            'sector': (self.sector_ids[pos], self.sector_names),
+            'location': (self.location_ids[pos], self.location_names),
+            'education': (self.edu_ids[pos], self.education_names),
+            'description': (self.description_codes[pos], self.descriptions)
+        }
+
+    def sector_contained_in(self, pos: np.ndarray, text: str) -> np.ndarray:
+        """Rows at pos whose sector name appears inside text"""
+        text = text.lower()
+        sector_hits = np.array([bool(token) and token in text for token in self.sector_tokens], dtype=bool)
+        return sector_hits[self.sector_ids[pos]]
+
+    def skills_of(self, position: int) -> List[str]:
+        """Skill names of one row, primary skill first"""
+        primary = int(self.skill_ids[position])
+        skills = [self.skill_names[primary]] if primary else []
+        skills.extend(self.skill_names[sid] for sid in self.additional_skill_ids[position])
+        return skills
+
+    def record(self, position: int) -> Dict:
+        """Plain dict with the display fields of one row"""
+        return {
+            "id": int(self.ids[position]),
+            "title": self.titles[self.title_codes[position]],
+            "company_name": self.companies[self.company_codes[position]],
+            "sector": self.sector_names[self.sector_ids[position]],
+            "location": self.location_names[self.location_ids[position]],
+            "duration": self.durations[self.duration_codes[position]],
+            "description": self.descriptions[self.description_codes[position]]
+        }
+
+
+def load_catalog(db: Session) -> CatalogSnapshot:
+    """Build a snapshot with a fixed number of column-only queries"""
+    start_time = time.time()
+    Internship = models.Internship
+    rows = db.query(
+        Internship.id, Internship.title, Internship.company_name, Internship.description,
+        Internship.duration, Internship.skills_id, Internship.edu_id,
+        Internship.sector_id, Internship.location_id
+    ).order_by(Internship.id).all()
+
+    skills = dict(db.query(models.Skill.id, models.Skill.description).all())
+    sectors = dict(db.query(models.Sector.id, models.Sector.name).all())
+    locations = dict(db.query(models.Location.id, models.Location.description).all())
+    educations = dict(db.query(models.Education.id, models.Education.description).all())
+    
+    additional_skills = {}
+    for internship_id, skill_id in db.query(models.internship_skills.c.internship_id,
+                                            models.internship_skills.c.skill_id):
+        additional_skills.setdefault(internship_id, []).append(skill_id)
+
+    snapshot = CatalogSnapshot(rows, skills, sectors, locations, educations, additional_skills)
+    logger.info(f"Catalog snapshot built with {len(snapshot)} internships in {time.time() - start_time:.2f}s")
+    return snapshot
+
+
+class InternshipCatalog:
+    """Holds the current snapshot, rebuilding it when invalidated or older than the refresh interval"""
+
+    def __init__(self, refresh_seconds: int = CATALOG_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.skill_index = SkillIndex()
+        self._snapshot = None
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale and time.time() - snapshot.built_at < self.refresh_seconds:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have rebuilt it while we waited
+            snapshot = self._snapshot
+            if snapshot is None or self._stale or time.time() - snapshot.built_at >= self.refresh_seconds:
+                self._stale = False
+                snapshot = load_catalog(db)
+                # Only postings of internships whose skills changed are touched
+                changed = self.skill_index.sync(snapshot)
+                logger.info(f"Skill index updated for {changed} internships")
+                snapshot.skill_postings = self.skill_index.freeze()
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self):
+        """Mark the snapshot stale so the next request rebuilds it"""
+        self._stale = True
+
+
+# Global instance
+internship_catalog = InternshipCatalog()
@@ -1,13 +1,72 @@
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app import models, schemas
-from typing import List
+from app.cache import create_cache_backend
+from app.catalog import internship_catalog
+from app.precomputed import data_version, precomputed_recommendations
+from app.reference_cache import reference_cache
+from app.serialization import dumps, loads
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+import os
 import hashlib
 import json
-from datetime import datetime, timedelta
+import numpy as np
 
-# Simple in-memory cache for recommendations
-recommendation_cache = {}
-cache_ttl = 300  # 5 minutes cache
+# Bounded LRU cache for recommendations, shared between workers when CACHE_BACKEND is sqlite or redis
+# Entries are the encoded response bodies, so a hit is returned without validation or JSON encoding
+cache_ttl = int(os.getenv("RECOMMENDATION_CACHE_TTL", "300"))  # 5 minutes cache
+recommendation_cache = create_cache_backend(
+    "recommendation_bodies",
+    max_entries=int(os.getenv("RECOMMENDATION_CACHE_ENTRIES", "1000")),
+    max_bytes=int(os.getenv("RECOMMENDATION_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    ttl=cache_ttl,
+    sizeof=len
+)
+
+# Validates recommendation dicts once, before their body is encoded and cached
+recommendation_list_adapter = TypeAdapter(List[schemas.RecommendationResponse])
+
+# Number of best-scoring internships considered for the diversity pass
+TOP_K_CANDIDATES = 50
+
+# Batch endpoint: most forms per request, and profiles vectorized and scored together per chunk
+MAX_BATCH_FORMS = int(os.getenv("RECOMMENDATION_BATCH_MAX", "5000"))
+BATCH_CHUNK_SIZE = 64
+
+# Internship listing: default and largest page, and rows fetched per round trip by the NDJSON export
+INTERNSHIP_PAGE_SIZE = int(os.getenv("INTERNSHIP_PAGE_SIZE", "100"))
+INTERNSHIP_PAGE_MAX = int(os.getenv("INTERNSHIP_PAGE_MAX", "1000"))
+INTERNSHIP_EXPORT_BATCH_SIZE = 1000
+
+
+def internship_filters(sector_ids: Optional[List[int]] = None, location_ids: Optional[List[int]] = None,
+                       skill_ids: Optional[List[int]] = None, education_ids: Optional[List[int]] = None,
+                       durations: Optional[List[str]] = None) -> list:
+    """
+    WHERE conditions on models.Internship shared by the search endpoint and the recommendation pre-filter
+    Values of one filter are alternatives, filters combine with AND; None skips a filter, an empty list matches nothing
+    """
+    conditions = []
+    if sector_ids is not None:
+        conditions.append(models.Internship.sector_id.in_(sector_ids))
+    if location_ids is not None:
+        conditions.append(models.Internship.location_id.in_(location_ids))
+    if education_ids is not None:
+        conditions.append(models.Internship.edu_id.in_(education_ids))
+    if durations is not None:
+        conditions.append(models.Internship.duration.in_(durations))
+    if skill_ids is not None:
+        # Primary skill, or an additional skill read from the (skill_id, internship_id) index
+        conditions.append(or_(
+            models.Internship.skills_id.in_(skill_ids),
+            models.Internship.id.in_(
+                select(models.internship_skills.c.internship_id).where(models.internship_skills.c.skill_id.in_(skill_ids))
+            )
+        ))
+    return conditions
 
 def get_cache_key(student_form: schemas.StudentForm, use_ml: bool) -> str:
     """Generate cache key from student form data"""
@@ -22,6 +81,23 @@ def get_cache_key(student_form: schemas.StudentForm, use_ml: bool) -> str:
     return hashlib.md5(json.dumps(form_data, sort_keys=True).encode()).hexdigest()
 
 
+def model_cache_key(use_ml: bool) -> str:
+    """
+    Model the recommendations are scored with, part of the recommendation cache key so workers still
+    serving an older model never share entries with newer ones through a shared cache backend
+    """
+    from .ml_scoring import recommendation_engine, ML_AVAILABLE
+    
+    if not (use_ml and ML_AVAILABLE):
+        return "rules"
+    # A model retrained by another worker is picked up from the model store first
+    recommendation_engine.reload_if_updated()
+    state = recommendation_engine.state
+    if not state.is_ready():
+        return "rules"
+    return f"{state.training_data_hash}:{state.similarity_mode}"
+
+
 class EducationCRUD:
     def get_all(self, db: Session) -> List[models.Education]:
         return db.query(models.Education).all()
@@ -34,6 +110,8 @@ class EducationCRUD:
         db.add(db_education)
         db.commit()
         db.refresh(db_education)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
         return db_education
 
 
@@ -54,6 +132,8 @@ class SectorCRUD:
         db.add(db_sector)
         db.commit()
         db.refresh(db_sector)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
         return db_sector
 
 
@@ -69,6 +149,8 @@ class LocationCRUD:
         db.add(db_location)
         db.commit()
         db.refresh(db_location)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
         return db_location
 
 
@@ -100,8 +182,11 @@ class SkillCRUD:
     
     def create(self, db: Session, skill: schemas.SkillCreate) -> models.Skill:
         db_skill = models.Skill(**skill.dict())
+        db.add(db_skill)
         db.commit()
         db.refresh(db_skill)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
         return db_skill
 
 
@@ -109,145 +194,294 @@ class InternshipCRUD:
     def get_all(self, db: Session) -> List[models.Internship]:
         return db.query(models.Internship).all()
     
-    def get_all_with_relations(self, db: Session) -> List[models.Internship]:
+    def _query_with_relations(self, db: Session):
         return db.query(models.Internship).options(
-            db.query(models.Internship).join(models.Skill).join(models.Education).join(models.Location)
-        ).all()
+            joinedload(models.Internship.skill),
+            joinedload(models.Internship.education),
+            joinedload(models.Internship.sector),
+            joinedload(models.Internship.location),
+            selectinload(models.Internship.additional_skills)
+        )
     
-    def get_by_filters(self, db: Session, skill_id: int = None, 
-                      education_id: int = None, location_id: int = None) -> List[models.Internship]:
-        query = db.query(models.Internship)
-        
-        if skill_id:
-            query = query.filter(models.Internship.skills_id == skill_id)
-        if education_id:
-            query = query.filter(models.Internship.edu_id == education_id)
-        if location_id:
-            query = query.filter(models.Internship.location_id == location_id)
-            
-        return query.all()
+    def get_all_with_relations(self, db: Session) -> List[models.Internship]:
+        return self._query_with_relations(db).all()
+    
+    def get_by_ids_with_relations(self, db: Session, internship_ids: List[int]) -> List[models.Internship]:
+        return self._query_with_relations(db).filter(models.Internship.id.in_(internship_ids)).all()
+    
+    def stream_for_training(self, db: Session, batch_size: int = 1000) -> Iterator[models.Internship]:
+        # Rows in id order, fetched batch_size at a time with the relations the ML text features read
+        return db.query(models.Internship).options(
+            joinedload(models.Internship.skill),
+            joinedload(models.Internship.sector),
+            joinedload(models.Internship.location)
+        ).order_by(models.Internship.id).yield_per(batch_size)
     
     def create(self, db: Session, internship: schemas.InternshipCreate) -> models.Internship:
         db_internship = models.Internship(**internship.dict())
         db.add(db_internship)
         db.commit()
         db.refresh(db_internship)
+        internship_catalog.invalidate()
+        
+        # Index the new posting into the trained ML model in the background
+        from .ml_scoring import recommendation_engine
+        if recommendation_engine.is_ready_for_ml():
+            from .training import training_jobs
+            training_jobs.submit_index([db_internship.id])
         return db_internship
 
 
-def extract_multiple_skills(internship, db_session=None):
-    """Extract multiple skills from internship, including both primary skill and additional skills from details"""
-    skills = []
+# Async counterparts used by the lookup routes (training and scoring keep the sync session)
+
+class AsyncEducationCRUD:
+    async def get_all(self, db: AsyncSession) -> List[models.Education]:
+        return list((await db.scalars(select(models.Education))).all())
     
-    # Add primary skill
-    if internship.skill:
-        skills.append(internship.skill.description)
+    async def get_by_id(self, db: AsyncSession, education_id: int) -> Optional[models.Education]:
+        return await db.get(models.Education, education_id)
     
-    # Extract additional skills from details field
-    if internship.details and "Additional_Skills_IDs:" in internship.details:
-        try:
-            additional_part = internship.details.split("Additional_Skills_IDs:")[1].split("This")[0]
-            skill_ids = [int(x.strip()) for x in additional_part.split(",") if x.strip().isdigit()]
-            
-            # Use provided session to avoid creating new connections
-            if db_session and skill_ids:
-                additional_skills = db_session.query(models.Skill).filter(
-                    models.Skill.id.in_(skill_ids)
-                ).all()
-                for skill in additional_skills:
-                    skills.append(skill.description)
-        except:
-            pass  # If parsing fails, just use primary skill
-    
-    return skills
+    async def create(self, db: AsyncSession, education: schemas.EducationCreate) -> models.Education:
+        db_education = models.Education(**education.dict())
+        db.add(db_education)
+        await db.commit()
+        await db.refresh(db_education)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
+        return db_education
 
-def get_recommendations(db: Session, student_form: schemas.StudentForm, use_ml: bool = True) -> List[dict]:
-    # Check cache first
-    cache_key = get_cache_key(student_form, use_ml)
-    cached_result = recommendation_cache.get(cache_key)
-    
-    if cached_result:
-        cache_time, cached_recommendations = cached_result
-        if datetime.now() - cache_time < timedelta(seconds=cache_ttl):
-            print("🚀 Returning cached recommendations")
-            return cached_recommendations
-        else:
-            # Remove expired cache entry
-            del recommendation_cache[cache_key]
+
+class AsyncSectorCRUD:
+    async def get_all(self, db: AsyncSession) -> List[models.Sector]:
+        return list((await db.scalars(select(models.Sector))).all())
     
-    # Get top internship recommendations with ML or rule-based scoring
-    from .scoring import calculate_total_score
-    from .ml_scoring import recommendation_engine, calculate_enhanced_score, ML_AVAILABLE
+    async def get_by_id(self, db: AsyncSession, sector_id: int) -> Optional[models.Sector]:
+        return await db.get(models.Sector, sector_id)
     
-    # Pre-filter internships based on user preferences for better performance
-    from sqlalchemy.orm import joinedload
+    async def get_by_education_id(self, db: AsyncSession, education_id: int) -> List[models.Sector]:
+        return list((await db.scalars(select(models.Sector).join(models.education_sectors).where(
+            models.education_sectors.c.education_id == education_id
+        ))).all())
     
-    query = db.query(models.Internship).options(
-        joinedload(models.Internship.sector),
-        joinedload(models.Internship.location),
-        joinedload(models.Internship.skill),
-        joinedload(models.Internship.education)
-    )
+    async def create(self, db: AsyncSession, sector: schemas.SectorCreate) -> models.Sector:
+        db_sector = models.Sector(**sector.dict())
+        db.add(db_sector)
+        await db.commit()
+        await db.refresh(db_sector)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
+        return db_sector
+
+
+class AsyncLocationCRUD:
+    async def get_all(self, db: AsyncSession) -> List[models.Location]:
+        return list((await db.scalars(select(models.Location))).all())
+    
+    async def get_by_id(self, db: AsyncSession, location_id: int) -> Optional[models.Location]:
+        return await db.get(models.Location, location_id)
+    
+    async def create(self, db: AsyncSession, location: schemas.LocationCreate) -> models.Location:
+        db_location = models.Location(**location.dict())
+        db.add(db_location)
+        await db.commit()
+        await db.refresh(db_location)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
+        return db_location
+
+
+class AsyncSkillCRUD:
+    async def get_all(self, db: AsyncSession) -> List[models.Skill]:
+        return list((await db.scalars(select(models.Skill))).all())
     
-    # Filter by sector if specified
-    if student_form.sector and student_form.sector != "Any":
-        query = query.join(models.Sector).filter(models.Sector.name.ilike(f"%{student_form.sector}%"))
+    async def get_by_education_id(self, db: AsyncSession, education_id: int) -> List[models.Skill]:
+        # Get skills through education -> sectors -> skills relationship
+        return list((await db.scalars(select(models.Skill).join(models.sector_skills).join(
+            models.education_sectors, models.education_sectors.c.sector_id == models.sector_skills.c.sector_id
+        ).where(
+            models.education_sectors.c.education_id == education_id
+        ).distinct())).all())
     
-    # Filter by location if specified
-    if student_form.preferred_location and student_form.preferred_location != "Any":
-        query = query.join(models.Location).filter(models.Location.description.ilike(f"%{student_form.preferred_location}%"))
+    async def get_by_sector_id(self, db: AsyncSession, sector_id: int) -> List[models.Skill]:
+        return list((await db.scalars(select(models.Skill).join(models.sector_skills).where(
+            models.sector_skills.c.sector_id == sector_id
+        ))).all())
     
-    # Limit initial results for performance (we'll score these and pick top 50)
-    internships = query.limit(1000).all()
+    async def get_by_education_and_sector(self, db: AsyncSession, education_id: int, sector_id: int) -> List[models.Skill]:
+        # Get skills that belong to a specific sector, and that sector is associated with the education
+        return list((await db.scalars(select(models.Skill).join(models.sector_skills).join(
+            models.education_sectors, models.education_sectors.c.sector_id == models.sector_skills.c.sector_id
+        ).where(
+            models.sector_skills.c.sector_id == sector_id,
+            models.education_sectors.c.education_id == education_id
+        ))).all())
     
-    # Check if ML model is ready
-    if use_ml and ML_AVAILABLE and not recommendation_engine.is_ready_for_ml():
-        print("Warning: ML model not trained. Use /retrain-model endpoint to train first.")
-        use_ml = False
+    async def get_by_id(self, db: AsyncSession, skill_id: int) -> Optional[models.Skill]:
+        return await db.get(models.Skill, skill_id)
     
-    student_data = {
+    async def create(self, db: AsyncSession, skill: schemas.SkillCreate) -> models.Skill:
+        db_skill = models.Skill(**skill.dict())
+        db.add(db_skill)
+        await db.commit()
+        await db.refresh(db_skill)
+        internship_catalog.invalidate()
+        reference_cache.invalidate()
+        return db_skill
+
+
+class AsyncInternshipCRUD:
+    def _select_with_relations(self):
+        # Relations are loaded up front: lazy loads cannot run on an async session
+        return select(models.Internship).options(
+            joinedload(models.Internship.skill),
+            joinedload(models.Internship.education),
+            joinedload(models.Internship.sector),
+            joinedload(models.Internship.location),
+            selectinload(models.Internship.additional_skills)
+        )
+    
+    async def get_all_with_relations(self, db: AsyncSession) -> List[models.Internship]:
+        return list((await db.scalars(self._select_with_relations())).unique().all())
+    
+    def _select_listing(self):
+        # The many-to-one relations schemas.Internship serializes, joined into the row query, in id order
+        return select(models.Internship).options(
+            joinedload(models.Internship.skill),
+            joinedload(models.Internship.education),
+            joinedload(models.Internship.sector),
+            joinedload(models.Internship.location)
+        ).order_by(models.Internship.id)
+    
+    async def get_page(self, db: AsyncSession, after_id: int = 0,
+                       limit: int = INTERNSHIP_PAGE_SIZE) -> Tuple[List[models.Internship], Optional[int]]:
+        """Up to limit internships with id > after_id, and the cursor of the next page (None on the last one)"""
+        # Keyset pagination: an index range scan from the cursor, the cost does not grow with the page number
+        rows = list((await db.scalars(self._select_listing().where(
+            models.Internship.id > after_id
+        ).limit(limit + 1))).all())
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].id
+        return rows, None
+    
+    async def stream_all(self, db: AsyncSession,
+                         batch_size: int = INTERNSHIP_EXPORT_BATCH_SIZE) -> AsyncIterator[models.Internship]:
+        """Every internship in id order, fetched batch_size rows at a time from one query"""
+        result = await db.stream_scalars(self._select_listing().execution_options(yield_per=batch_size))
+        async for internship in result:
+            yield internship
+    
+    async def get_by_ids_with_relations(self, db: AsyncSession, internship_ids: List[int]) -> List[models.Internship]:
+        return list((await db.scalars(self._select_with_relations().where(
+            models.Internship.id.in_(internship_ids)
+        ))).unique().all())
+    
+    async def search(self, db: AsyncSession, after_id: int = 0, limit: int = INTERNSHIP_PAGE_SIZE,
+                     with_count: bool = False, **filters) -> Tuple[List[models.Internship], Optional[int], Optional[int]]:
+        """
+        One keyset page of the internships matching filters, the next cursor, and the total match
+        count when with_count is set (None otherwise, the count scans every match)
+        """
+        conditions = internship_filters(**filters)
+        total_count = None
+        if with_count:
+            total_count = await db.scalar(select(func.count(models.Internship.id)).where(*conditions))
+        rows = list((await db.scalars(self._select_listing().where(
+            *conditions, models.Internship.id > after_id
+        ).limit(limit + 1))).all())
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].id, total_count
+        return rows, None, total_count
+    
+    async def create(self, db: AsyncSession, internship: schemas.InternshipCreate) -> models.Internship:
+        db_internship = models.Internship(**internship.dict())
+        db.add(db_internship)
+        await db.commit()
+        await db.refresh(db_internship)
+        internship_catalog.invalidate()
+        
+        # Index the new posting into the trained ML model in the background
+        from .ml_scoring import recommendation_engine
+        if recommendation_engine.is_ready_for_ml():
+            from .training import training_jobs
+            training_jobs.submit_index([db_internship.id])
+        return db_internship
+
+
+def _student_data(student_form: schemas.StudentForm) -> dict:
+    return {
         "education": student_form.education,
         "skills": student_form.skills,
         "sector": student_form.sector,
         "preferred_location": student_form.preferred_location,
         "description": student_form.description
     }
-    
-    # Calculate scores for each internship (optimized with early filtering)
-    scored_internships = []
-    min_score_threshold = 10  # Only consider internships with score > 10
-    
-    for idx, internship in enumerate(internships):
-        # Quick pre-filter: check if any user skills match internship skills
-        internship_skills = extract_multiple_skills(internship, db)
-        if student_form.skills:
-            skill_match = any(skill.lower() in ' '.join(internship_skills).lower() 
-                            for skill in student_form.skills)
-            if not skill_match and internship.sector.name.lower() not in student_form.sector.lower():
-                continue  # Skip internships with no skill or sector match
-        
-        if use_ml and ML_AVAILABLE:
-            score, score_breakdown = calculate_enhanced_score(internship, student_data, idx)
-            extra_info = {"ml_enhanced": True, "score_breakdown": score_breakdown}
-        else:
-            score = calculate_total_score(internship, student_data)
-            extra_info = {"ml_enhanced": False}
-        
-        # Only add internships with meaningful scores
-        if score > min_score_threshold:
-            scored_internships.append({
-                "internship": internship,
-                "score": score,
-                "skills": internship_skills,  # Cache extracted skills
-                **extra_info
-            })
-            
-        # Early termination: if we have enough high-scoring internships, stop
-        if len(scored_internships) >= 100:
-            break
-    
-    scored_internships.sort(key=lambda x: x["score"], reverse=True)
-    top_internships = scored_internships[:50]
+
+
+def _prefiltered_positions(catalog, student_form: schemas.StudentForm,
+                           filter_cache: Optional[Dict] = None) -> np.ndarray:
+    """Catalog positions passing the sector/location preferences (computed once per pair with filter_cache)"""
+    has_sector_filter = student_form.sector and student_form.sector != "Any"
+    has_location_filter = student_form.preferred_location and student_form.preferred_location != "Any"
+    
+    if not (has_sector_filter or has_location_filter):
+        return np.arange(len(catalog))
+    
+    filter_key = (student_form.sector if has_sector_filter else None,
+                  student_form.preferred_location if has_location_filter else None)
+    if filter_cache is not None and filter_key in filter_cache:
+        return filter_cache[filter_key]
+    
+    # Names resolve to ids in memory (aliases, fuzzy spelling), matched against the snapshot's id columns
+    keep = np.ones(len(catalog), dtype=bool)
+    if has_sector_filter:
+        keep &= np.isin(catalog.sector_ids, catalog.sector_lookup.resolve(student_form.sector))
+    if has_location_filter:
+        keep &= np.isin(catalog.location_ids, catalog.location_lookup.resolve(student_form.preferred_location))
+    
+    positions = np.flatnonzero(keep)
+    if filter_cache is not None:
+        filter_cache[filter_key] = positions
+    return positions
+
+
+def _candidate_positions(catalog, positions: np.ndarray, student_form: schemas.StudentForm,
+                         nearest_internships: Optional[Callable[[], np.ndarray]] = None) -> np.ndarray:
+    # Candidate generation: internships in the skill posting lists, or whose sector matches,
+    # or whose text is among the nearest to the profile in the ANN index
+    if student_form.skills:
+        skill_candidates = catalog.skill_postings.candidates(student_form.skills)
+        candidates = np.isin(catalog.ids[positions], skill_candidates, assume_unique=True)
+        candidates |= catalog.sector_contained_in(positions, student_form.sector)
+        if nearest_internships is not None:
+            candidates |= np.isin(catalog.ids[positions], nearest_internships())
+        positions = positions[candidates]
+    return positions
+
+
+def _rank_recommendations(catalog, positions: np.ndarray, scores: np.ndarray, breakdown: Optional[Dict]) -> List[dict]:
+    """Top 5 diverse recommendations from scored candidates, formatted for the response"""
+    from .scoring import select_top_k
+    
+    # Only consider internships with meaningful scores, best first
+    min_score_threshold = 10
+    eligible = np.flatnonzero(scores > min_score_threshold)
+    top_idxs = eligible[select_top_k(scores[eligible], TOP_K_CANDIDATES, catalog.ids[positions[eligible]])]
+    
+    top_internships = []
+    for idx in top_idxs:
+        position = positions[idx]
+        item = {
+            "internship": catalog.record(position),
+            "score": float(scores[idx]),
+            "skills": catalog.skills_of(position),
+            "ml_enhanced": breakdown is not None
+        }
+        if breakdown is not None:
+            item["score_breakdown"] = {
+                "rule_based": {"score": float(breakdown["rule_based"][idx])},
+                "ml_based": {"status": breakdown["ml_status"], "final_score": float(breakdown["ml_based"][idx])}
+            }
+        top_internships.append(item)
     
     # Promote diversity by title, sector, skills, and location
     diverse_recommendations = []
@@ -259,10 +493,10 @@ def get_recommendations(db: Session, student_form: schemas.StudentForm, use_ml:
     # First pass: diverse recommendations
     for item in top_internships:
         internship = item["internship"]
-        title = internship.title
-        sector = internship.sector.name if internship.sector else "Other"
-        location = internship.location.description if internship.location else "Unknown"
-        skills = ", ".join(item["skills"]) if item.get("skills") else (internship.skill.description if internship.skill else "Other")
+        title = internship["title"]
+        sector = internship["sector"] or "Other"
+        location = internship["location"] or "Unknown"
+        skills = ", ".join(item["skills"]) if item["skills"] else "Other"
         
         if len(diverse_recommendations) < 5:
             is_diverse = (
@@ -292,21 +526,15 @@ def get_recommendations(db: Session, student_form: schemas.StudentForm, use_ml:
     for item in top_5:
         internship = item["internship"]
         
-        # Use cached skills from scoring phase for better performance
-        if item.get("skills"):
-            all_skills_text = ", ".join(item["skills"])
-        else:
-            all_skills_text = internship.skill.description if internship.skill else "Not specified"
- 
         recommendation = {
-            "id": internship.id,
-            "title": internship.title,
-            "company_name": internship.company_name,
-            "sector": internship.sector.name if internship.sector else "Not specified",
-            "location": internship.location.description if internship.location else "Not specified",
-            "skills": all_skills_text,
-            "duration": internship.duration or "Not specified",
-            "description": internship.description,
+            "id": internship["id"],
+            "title": internship["title"],
+            "company_name": internship["company_name"],
+            "sector": internship["sector"] or "Not specified",
+            "location": internship["location"] or "Not specified",
+            "skills": ", ".join(item["skills"]) if item["skills"] else "Not specified",
+            "duration": internship["duration"] or "Not specified",
+            "description": internship["description"],
             "match_score": round(item["score"], 2)
         }
         
@@ -327,17 +555,162 @@ def get_recommendations(db: Session, student_form: schemas.StudentForm, use_ml:
         
         recommendations.append(recommendation)
     
-    # Cache the results for future requests
-    recommendation_cache[cache_key] = (datetime.now(), recommendations)
+    return recommendations
+
+
+def _ml_ready(use_ml: bool) -> bool:
+    from .ml_scoring import recommendation_engine, ML_AVAILABLE
     
-    # Clean up old cache entries (keep only last 100 entries)
-    if len(recommendation_cache) > 100:
-        oldest_key = min(recommendation_cache.keys(), 
-                        key=lambda k: recommendation_cache[k][0])
-        del recommendation_cache[oldest_key]
+    # Check if ML model is ready
+    if use_ml and ML_AVAILABLE and not recommendation_engine.is_ready_for_ml():
+        print("Warning: ML model not trained. Use /retrain-model endpoint to train first.")
+        return False
+    return use_ml and ML_AVAILABLE
+
+
+def encode_recommendations(recommendations: List[dict]) -> bytes:
+    """Response body of a recommendation list: validated against RecommendationResponse, then encoded"""
+    return dumps(recommendation_list_adapter.dump_python(recommendation_list_adapter.validate_python(recommendations)))
+
+
+def get_recommendations(db: Session, student_form: schemas.StudentForm, use_ml: bool = True) -> List[dict]:
+    return loads(get_recommendations_json(db, student_form, use_ml=use_ml))
+
+
+def get_recommendations_json(db: Session, student_form: schemas.StudentForm, use_ml: bool = True) -> bytes:
+    """get_recommendations as the encoded response body (b"[]" when nothing matches)"""
+    # Check cache first
+    form_key = get_cache_key(student_form, use_ml)
+    cache_key = f"{form_key}:{model_cache_key(use_ml)}"
+    cached_recommendations = recommendation_cache.get(cache_key)
+    
+    if cached_recommendations is not None:
+        print("🚀 Returning cached recommendations")
+        return cached_recommendations
+    
+    # Get top internship recommendations with ML or rule-based scoring
+    from .scoring import calculate_total_scores_batch
+    from .ml_scoring import (recommendation_engine, calculate_enhanced_scores_batch, build_student_profile,
+                             ML_ANN_CANDIDATES)
+    
+    # Scoring reads from the in-process catalog snapshot instead of ORM rows
+    catalog = internship_catalog.get(db)
+    ml_enabled = _ml_ready(use_ml)
+    
+    # Frequent forms are computed offline for the current catalog and model
+    precomputed = precomputed_recommendations.get(db, form_key, data_version(catalog, ml_enabled))
+    if precomputed is not None:
+        print("📦 Returning precomputed recommendations")
+        body = encode_recommendations(precomputed)
+        recommendation_cache.set(cache_key, body)
+        return body
+    
+    # Pre-filter internships based on user preferences over the whole catalog
+    positions = _prefiltered_positions(catalog, student_form)
+    student_data = _student_data(student_form)
+    
+    nearest_internships = None
+    if ml_enabled and ML_ANN_CANDIDATES:
+        nearest_internships = partial(recommendation_engine.nearest_internships,
+                                      build_student_profile(student_data), ML_ANN_CANDIDATES)
+    positions = _candidate_positions(catalog, positions, student_form, nearest_internships)
+    
+    # Score all candidates at once (one profile transform, one sparse mat-vec)
+    columns = catalog.scoring_columns(positions)
+    if ml_enabled:
+        scores, breakdown = calculate_enhanced_scores_batch(
+            columns, student_data, catalog.ids[positions], top_k=TOP_K_CANDIDATES
+        )
+    else:
+        scores, breakdown = calculate_total_scores_batch(columns, student_data), None
+    
+    recommendations = _rank_recommendations(catalog, positions, scores, breakdown)
+    
+    # Cache the results for future requests (expiry and eviction handled by the cache)
+    body = encode_recommendations(recommendations)
+    recommendation_cache.set(cache_key, body)
     
     print(f"🎯 Generated {len(recommendations)} recommendations (cached for {cache_ttl}s)")
-    return recommendations
+    return body
+
+
+def get_recommendations_batch(db: Session, student_forms: List[schemas.StudentForm], use_ml: bool = True) -> List[List[dict]]:
+    return [loads(body) for body in get_recommendations_batch_json(db, student_forms, use_ml=use_ml)]
+
+
+def get_recommendations_batch_json(db: Session, student_forms: List[schemas.StudentForm], use_ml: bool = True) -> List[bytes]:
+    """
+    get_recommendations_json for many students at once, same bodies in the same order
+    Profiles are vectorized together, BATCH_CHUNK_SIZE at a time, and scored with one product per chunk;
+    the sector/location pre-filter runs once per distinct pair and identical forms are scored once
+    """
+    from .scoring import calculate_total_scores_batch
+    from .ml_scoring import (recommendation_engine, calculate_enhanced_scores_batch, build_student_profile,
+                             ML_ANN_CANDIDATES)
+    from .text_features import iter_chunks
+    
+    results = [None] * len(student_forms)
+    
+    # Cached forms are answered directly, the others grouped by cache key
+    model_key = model_cache_key(use_ml)
+    pending = {}
+    for idx, student_form in enumerate(student_forms):
+        cache_key = f"{get_cache_key(student_form, use_ml)}:{model_key}"
+        cached_recommendations = recommendation_cache.get(cache_key)
+        if cached_recommendations is not None:
+            results[idx] = cached_recommendations
+        else:
+            pending.setdefault(cache_key, []).append(idx)
+    
+    if not pending:
+        return results
+    
+    catalog = internship_catalog.get(db)
+    ml_enabled = _ml_ready(use_ml)
+    filter_cache = {}
+    
+    version = data_version(catalog, ml_enabled)
+    for cache_key, indexes in list(pending.items()):
+        precomputed = precomputed_recommendations.get(db, get_cache_key(student_forms[indexes[0]], use_ml), version)
+        if precomputed is not None:
+            body = encode_recommendations(precomputed)
+            recommendation_cache.set(cache_key, body)
+            for idx in indexes:
+                results[idx] = body
+            del pending[cache_key]
+    
+    for chunk in iter_chunks(pending.items(), BATCH_CHUNK_SIZE):
+        forms = [student_forms[indexes[0]] for _, indexes in chunk]
+        student_data = [_student_data(student_form) for student_form in forms]
+        
+        profile_batch = None
+        if ml_enabled:
+            profile_batch = recommendation_engine.profile_batch([build_student_profile(data) for data in student_data])
+        
+        for batch_idx, ((cache_key, indexes), student_form) in enumerate(zip(chunk, forms)):
+            positions = _prefiltered_positions(catalog, student_form, filter_cache)
+            
+            nearest_internships = None
+            if profile_batch is not None and ML_ANN_CANDIDATES:
+                nearest_internships = partial(profile_batch.nearest_internships, batch_idx, ML_ANN_CANDIDATES)
+            positions = _candidate_positions(catalog, positions, student_form, nearest_internships)
+            
+            columns = catalog.scoring_columns(positions)
+            if ml_enabled:
+                scores, breakdown = calculate_enhanced_scores_batch(
+                    columns, student_data[batch_idx], catalog.ids[positions], top_k=TOP_K_CANDIDATES,
+                    ml_scorer=partial(profile_batch.ml_scores, batch_idx) if profile_batch is not None else None
+                )
+            else:
+                scores, breakdown = calculate_total_scores_batch(columns, student_data[batch_idx]), None
+            
+            body = encode_recommendations(_rank_recommendations(catalog, positions, scores, breakdown))
+            recommendation_cache.set(cache_key, body)
+            for idx in indexes:
+                results[idx] = body
+    
+    print(f"🎯 Generated recommendations for {len(pending)} distinct of {len(student_forms)} students")
+    return results
 
 
 # Create instances
@@ -346,3 +719,9 @@ sector_crud = SectorCRUD()
 location_crud = LocationCRUD()
 skill_crud = SkillCRUD()
 internship_crud = InternshipCRUD()
+
+async_education_crud = AsyncEducationCRUD()
+async_sector_crud = AsyncSectorCRUD()
+async_location_crud = AsyncLocationCRUD()
+async_skill_crud = AsyncSkillCRUD()
+async_internship_crud = AsyncInternshipCRUD()
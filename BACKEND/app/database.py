@@ -1,17 +1,55 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from app.db_pool import PoolMetrics, pool_options
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Async driver used for each sync one when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg"
+}
+
+
+def _async_url(url: str) -> str:
+    # Same database through its async driver
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for the lookup routes, so their queries do not block the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, asynchronous=True))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Pool health, reported by /health
+pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+pool_metrics["sync"].attach(engine.pool)
+pool_metrics["async"].attach(async_engine.sync_engine.pool)
+
+
+def get_pool_status() -> dict:
+    # Connection counts and checkout timing of both engines
+    return {
+        "sync": pool_metrics["sync"].snapshot(engine.pool),
+        "async": pool_metrics["async"].snapshot(async_engine.sync_engine.pool)
+    }
+
 def get_db():
     # Create database session
     db = SessionLocal()
@@ -20,3 +58,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    # Create async database session
+    async with AsyncSessionLocal() as db:
+        yield db
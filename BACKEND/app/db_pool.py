@@ -0,0 +1,134 @@
+# Connection pool settings from the environment, and pool health metrics from SQLAlchemy pool events
+import os
+import time
+import threading
+from typing import Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Size the pool to the worker count: each worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds a checkout waits before failing
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Replace connections older than this (MySQL wait_timeout), -1 = never
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Test connections on checkout, drops stale ones
+DB_SLOW_CHECKOUT_SECONDS = float(os.getenv("DB_SLOW_CHECKOUT_SECONDS", "0.1"))  # Checkout waits counted as slow
+
+
+class PoolMetrics:
+    """Counters for one engine's pool, updated from pool events and checkout timing"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if seconds >= DB_SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+
+    def attach(self, pool: Pool):
+        pool.metrics = self
+        event.listen(pool, "connect", lambda *args: self._increment("connects"))
+        event.listen(pool, "close", lambda *args: self._increment("closes"))
+        event.listen(pool, "invalidate", lambda *args: self._increment("invalidations"))
+        event.listen(pool, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._increment("checkins"))
+
+    def snapshot(self, pool: Pool) -> Dict:
+        """Live connection counts from the pool plus the counters"""
+        status = {}
+        if isinstance(pool, _CheckoutTiming):
+            status = {
+                "size": pool.size(),
+                "max_overflow": pool.max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                # max_overflow -1 lets the pool grow without limit, it can never run out
+                "exhausted": pool.max_overflow >= 0 and pool.checkedout() >= pool.size() + pool.max_overflow
+            }
+        with self._lock:
+            status.update({
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.waits, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3)
+            })
+        return status
+
+
+class _CheckoutTiming:
+    # Times each checkout, from the request to a usable connection (queue wait, connect, pre-ping);
+    # pool events only fire once a connection is handed out, so they cannot see the wait
+    metrics = None
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kwargs):
+        # Kept for the metrics, QueuePool only stores it privately (-1 = unlimited overflow)
+        self.max_overflow = max_overflow
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics._increment("timeouts")
+                self.metrics.record_wait(time.perf_counter() - start)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool, which keeps reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_CheckoutTiming, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTiming, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, asynchronous: bool = False) -> Dict:
+    """create_engine / create_async_engine keyword arguments for the configured pool"""
+    parsed = make_url(url)
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    # In-memory SQLite keeps one connection per thread, there is no queue to size
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update({
+        "poolclass": TimedAsyncAdaptedQueuePool if asynchronous else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT
+    })
+    return options
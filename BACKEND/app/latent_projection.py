@@ -0,0 +1,61 @@
+# Latent-semantic (truncated SVD) projection of the TF-IDF rows to a few dense dimensions
+# Every internship becomes a contiguous float32 row, so a profile is scored against the
+# whole catalog with one BLAS matrix-vector product instead of a sparse dot product per row
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+
+class LatentProjection:
+    """Fitted projection from TF-IDF space to L2-normalized float32 embeddings"""
+
+    def __init__(self, columns: np.ndarray, components: np.ndarray, n_features: int,
+                 explained_variance: float = None):
+        self.columns = columns  # TF-IDF columns the projection was fitted on (all others map to zero)
+        self.components = components  # (len(columns), dimensions) float32
+        self.n_features = n_features
+        self.explained_variance = explained_variance
+
+        self.column_map = np.full(n_features, -1, dtype=np.int64)
+        self.column_map[columns] = np.arange(len(columns))
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.components.nbytes + self.columns.nbytes + self.column_map.nbytes
+
+    @classmethod
+    def fit(cls, matrix: csr_matrix, dimensions: int, seed: int = 0):
+        """Fit on the columns used by some row, None when the matrix is too small to reduce"""
+        columns = np.unique(matrix.indices)
+        dimensions = min(dimensions, matrix.shape[0] - 1, len(columns) - 1)
+        if dimensions < 1:
+            return None
+
+        svd = TruncatedSVD(n_components=dimensions, algorithm='randomized', n_iter=5, random_state=seed)
+        svd.fit(matrix[:, columns])
+        return cls(
+            columns=columns,
+            components=np.ascontiguousarray(svd.components_.T, dtype=np.float32),
+            n_features=matrix.shape[1],
+            explained_variance=float(svd.explained_variance_ratio_.sum())
+        )
+
+    def transform(self, vectors: csr_matrix) -> np.ndarray:
+        """L2-normalized float32 embedding of each row"""
+        if vectors.shape[0] == 0:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        embeddings = np.asarray(vectors[:, self.columns].astype(np.float32) @ self.components)
+        return normalize(embeddings, norm='l2', copy=False)
+
+    def transform_one(self, vector: csr_matrix) -> np.ndarray:
+        """Embedding of a single query row, gathering only the component rows of its terms"""
+        columns = self.column_map[vector.indices]
+        keep = columns >= 0
+        embedding = vector.data[keep].astype(np.float32) @ self.components[columns[keep]]
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
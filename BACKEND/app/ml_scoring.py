@@ -1,347 +1,864 @@
 # ML-Enhanced Scoring System combining rule-based (60%) and ML similarity (40%)
 import os
-import pickle
 import time
+import threading
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 from datetime import datetime
 import hashlib
-import re
+from array import array
+import numpy as np
+from app.cache import LRUCache, create_cache_backend
+from app.model_store import current_version_dir, load_artifact, save_artifact
 from app.models import Internship
-from app.scoring import calculate_rule_based_score
+from app.scoring import calculate_rule_based_score, calculate_rule_based_scores_batch
+from app.text_features import build_feature_text, internship_fields, iter_feature_texts, preprocess_text, text_hash
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
     from sklearn.preprocessing import normalize
-    import numpy as np
-    import re
+    from scipy.sparse import csr_matrix, vstack
+    from app.vectorizers import HashingTfidfVectorizer
+    from app.ann_index import LSHIndex
+    from app.latent_projection import LatentProjection
     ML_AVAILABLE = True
     logger.info("ML libraries loaded successfully")
 except ImportError:
     logger.warning("ML libraries not available. Using rule-based scoring only.")
     ML_AVAILABLE = False
 
+# TfidfVectorizer parameters written to the model manifest (all JSON-serializable)
+PERSISTED_VECTORIZER_PARAMS = (
+    'max_features', 'stop_words', 'ngram_range', 'min_df', 'max_df', 'sublinear_tf',
+    'norm', 'lowercase', 'token_pattern', 'use_idf', 'smooth_idf', 'analyzer', 'strip_accents'
+)
+
+# Range of the final ML score (out of 40) after the bonus, clamping and the minimum
+ML_SCORE_FLOOR = 20
+ML_SCORE_CEILING = 40
+
+# Incremental indexing: changed internships are transformed with the fitted vocabulary,
+# a full refit happens once this share of their terms is out of vocabulary
+ML_INCREMENTAL_UPDATES = os.getenv("ML_INCREMENTAL_UPDATES", "true").lower() == "true"
+ML_VOCABULARY_DRIFT_THRESHOLD = float(os.getenv("ML_VOCABULARY_DRIFT_THRESHOLD", "0.2"))
+
+# Vectorizer used for full fits: "tfidf" (vocabulary, best quality) or "hashing" (fixed memory, any catalog size)
+ML_VECTORIZER = os.getenv("ML_VECTORIZER", "tfidf").lower()
+ML_HASHING_FEATURES = int(os.getenv("ML_HASHING_FEATURES", str(2 ** 20)))
+ML_TRAINING_BATCH_SIZE = int(os.getenv("ML_TRAINING_BATCH_SIZE", "2000"))  # Rows per DB fetch and per hashing chunk
+# Feature selection shared by both vectorizers: terms in more than this share of the internships
+# carry no signal, and only the most frequent terms are kept
+VECTORIZER_MAX_DF = 0.90
+VECTORIZER_MAX_FEATURES = 8000
+
+# Other uvicorn workers publish retrained models to the shared model store; each worker looks at
+# its CURRENT pointer at most this often and loads a newer version (0 = on every request)
+ML_MODEL_RECHECK_SECONDS = float(os.getenv("ML_MODEL_RECHECK_SECONDS", "30"))
+
+# Vector retrieval: internships nearest to the profile text join the recommendation candidates (0 disables).
+# The LSH index only pays off on large catalogs; below ML_ANN_MIN_ROWS brute force is faster and none is built
+ML_ANN_CANDIDATES = int(os.getenv("ML_ANN_CANDIDATES", "200"))
+ML_ANN_MIN_ROWS = int(os.getenv("ML_ANN_MIN_ROWS", "100000"))
+ML_ANN_TABLES = int(os.getenv("ML_ANN_TABLES", "16"))
+
+# Similarity computation: "sparse" (exact TF-IDF cosine) or "dense" (cosine between truncated-SVD
+# embeddings of ML_DENSE_DIMENSIONS float32 values, one BLAS mat-vec per profile)
+ML_SIMILARITY_MODE = os.getenv("ML_SIMILARITY_MODE", "sparse").lower()
+ML_DENSE_DIMENSIONS = int(os.getenv("ML_DENSE_DIMENSIONS", "192"))
+PROFILE_VECTOR_CACHE_SIZE = 256
+SIMILARITY_BENCHMARK_QUERIES = 50  # Catalog rows used as queries when timing both modes after a fit
+
+
+def _row_hashes(texts: List[str]) -> np.ndarray:
+    """64-bit content hash of each internship's feature text"""
+    return np.fromiter((text_hash(text) for text in texts), dtype=np.uint64, count=len(texts))
+
+
+def _feature_count(vectorizer) -> int:
+    """Vocabulary size, or the number of hashed features for the hashing vectorizer"""
+    return vectorizer.n_features if isinstance(vectorizer, HashingTfidfVectorizer) else len(vectorizer.vocabulary_)
+
+
+def _sparse_nbytes(matrix) -> int:
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def _fit_projection(tfidf_matrix) -> Tuple[Optional['LatentProjection'], Optional[np.ndarray]]:
+    """Latent projection of a matrix and the embeddings of its rows, (None, None) if it cannot be reduced"""
+    projection = LatentProjection.fit(tfidf_matrix, ML_DENSE_DIMENSIONS)
+    if projection is None:
+        return None, None
+    return projection, projection.transform(tfidf_matrix)
+
+
+def _similarity_latency(tfidf_matrix, projection=None, embeddings=None) -> Dict:
+    """Milliseconds per profile for the exact sparse product and, when fitted, the dense one"""
+    queries = [tfidf_matrix[row] for row in range(min(SIMILARITY_BENCHMARK_QUERIES, tfidf_matrix.shape[0]))]
+    if not queries:
+        return {}
+    
+    start = time.perf_counter()
+    for vector in queries:
+        (tfidf_matrix @ vector.T).toarray().ravel()
+    latency = {'sparse_ms': (time.perf_counter() - start) * 1000 / len(queries)}
+    
+    if embeddings is not None:
+        start = time.perf_counter()
+        for vector in queries:
+            embeddings @ projection.transform_one(vector)
+        latency['dense_ms'] = (time.perf_counter() - start) * 1000 / len(queries)
+    return latency
+
+
+def _build_ann_index(tfidf_matrix) -> Optional['LSHIndex']:
+    """LSH index over the rows when ANN retrieval is enabled and the catalog is large enough"""
+    if not ML_ANN_CANDIDATES or tfidf_matrix is None or tfidf_matrix.shape[0] < ML_ANN_MIN_ROWS:
+        return None
+    start = time.time()
+    ann_index = LSHIndex(tfidf_matrix, n_tables=ML_ANN_TABLES)
+    logger.info(f"ANN index built over {tfidf_matrix.shape[0]} rows in {time.time() - start:.2f}s")
+    return ann_index
+
+
+def _combined_hash(internship_ids: np.ndarray, row_hashes: np.ndarray) -> str:
+    """Hash of the whole indexed data set, independent of row order"""
+    order = np.argsort(internship_ids, kind='stable')
+    digest = hashlib.md5(np.ascontiguousarray(np.asarray(internship_ids, dtype=np.int64)[order]).tobytes())
+    digest.update(np.ascontiguousarray(np.asarray(row_hashes, dtype=np.uint64)[order]).tobytes())
+    return digest.hexdigest()
+
+
+class ModelState:
+    """One trained model, never modified after construction so readers can hold it for a whole request"""
+    
+    def __init__(self, tfidf_vectorizer=None, tfidf_matrix=None, internship_ids=None, row_hashes=None,
+                 training_data_hash: Optional[str] = None, last_training_time: Optional[datetime] = None,
+                 performance_metrics: Optional[Dict] = None, drift: Optional[Dict] = None,
+                 projection=None, embeddings=None, ann_index=None):
+        self.tfidf_vectorizer = tfidf_vectorizer
+        self.tfidf_matrix = tfidf_matrix
+        self.internship_ids = np.zeros(0, dtype=np.int64) if internship_ids is None else internship_ids  # Internship.id of each tfidf_matrix row
+        self.row_hashes = np.zeros(len(self.internship_ids), dtype=np.uint64) if row_hashes is None else row_hashes  # Content hash of each row
+        self.training_data_hash = training_data_hash
+        self.last_training_time = last_training_time
+        self.performance_metrics = performance_metrics or {}
+        # Rows indexed incrementally since the last full fit and how many of their terms were unknown
+        self.drift = drift or {'rows': 0, 'terms': 0, 'unknown_terms': 0}
+        # Dense mode: latent projection and the float32 embedding of each tfidf_matrix row
+        self.projection = projection
+        self.embeddings = embeddings
+        
+        # Internship.id -> tfidf_matrix row lookup
+        ids = np.asarray(self.internship_ids, dtype=np.int64)
+        self.row_index = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int64)
+        self.row_index[ids] = np.arange(len(ids))
+        
+        # Approximate nearest-neighbour index over the rows (_build_ann_index), built by the training
+        # thread or at load time before the model is published, never on a request
+        self.ann_index = ann_index
+    
+    @property
+    def similarity_mode(self) -> str:
+        return 'dense' if self.embeddings is not None else 'sparse'
+    
+    def is_ready(self) -> bool:
+        return (self.tfidf_vectorizer is not None and
+                self.tfidf_matrix is not None and
+                self.tfidf_matrix.shape[0] > 0)
+    
+    def get_rows(self, internship_ids) -> np.ndarray:
+        """Matrix rows for the given internship ids, -1 where an id was not trained on"""
+        ids = np.asarray(internship_ids, dtype=np.int64)
+        rows = np.full(len(ids), -1, dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self.row_index))
+        rows[known] = self.row_index[ids[known]]
+        return rows
+    
+    def drift_ratio(self) -> float:
+        """Share of terms in incrementally indexed rows that the fitted vocabulary does not know"""
+        return self.drift['unknown_terms'] / self.drift['terms'] if self.drift['terms'] else 0.0
+
+
+class ProfileBatch:
+    """Many student profiles vectorized together, each scored against its own candidate rows"""
+    
+    def __init__(self, state: ModelState, student_profiles: List[str]):
+        self.state = state
+        # One vectorizer call for the whole batch
+        self.vectors = state.tfidf_vectorizer.transform([preprocess_text(profile) for profile in student_profiles])
+        self._projected = None
+    
+    def similarities(self, index: int, rows: np.ndarray) -> np.ndarray:
+        """Cosine similarities of profile number index to the given catalog rows only"""
+        state = self.state
+        if state.embeddings is not None:
+            # The batch is projected once; the embeddings are then read for the candidate rows alone
+            if self._projected is None:
+                self._projected = state.projection.transform(self.vectors)
+            return state.embeddings[rows] @ self._projected[index]
+        # A product against the whole catalog would densify to (profiles, internships) per chunk
+        return (state.tfidf_matrix[rows] @ self.vectors[index].T).toarray().ravel()
+    
+    def nearest_internships(self, index: int, top_n: int) -> np.ndarray:
+        """Ids of about top_n internships most similar to profile number index, from the ANN index"""
+        state = self.state
+        if state.ann_index is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.asarray(state.internship_ids)[state.ann_index.query(self.vectors[index], top_n)]
+    
+    def ml_scores(self, index: int, internship_ids: np.ndarray) -> np.ndarray:
+        """Same scores as calculate_ml_similarity_batch for profile number index"""
+        try:
+            rows = self.state.get_rows(internship_ids)
+            known = rows >= 0
+            ml_scores = np.full(len(rows), 25.0)  # Untrained internships keep the neutral score
+            ml_scores[known] = _similarity_to_score(self.similarities(index, rows[known]))
+            return ml_scores
+        except Exception as e:
+            logger.error(f"Error in batch ML similarity calculation: {e}")
+            return np.full(len(internship_ids), 25.0)
+
+
 class HybridRecommendationEngine:
     # Hybrid recommendation engine with rule-based and ML approaches
     
     def __init__(self):
-        self.tfidf_vectorizer = None
-        self.tfidf_matrix = None
-        self.internship_texts = []
-        self.internship_metadata = []  # Store additional metadata
-        self.model_path = "ml_model.pkl"
-        self.model_version = "2.0"
-        self.last_training_time = None
-        self.training_data_hash = None
+        # The trained model is replaced as a whole by a single reference assignment
+        self._state = ModelState()
+        self._training_lock = threading.Lock()  # One fit at a time, readers never take it
+        self.model_path = os.getenv("ML_MODEL_PATH", "ml_model")
+        self.model_version = "3.1"
+        self.version_dir = None  # Model store version the published model was loaded from or saved to
+        self._store_checked_at = time.time()
         
         # Performance tracking
-        self.similarity_cache = {}
+        # Per-profile similarity vectors, bounded by count and by a memory budget
+        self.similarity_cache = create_cache_backend(
+            "similarity",
+            max_entries=int(os.getenv("MODEL_CACHE_SIZE", "1000")),
+            max_bytes=int(os.getenv("MODEL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            sizeof=lambda similarities: similarities.nbytes
+        )
+        # Transformed profile vectors, so ANN retrieval and scoring of one request transform the profile once
+        self.vector_cache = LRUCache(max_entries=PROFILE_VECTOR_CACHE_SIZE)
         self.cache_hits = 0
         self.cache_misses = 0
-        self.performance_metrics = {}  # Add missing performance_metrics
         
         # Try to load existing model
         if ML_AVAILABLE:
             self._load_model()
     
+    # Read-only views of the published model
+    @property
+    def state(self) -> ModelState:
+        return self._state
+    
+    @property
+    def tfidf_vectorizer(self):
+        return self._state.tfidf_vectorizer
+    
+    @property
+    def tfidf_matrix(self):
+        return self._state.tfidf_matrix
+    
+    @property
+    def internship_ids(self) -> np.ndarray:
+        return self._state.internship_ids
+    
+    @property
+    def training_data_hash(self) -> Optional[str]:
+        return self._state.training_data_hash
+    
+    @property
+    def last_training_time(self) -> Optional[datetime]:
+        return self._state.last_training_time
+    
+    @property
+    def performance_metrics(self) -> Dict:
+        return self._state.performance_metrics
+    
+    def _publish(self, state: ModelState):
+        """Make a fully built model visible to readers in one step"""
+        self._state = state
+        # Cached similarities and vectors belong to the previous model
+        self.similarity_cache.clear()
+        self.vector_cache.clear()
+    
     def _preprocess_text(self, text: str) -> str:
         """Enhanced text preprocessing for better feature extraction"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters but keep spaces and commas
-        text = re.sub(r'[^\w\s,]', ' ', text)
-        
-        # Replace commas with spaces to separate skills properly
-        text = text.replace(',', ' ')
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Enhanced technology-specific preprocessing
-        tech_replacements = {
-            'javascript': 'js',
-            'typescript': 'ts',
-            'machine learning': 'ml',
-            'artificial intelligence': 'ai',
-            'user interface': 'ui',
-            'user experience': 'ux',
-            'application programming interface': 'api',
-            'database': 'db',
-            'full stack': 'fullstack',
-            'react native': 'reactnative',
-            'node js': 'nodejs',
-            'spring boot': 'springboot',
-            'after effects': 'aftereffects',
-            'premiere pro': 'premierepro',
-            'adobe xd': 'adobexd',
-            'computer vision': 'computervision',
-            'natural language processing': 'nlp',
-            'big data': 'bigdata',
-            'quality assurance': 'qa',
-            'business intelligence': 'bi',
-            'penetration testing': 'pentest'
-        }
-        
-        for old_term, new_term in tech_replacements.items():
-            text = text.replace(old_term, new_term)
-        
-        return text
+        return preprocess_text(text)
 
     def _load_model(self):
-        """Load pre-trained ML model with version checking"""
+        """Load the saved model, memory-mapping the matrix arrays read-only"""
         try:
-            if os.path.exists(self.model_path):
-                with open(self.model_path, 'rb') as f:
-                    model_data = pickle.load(f)
-                
-                # Check model version compatibility
-                model_version = model_data.get('version', '1.0')
-                if model_version != self.model_version:
-                    logger.warning(f"Model version mismatch. Expected {self.model_version}, got {model_version}")
-                    return
-                
-                self.tfidf_vectorizer = model_data['vectorizer']
-                self.tfidf_matrix = model_data['tfidf_matrix']
-                self.internship_texts = model_data['internship_texts']
-                self.internship_metadata = model_data.get('internship_metadata', [])
-                self.last_training_time = model_data.get('training_time')
-                self.training_data_hash = model_data.get('data_hash')
-                
-                logger.info(f"Model v{model_version} loaded successfully (trained on {len(self.internship_texts)} internships)")
-                if self.last_training_time:
-                    logger.info(f"Last training: {self.last_training_time}")
-            else:
+            version_dir = current_version_dir(self.model_path)
+            if version_dir is None:
                 logger.info("No existing model found")
+                return
+            
+            state = self._read_model(version_dir)
+            if state is not None:
+                self._publish(state)
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             self._reset_model()
     
+    def reload_if_updated(self) -> bool:
+        """
+        Load the model store's current version when another worker has saved a newer one
+        Checked at most every ML_MODEL_RECHECK_SECONDS; skipped while this worker is training,
+        and a version that fails to load leaves the published model serving
+        """
+        if not ML_AVAILABLE or time.time() - self._store_checked_at < ML_MODEL_RECHECK_SECONDS:
+            return False
+        self._store_checked_at = time.time()
+        
+        if not self._training_lock.acquire(blocking=False):
+            return False
+        try:
+            version_dir = current_version_dir(self.model_path)
+            if version_dir is None or version_dir == self.version_dir:
+                return False
+            state = self._read_model(version_dir)
+            if state is None:
+                return False
+            self._publish(state)
+            return True
+        except Exception as e:
+            logger.error(f"Error reloading model from {version_dir}: {e}")
+            return False
+        finally:
+            self._training_lock.release()
+    
+    def _read_model(self, version_dir: str) -> Optional[ModelState]:
+        """Model saved in version_dir, None when it was saved by an incompatible model version"""
+        manifest, arrays, vocabulary = load_artifact(version_dir)
+        # Not retried until CURRENT points somewhere else
+        self.version_dir = version_dir
+        
+        # Check model version compatibility
+        model_version = manifest.get('model_version', '1.0')
+        if model_version != self.model_version:
+            logger.warning(f"Model version mismatch. Expected {self.model_version}, got {model_version}")
+            return None
+        
+        # Rebuild the vectorizer from its parameters, vocabulary and idf vector (no fitting)
+        vectorizer_params = dict(manifest['vectorizer_params'])
+        vectorizer_params['ngram_range'] = tuple(vectorizer_params['ngram_range'])  # JSON stores a list
+        if manifest.get('vectorizer_type', 'tfidf') == 'hashing':
+            vectorizer = HashingTfidfVectorizer(**vectorizer_params)
+            vectorizer.document_frequency_ = arrays['document_frequency']
+        else:
+            vectorizer = TfidfVectorizer(
+                **vectorizer_params,
+                vocabulary={term: idx for idx, term in enumerate(vocabulary)}
+            )
+        vectorizer.idf_ = np.asarray(arrays['idf'])
+        
+        # CSR matrix backed directly by the memory-mapped arrays, shared between workers
+        tfidf_matrix = csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=tuple(manifest['matrix_shape']), copy=False
+        )
+        
+        performance_metrics = manifest.get('performance_metrics', {})
+        projection, embeddings = None, None
+        if ML_SIMILARITY_MODE == 'dense':
+            if 'dense_embeddings' in arrays:
+                projection = LatentProjection(
+                    columns=arrays['dense_columns'],
+                    components=arrays['dense_components'],
+                    n_features=tfidf_matrix.shape[1],
+                    explained_variance=manifest.get('dense_explained_variance')
+                )
+                embeddings = arrays['dense_embeddings']
+            else:
+                # Saved in sparse mode: project now, the next training saves the embeddings
+                logger.info("Saved model has no dense embeddings, fitting the latent projection")
+                projection, embeddings = _fit_projection(tfidf_matrix)
+                performance_metrics = {
+                    **performance_metrics,
+                    'similarity_latency': _similarity_latency(tfidf_matrix, projection, embeddings)
+                }
+        
+        state = ModelState(
+            tfidf_vectorizer=vectorizer,
+            tfidf_matrix=tfidf_matrix,
+            internship_ids=arrays['internship_ids'],
+            row_hashes=arrays['row_hashes'],
+            training_data_hash=manifest.get('data_hash'),
+            last_training_time=datetime.fromisoformat(manifest['training_time']) if manifest.get('training_time') else None,
+            performance_metrics=performance_metrics,
+            drift=manifest.get('drift'),
+            projection=projection,
+            embeddings=embeddings,
+            ann_index=_build_ann_index(tfidf_matrix)
+        )
+        
+        logger.info(f"Model v{model_version} loaded from {version_dir} (trained on {tfidf_matrix.shape[0]} internships)")
+        if state.last_training_time:
+            logger.info(f"Last training: {state.last_training_time}")
+        return state
+    
     def _reset_model(self):
         """Reset model state"""
-        self.tfidf_vectorizer = None
-        self.tfidf_matrix = None
-        self.internship_texts = []
-        self.internship_metadata = []
-        self.similarity_cache.clear()
+        self._publish(ModelState())
+
+    def get_rows(self, internship_ids) -> np.ndarray:
+        """Matrix rows of the published model for the given internship ids"""
+        return self._state.get_rows(internship_ids)
 
-    def _save_model(self):
-        """Save trained ML model with metadata"""
+    def _save_model(self, state: ModelState):
+        """Save trained ML model as memory-mappable arrays plus a JSON manifest"""
         try:
-            model_data = {
-                'version': self.model_version,
-                'vectorizer': self.tfidf_vectorizer,
-                'tfidf_matrix': self.tfidf_matrix,
-                'internship_texts': self.internship_texts,
-                'internship_metadata': self.internship_metadata,
-                'training_time': datetime.now().isoformat(),
-                'data_hash': self.training_data_hash,
-                'performance_metrics': self.performance_metrics
-            }
+            vectorizer = state.tfidf_vectorizer
+            extra_arrays = {}
+            if isinstance(vectorizer, HashingTfidfVectorizer):
+                vectorizer_type = 'hashing'
+                vocabulary = None
+                vectorizer_params = vectorizer.get_params()
+                extra_arrays['document_frequency'] = vectorizer.document_frequency_
+            else:
+                vectorizer_type = 'tfidf'
+                vocabulary = [None] * len(vectorizer.vocabulary_)
+                for term, idx in vectorizer.vocabulary_.items():
+                    vocabulary[idx] = term
+                vectorizer_params = {
+                    key: value for key, value in vectorizer.get_params().items()
+                    if key in PERSISTED_VECTORIZER_PARAMS
+                }
+            if state.projection is not None:
+                extra_arrays['dense_columns'] = state.projection.columns
+                extra_arrays['dense_components'] = state.projection.components
+                extra_arrays['dense_embeddings'] = state.embeddings
             
-            os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            with open(self.model_path, 'wb') as f:
-                pickle.dump(model_data, f)
+            manifest = {
+                'model_version': self.model_version,
+                'vectorizer_type': vectorizer_type,
+                'training_time': (state.last_training_time or datetime.now()).isoformat(),
+                'data_hash': state.training_data_hash,
+                'matrix_shape': list(state.tfidf_matrix.shape),
+                'vectorizer_params': vectorizer_params,
+                'performance_metrics': state.performance_metrics,
+                'drift': state.drift,
+                'similarity_mode': state.similarity_mode,
+                'dense_explained_variance': state.projection.explained_variance if state.projection is not None else None
+            }
+            arrays = {
+                'data': state.tfidf_matrix.data,
+                'indices': state.tfidf_matrix.indices,
+                'indptr': state.tfidf_matrix.indptr,
+                'idf': state.tfidf_vectorizer.idf_,
+                'internship_ids': state.internship_ids,
+                'row_hashes': state.row_hashes,
+                **extra_arrays
+            }
             
-            logger.info(f"Model v{self.model_version} saved successfully")
+            version_dir = save_artifact(self.model_path, manifest, arrays, vocabulary)
+            self.version_dir = version_dir
+            logger.info(f"Model v{self.model_version} saved to {version_dir}")
         except Exception as e:
             logger.error(f"Error saving model: {e}")
 
     def _extract_text_features(self, internship):
         """Enhanced text feature extraction with weighted importance"""
-        text_features = []
-        
-        # Title/Role (highest importance - repeat 3x for emphasis)
-        if hasattr(internship, 'title') and internship.title:
-            title_text = self._preprocess_text(internship.title)
-            text_features.extend([title_text] * 3)
-        
-        # Skills (high importance - repeat 2x)
-        if hasattr(internship, 'skill') and internship.skill and internship.skill.description:
-            skills_text = self._preprocess_text(internship.skill.description)
-            text_features.extend([skills_text] * 2)
-        
-        # Sector (high importance - repeat 2x)
-        if hasattr(internship, 'sector') and internship.sector:
-            sector_text = self._preprocess_text(internship.sector.name)
-            text_features.extend([sector_text] * 2)
-        
-        # Description (medium importance)
-        if hasattr(internship, 'description') and internship.description:
-            desc_text = self._preprocess_text(internship.description)
-            text_features.append(desc_text)
-        
-        # Location (lower importance)
-        if hasattr(internship, 'location') and internship.location:
-            location_text = self._preprocess_text(internship.location.description)
-            text_features.append(location_text)
-        
-        combined_text = ' '.join(filter(None, text_features))
-        return combined_text if combined_text.strip() else "internship opportunity"
+        return build_feature_text(internship_fields(internship))
     
     def is_ready_for_ml(self) -> bool:
         """Check if ML model is ready for use"""
-        return (ML_AVAILABLE and 
-                self.tfidf_vectorizer is not None and 
-                self.tfidf_matrix is not None and 
-                len(self.internship_texts) > 0)
+        return ML_AVAILABLE and self._state.is_ready()
     
     def train_manually(self, internships: List[Internship], force_retrain: bool = False):
-        """Enhanced training method with better preprocessing and caching"""
+        """Train from an in-memory list of internships, see train_streaming"""
+        return self.train_streaming(lambda: internships, force_retrain=force_retrain)
+    
+    def train_streaming(self, open_rows: Callable[[], Iterable[Internship]], force_retrain: bool = False):
+        """
+        Enhanced training method with better preprocessing and caching
+        open_rows returns a fresh iterable of internships (e.g. a yield_per query) each time it is called;
+        rows are consumed one at a time and their texts are never all held in memory.
+        Unless forced, only changed rows are re-indexed and the vocabulary is refit on drift;
+        that refit reads the rows a second time (open_rows is called again) instead of keeping
+        every text from the first pass in memory.
+        The new model is built off to the side and published only once complete;
+        on failure the previous model keeps serving
+        """
         if not ML_AVAILABLE:
             logger.warning("ML libraries not available for training")
             return False
         
-        # Check if retraining is needed
-        if not force_retrain and self.is_ready_for_ml():
-            # Check if data has changed
-            current_data_hash = self._calculate_data_hash(internships)
-            if current_data_hash == self.training_data_hash:
-                logger.info("Model already trained with current data")
-                return True
-        
-        try:
-            logger.info(f"Training ML model with {len(internships)} internships...")
-            start_time = time.time()
-            
-            # Prepare enhanced text data for training
-            self.internship_texts = []
-            self.internship_metadata = []
-            
-            for idx, internship in enumerate(internships):
-                # Extract enhanced text features
-                combined_text = self._extract_text_features(internship)
-                self.internship_texts.append(combined_text)
+        with self._training_lock:
+            # Check if retraining is needed
+            state = self._state
+            try:
+                if not force_retrain and self.is_ready_for_ml():
+                    # One pass: hash every row, keep only the texts that differ from the model
+                    internship_ids, row_hashes, changed_texts = self._scan_rows(open_rows(), state)
+                    
+                    # Check if data has changed
+                    if _combined_hash(internship_ids, row_hashes) == state.training_data_hash:
+                        logger.info("Model already trained with current data")
+                        return True
+                    
+                    if ML_INCREMENTAL_UPDATES:
+                        updated = self._index_rows(state, internship_ids, changed_texts, row_hashes, remove_missing=True)
+                        if updated.drift_ratio() <= ML_VOCABULARY_DRIFT_THRESHOLD:
+                            self._publish(updated)
+                            self._save_model(updated)
+                            return True
+                        logger.info(f"Vocabulary drift {updated.drift_ratio():.3f} above threshold, refitting")
                 
-                # Store metadata for analysis
-                metadata = {
-                    'id': getattr(internship, 'id', idx),
-                    'title': getattr(internship, 'title', ''),
-                    'sector': getattr(internship, 'sector', ''),
-                    'text_length': len(combined_text)
-                }
-                self.internship_metadata.append(metadata)
-            
-            # Enhanced TF-IDF vectorizer with better parameters
-            self.tfidf_vectorizer = TfidfVectorizer(
-                max_features=8000,  # Increased for better feature capture
-                stop_words='english',
-                ngram_range=(1, 3),  # Include trigrams for better context
-                min_df=1,
-                max_df=0.90,  # Slightly lower to include more distinctive terms
-                sublinear_tf=True,  # Better handling of term frequency
-                norm='l2',  # L2 normalization for cosine similarity
-                lowercase=True,
-                token_pattern=r'\b\w+\b'  # Include single letters (useful for tech terms)
-            )
+                state = self._fit(open_rows())
+            except Exception as e:
+                logger.error(f"Error during training: {e}")
+                return False
             
-            # Fit and transform the text data
-            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(self.internship_texts)
-            
-            # Calculate and store training metadata
-            training_time = time.time() - start_time
-            self.training_data_hash = self._calculate_data_hash(internships)
-            self.last_training_time = datetime.now()
-            
-            # Performance metrics
-            self.performance_metrics = {
-                'training_time': training_time,
-                'vocabulary_size': len(self.tfidf_vectorizer.vocabulary_),
-                'matrix_shape': self.tfidf_matrix.shape,
-                'sparsity': 1.0 - (self.tfidf_matrix.nnz / (self.tfidf_matrix.shape[0] * self.tfidf_matrix.shape[1]))
-            }
+            self._publish(state)
             
             # Save the enhanced model
-            self._save_model()
-            
-            logger.info(f"ML training completed in {training_time:.2f}s")
-            logger.info(f"Matrix shape: {self.tfidf_matrix.shape}")
-            logger.info(f"Vocabulary size: {len(self.tfidf_vectorizer.vocabulary_)}")
-            logger.info(f"Matrix sparsity: {self.performance_metrics['sparsity']:.3f}")
-            
+            self._save_model(state)
             return True
+    
+    def index_internships(self, internships: List[Internship]) -> bool:
+        """
+        Add or replace the vectors of a few internships using the fitted vocabulary
+        Returns True when vocabulary drift calls for a full refit
+        """
+        with self._training_lock:
+            state = self._state
+            if not (ML_AVAILABLE and state.is_ready()):
+                return False
             
-        except Exception as e:
-            logger.error(f"Error during training: {e}")
-            self._reset_model()
-            return False
+            internship_ids, internship_texts, row_hashes = self._prepare_rows(internships)
+            updated = self._index_rows(state, internship_ids, internship_texts, row_hashes, remove_missing=False)
+            if updated is not state:
+                self._publish(updated)
+                self._save_model(updated)
+            return updated.drift_ratio() > ML_VOCABULARY_DRIFT_THRESHOLD
+    
+    def _prepare_rows(self, internships: List[Internship]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Internship ids, feature texts and per-row content hashes"""
+        internship_texts = [self._extract_text_features(internship) for internship in internships]
+        internship_ids = np.fromiter(
+            (getattr(internship, 'id', idx) for idx, internship in enumerate(internships)),
+            dtype=np.int64, count=len(internships)
+        )
+        return internship_ids, internship_texts, _row_hashes(internship_texts)
+    
+    def _iter_texts(self, internships: Iterable[Internship], internship_ids: array, row_hashes: array) -> Iterator[str]:
+        """
+        Feature text of each row as it streams by, recording its id and content hash
+        """
+        def fields():
+            for idx, internship in enumerate(internships):
+                internship_ids.append(getattr(internship, 'id', idx))
+                yield internship_fields(internship)
+        
+        for text, row_hash in iter_feature_texts(fields()):
+            row_hashes.append(row_hash)
+            yield text
+    
+    def _scan_rows(self, internships: Iterable[Internship], state: ModelState) -> Tuple[np.ndarray, np.ndarray, Dict[int, str]]:
+        """Ids and content hashes of all rows, plus the texts (by position) of rows new or changed since state"""
+        internship_ids, row_hashes = array('q'), array('Q')
+        changed_texts = {}
+        row_index, known_hashes = state.row_index, state.row_hashes
+        for position, text in enumerate(self._iter_texts(internships, internship_ids, row_hashes)):
+            internship_id = internship_ids[position]
+            row = row_index[internship_id] if 0 <= internship_id < len(row_index) else -1
+            if row < 0 or known_hashes[row] != row_hashes[position]:
+                changed_texts[position] = text
+        return np.frombuffer(internship_ids, dtype=np.int64), np.frombuffer(row_hashes, dtype=np.uint64), changed_texts
+    
+    def _new_vectorizer(self):
+        if ML_VECTORIZER == 'hashing':
+            # Fixed memory: no vocabulary is built, whatever the catalog size
+            return HashingTfidfVectorizer(
+                n_features=ML_HASHING_FEATURES,
+                ngram_range=(1, 3),
+                stop_words='english',
+                token_pattern=r'\b\w+\b',
+                sublinear_tf=True,
+                chunk_size=ML_TRAINING_BATCH_SIZE,
+                max_df=VECTORIZER_MAX_DF,
+                max_features=VECTORIZER_MAX_FEATURES
+            )
+        
+        # Enhanced TF-IDF vectorizer with better parameters
+        return TfidfVectorizer(
+            max_features=VECTORIZER_MAX_FEATURES,  # Increased for better feature capture
+            stop_words='english',
+            ngram_range=(1, 3),  # Include trigrams for better context
+            min_df=1,
+            max_df=VECTORIZER_MAX_DF,  # Slightly lower to include more distinctive terms
+            sublinear_tf=True,  # Better handling of term frequency
+            norm='l2',  # L2 normalization for cosine similarity
+            lowercase=True,
+            token_pattern=r'\b\w+\b'  # Include single letters (useful for tech terms)
+        )
+    
+    def _fit(self, internships: Iterable[Internship]) -> ModelState:
+        """Fit a complete new model in one pass over the rows, without touching the published one"""
+        logger.info(f"Training ML model ({ML_VECTORIZER} vectorizer)...")
+        start_time = time.time()
+        
+        # Fit and transform the text data as it is generated
+        tfidf_vectorizer = self._new_vectorizer()
+        internship_ids, row_hashes = array('q'), array('Q')
+        tfidf_matrix = tfidf_vectorizer.fit_transform(self._iter_texts(internships, internship_ids, row_hashes))
+        internship_ids = np.frombuffer(internship_ids, dtype=np.int64)
+        row_hashes = np.frombuffer(row_hashes, dtype=np.uint64)
+        
+        projection, embeddings = _fit_projection(tfidf_matrix) if ML_SIMILARITY_MODE == 'dense' else (None, None)
+        
+        # Calculate and store training metadata
+        training_time = time.time() - start_time
+        
+        # Performance metrics
+        performance_metrics = {
+            'training_time': training_time,
+            'vectorizer': ML_VECTORIZER,
+            'vocabulary_size': _feature_count(tfidf_vectorizer),
+            'matrix_shape': list(tfidf_matrix.shape),
+            'sparsity': 1.0 - (tfidf_matrix.nnz / max(tfidf_matrix.shape[0] * tfidf_matrix.shape[1], 1)),
+            'similarity_latency': _similarity_latency(tfidf_matrix, projection, embeddings)
+        }
+        if projection is not None:
+            performance_metrics['dense_dimensions'] = projection.dimensions
+            performance_metrics['dense_explained_variance'] = projection.explained_variance
+        
+        logger.info(f"ML training completed in {training_time:.2f}s")
+        logger.info(f"Matrix shape: {tfidf_matrix.shape}")
+        logger.info(f"Vocabulary size: {performance_metrics['vocabulary_size']}")
+        logger.info(f"Matrix sparsity: {performance_metrics['sparsity']:.3f}")
+        
+        return ModelState(
+            tfidf_vectorizer=tfidf_vectorizer,
+            tfidf_matrix=tfidf_matrix,
+            internship_ids=internship_ids,
+            row_hashes=row_hashes,
+            training_data_hash=_combined_hash(internship_ids, row_hashes),
+            last_training_time=datetime.now(),
+            performance_metrics=performance_metrics,
+            projection=projection,
+            embeddings=embeddings,
+            ann_index=_build_ann_index(tfidf_matrix)
+        )
+    
+    def _index_rows(self, state: ModelState, internship_ids: np.ndarray, internship_texts: Mapping[int, str],
+                    row_hashes: np.ndarray, remove_missing: bool) -> ModelState:
+        """
+        New model with changed or added rows re-transformed with the fitted vocabulary
+        internship_texts only needs the positions of rows that differ from state
+        With remove_missing, rows whose id is not in internship_ids are dropped
+        Returns the given state unchanged when no row differs
+        """
+        start_time = time.time()
+        rows = state.get_rows(internship_ids)
+        existing = rows >= 0
+        changed = ~existing
+        changed[existing] = state.row_hashes[rows[existing]] != row_hashes[existing]
+        
+        keep = np.zeros(len(state.internship_ids), dtype=bool) if remove_missing else np.ones(len(state.internship_ids), dtype=bool)
+        keep[rows[existing]] = True
+        keep[rows[existing & changed]] = False  # Replaced by a new vector below
+        
+        if not changed.any() and keep.all():
+            return state
+        
+        changed_texts = [internship_texts[i] for i in np.flatnonzero(changed)]
+        if changed_texts:
+            new_vectors = state.tfidf_vectorizer.transform(changed_texts)
+        else:
+            # Rows were only removed; the vectorizer rejects an empty batch
+            new_vectors = csr_matrix((0, state.tfidf_matrix.shape[1]), dtype=state.tfidf_matrix.dtype)
+        kept_rows = np.flatnonzero(keep)
+        tfidf_matrix = vstack([state.tfidf_matrix[kept_rows], new_vectors], format='csr')
+        ids = np.concatenate([state.internship_ids[kept_rows], internship_ids[changed]])
+        hashes = np.concatenate([state.row_hashes[kept_rows], row_hashes[changed]])
+        embeddings = None
+        if state.projection is not None:
+            # New rows go through the fitted projection, like the vocabulary
+            embeddings = np.vstack([state.embeddings[kept_rows], state.projection.transform(new_vectors)])
+        
+        # Vocabulary drift: terms of the re-indexed rows the vectorizer cannot represent
+        drift = dict(state.drift)
+        if changed_texts:
+            drift['rows'] += len(changed_texts)
+            if isinstance(state.tfidf_vectorizer, HashingTfidfVectorizer):
+                terms, unknown_terms = state.tfidf_vectorizer.unknown_terms(changed_texts)
+                drift['terms'] += terms
+                drift['unknown_terms'] += unknown_terms
+            else:
+                analyzer = state.tfidf_vectorizer.build_analyzer()
+                vocabulary = state.tfidf_vectorizer.vocabulary_
+                for text in changed_texts:
+                    terms = analyzer(text)
+                    drift['terms'] += len(terms)
+                    drift['unknown_terms'] += sum(1 for term in terms if term not in vocabulary)
+        
+        performance_metrics = {
+            **state.performance_metrics,
+            'matrix_shape': list(tfidf_matrix.shape),
+            'sparsity': 1.0 - (tfidf_matrix.nnz / max(tfidf_matrix.shape[0] * tfidf_matrix.shape[1], 1)),
+            'last_incremental_update': datetime.now().isoformat()
+        }
+        
+        logger.info(f"Indexed {len(changed_texts)} changed and dropped {int((~keep).sum()) - int((existing & changed).sum())} "
+                    f"removed internships in {time.time() - start_time:.3f}s")
+        
+        return ModelState(
+            tfidf_vectorizer=state.tfidf_vectorizer,
+            tfidf_matrix=tfidf_matrix,
+            internship_ids=ids,
+            row_hashes=hashes,
+            training_data_hash=_combined_hash(ids, hashes),
+            last_training_time=state.last_training_time,
+            performance_metrics=performance_metrics,
+            drift=drift,
+            projection=state.projection,
+            embeddings=embeddings,
+            ann_index=_build_ann_index(tfidf_matrix)
+        )
     
     def _calculate_data_hash(self, internships: List[Internship]) -> str:
         """Calculate hash of training data to detect changes"""
+        internship_ids, _, row_hashes = self._prepare_rows(internships)
+        return _combined_hash(internship_ids, row_hashes)
+    
+    def _profile_similarities(self, student_profile: str, state: ModelState) -> np.ndarray:
+        """Cosine similarity of a profile to every internship in one model, cached per profile"""
+        processed_profile = self._preprocess_text(student_profile)
+        
+        # Key on the trained data too, so a shared cache never mixes models
+        cache_key = hashlib.md5(f"{state.training_data_hash}_{state.similarity_mode}_{processed_profile}".encode()).hexdigest()
+        similarities = self.similarity_cache.get(cache_key)
+        if similarities is not None:
+            return similarities
+        
+        student_vector = self._profile_vector(processed_profile, state)
+        
+        # Rows and profile are L2-normalized, so one mat-vec gives cosine similarity
+        if state.embeddings is not None:
+            similarities = state.embeddings @ state.projection.transform_one(student_vector)
+        else:
+            similarities = (state.tfidf_matrix @ student_vector.T).toarray().ravel()
+        
+        self.similarity_cache.set(cache_key, similarities)
+        return similarities
+    
+    def _profile_vector(self, processed_profile: str, state: ModelState):
+        """Profile transformed with the model's vectorizer, reused within and across requests"""
+        cache_key = (state.training_data_hash, processed_profile)
+        student_vector = self.vector_cache.get(cache_key)
+        if student_vector is None:
+            student_vector = state.tfidf_vectorizer.transform([processed_profile])
+            self.vector_cache.set(cache_key, student_vector)
+        return student_vector
+    
+    def nearest_internships(self, student_profile: str, top_n: int) -> np.ndarray:
+        """Ids of about top_n internships most similar to the profile, from the ANN index (best first)"""
+        state = self._state
+        if not (ML_AVAILABLE and state.is_ready() and state.ann_index is not None):
+            return np.zeros(0, dtype=np.int64)
+        
         try:
-            data_string = ""
-            for internship in internships:
-                data_string += f"{getattr(internship, 'id', '')}:"
-                data_string += f"{getattr(internship, 'title', '')}:"
-                data_string += f"{getattr(internship, 'description', '')}:"
-                data_string += f"{getattr(internship, 'sector', '')}"
-            
-            return hashlib.md5(data_string.encode()).hexdigest()
+            student_vector = self._profile_vector(self._preprocess_text(student_profile), state)
+            return np.asarray(state.internship_ids)[state.ann_index.query(student_vector, top_n)]
         except Exception as e:
-            logger.warning(f"Could not calculate data hash: {e}")
-            return str(time.time())
+            logger.error(f"Error in ANN retrieval: {e}")
+            return np.zeros(0, dtype=np.int64)
     
-    def calculate_ml_similarity(self, student_profile: str, internship_idx: int) -> float:
+    def profile_batch(self, student_profiles: List[str]) -> Optional[ProfileBatch]:
+        """Vectors of many profiles against the published model, None when no model is ready"""
+        state = self._state
+        if not (ML_AVAILABLE and state.is_ready()):
+            return None
+        return ProfileBatch(state, student_profiles)
+    
+    def calculate_ml_similarity(self, student_profile: str, internship_id: int) -> float:
         """Enhanced ML-based similarity calculation with caching"""
-        if not self.is_ready_for_ml():
+        state = self._state  # Same model for the row lookup and the similarities
+        if not (ML_AVAILABLE and state.is_ready()):
             return 25.0  # Neutral fallback score (out of 40)
         
         try:
-            # Check cache first
-            cache_key = hashlib.md5(f"{student_profile}_{internship_idx}".encode()).hexdigest()
-            if cache_key in self.similarity_cache:
-                return self.similarity_cache[cache_key]
-            
-            # Preprocess student profile
-            processed_profile = self._preprocess_text(student_profile)
-            
-            # Transform student profile using trained vectorizer
-            student_vector = self.tfidf_vectorizer.transform([processed_profile])
+            # Internships added after training have no vector yet
+            row = state.get_rows([internship_id])[0]
+            if row < 0:
+                return 25.0
             
-            # Ensure internship index is valid
-            if internship_idx >= len(self.internship_texts):
-                internship_idx = internship_idx % len(self.internship_texts)
-            
-            # Get internship vector
-            internship_vector = self.tfidf_matrix[internship_idx]
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(student_vector, internship_vector)[0][0]
+            similarity = self._profile_similarities(student_profile, state)[row]
             
             # Enhanced scoring with multiple factors
-            base_score = similarity * 40
+            return float(_similarity_to_score(similarity))
             
-            # Bonus for high-quality matches
-            if similarity > 0.7:
-                base_score *= 1.1  # 10% bonus for excellent matches
-            elif similarity > 0.5:
-                base_score *= 1.05  # 5% bonus for good matches
-            
-            # Ensure reasonable score range
-            ml_score = max(min(base_score, 40.0), 15.0)  # Between 15-40
+        except Exception as e:
+            logger.error(f"Error in ML similarity calculation: {e}")
+            return 25.0  # Fallback score
+
+    def calculate_ml_similarity_batch(self, student_profile: str, internship_ids: np.ndarray) -> np.ndarray:
+        """ML similarity scores for many internships from a single profile transform"""
+        state = self._state  # Same model for the row lookup and the similarities
+        if not (ML_AVAILABLE and state.is_ready()):
+            return np.full(len(internship_ids), 25.0)  # Neutral fallback score (out of 40)
+        
+        try:
+            # Look up matrix rows by id; untrained internships keep the neutral score
+            rows = state.get_rows(internship_ids)
+            known = rows >= 0
+            ml_scores = np.full(len(rows), 25.0)
             
-            # Cache the result
-            self.similarity_cache[cache_key] = ml_score
+            similarities = self._profile_similarities(student_profile, state)
+            ml_scores[known] = _similarity_to_score(similarities[rows[known]])
             
-            return ml_score
+            return ml_scores
             
         except Exception as e:
-            logger.error(f"Error in ML similarity calculation: {e}")
-            return 25.0  # Fallback score
+            logger.error(f"Error in batch ML similarity calculation: {e}")
+            return np.full(len(internship_ids), 25.0)  # Fallback score
+
+
+def _similarity_to_score(similarity):
+    """Map cosine similarity to the 15-40 ML score range, works on scalars and arrays"""
+    base_score = np.asarray(similarity, dtype=float) * 40
+    
+    # Bonus for high-quality matches (10% excellent, 5% good)
+    base_score = np.where(similarity > 0.7, base_score * 1.1,
+                          np.where(similarity > 0.5, base_score * 1.05, base_score))
+    
+    # Ensure reasonable score range
+    return np.clip(base_score, 15.0, 40.0)
+
+
+def build_student_profile(student_data: Dict) -> str:
+    """Combine the student form fields into the text used for ML similarity"""
+    profile_parts = []
+    
+    if student_data.get('description'):
+        profile_parts.append(student_data['description'])
+    
+    if student_data.get('skills'):
+        skills_text = ' '.join(student_data['skills'])
+        profile_parts.append(skills_text)
+    
+    if student_data.get('sector'):
+        profile_parts.append(student_data['sector'])
+    
+    if student_data.get('education'):
+        profile_parts.append(student_data['education'])
+    
+    return ' '.join(profile_parts)
 
 
 # Global instance
 recommendation_engine = HybridRecommendationEngine()
 
 
-def calculate_enhanced_score(internship: Internship, student_data: Dict, internship_idx: int = 0) -> Tuple[float, Dict]:
+def calculate_enhanced_score(internship: Internship, student_data: Dict) -> Tuple[float, Dict]:
     """
     Enhanced scoring with detailed breakdown and diagnostics
     Returns: (total_score, score_breakdown)
@@ -355,25 +872,10 @@ def calculate_enhanced_score(internship: Internship, student_data: Dict, interns
         
         if recommendation_engine.is_ready_for_ml():
             # Build comprehensive student profile
-            profile_parts = []
-            
-            if student_data.get('description'):
-                profile_parts.append(student_data['description'])
-            
-            if student_data.get('skills'):
-                skills_text = ' '.join(student_data['skills'])
-                profile_parts.append(skills_text)
-            
-            if student_data.get('sector'):
-                profile_parts.append(student_data['sector'])
-            
-            if student_data.get('education'):
-                profile_parts.append(student_data['education'])
-            
-            student_profile = ' '.join(profile_parts)
+            student_profile = build_student_profile(student_data)
             
             if student_profile.strip():
-                ml_score = recommendation_engine.calculate_ml_similarity(student_profile, internship_idx)
+                ml_score = recommendation_engine.calculate_ml_similarity(student_profile, internship.id)
                 ml_details = {
                     "status": "calculated",
                     "score": ml_score,
@@ -404,7 +906,6 @@ def calculate_enhanced_score(internship: Internship, student_data: Dict, interns
                 **ml_details,
                 "weight": 0.4
             },
-            "internship_idx": internship_idx,
             "internship_id": getattr(internship, 'id', None)
         }
         
@@ -417,28 +918,121 @@ def calculate_enhanced_score(internship: Internship, student_data: Dict, interns
         return min(fallback_score, 100), {"error": str(e), "fallback": True}
 
 
+def calculate_enhanced_scores_batch(columns: Dict, student_data: Dict, internship_ids: np.ndarray,
+                                    top_k: Optional[int] = None,
+                                    ml_scorer: Optional[Callable[[np.ndarray], np.ndarray]] = None) -> Tuple[np.ndarray, Dict]:
+    """
+    Vectorized calculate_enhanced_score over scoring columns
+    With top_k, rows that cannot reach the top k whatever their ML score are skipped and get -inf
+    ml_scorer maps internship ids to ML scores, e.g. a ProfileBatch computed for many students at once
+    Returns: (total_scores, score_breakdown) where the breakdown holds per-row arrays
+    """
+    rule_scores = calculate_rule_based_scores_batch(columns, student_data)
+    
+    # ML-based score (40%) - only if model is ready
+    if recommendation_engine.is_ready_for_ml():
+        student_profile = build_student_profile(student_data)
+        if student_profile.strip():
+            active = _rows_that_can_reach_top_k(rule_scores, top_k)
+            ml_scores = np.full(len(rule_scores), np.nan)
+            active_ids = np.asarray(internship_ids)[active]
+            if ml_scorer is not None:
+                ml_scores[active] = ml_scorer(active_ids)
+            else:
+                ml_scores[active] = recommendation_engine.calculate_ml_similarity_batch(student_profile, active_ids)
+            ml_status = "calculated"
+        else:
+            ml_scores = np.full(len(rule_scores), 25.0)  # Neutral score for empty profile
+            ml_status = "empty_profile"
+    else:
+        ml_scores = np.full(len(rule_scores), 25.0)  # Neutral fallback
+        ml_status = "model_not_ready"
+    
+    # Ensure ML score helps (minimum 50% of max)
+    ml_scores = np.maximum(ml_scores, ML_SCORE_FLOOR)
+    
+    total_scores = np.minimum(rule_scores + ml_scores, 100)
+    total_scores[np.isnan(total_scores)] = -np.inf  # Skipped rows
+    
+    score_breakdown = {
+        "rule_based": rule_scores,
+        "ml_based": ml_scores,
+        "ml_status": ml_status
+    }
+    
+    return total_scores, score_breakdown
+
+
+def _rows_that_can_reach_top_k(rule_scores: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+    """Mask of rows whose best possible total beats the k-th best guaranteed total"""
+    if not top_k or len(rule_scores) <= top_k:
+        return np.ones(len(rule_scores), dtype=bool)
+    
+    # The final ML score always lies between the floor and the ceiling
+    lower_bounds = np.minimum(rule_scores + ML_SCORE_FLOOR, 100)
+    upper_bounds = np.minimum(rule_scores + ML_SCORE_CEILING, 100)
+    kth_lower_bound = np.partition(lower_bounds, len(lower_bounds) - top_k)[len(lower_bounds) - top_k]
+    
+    return upper_bounds >= kth_lower_bound
+
+
 def get_model_status() -> Dict:
     """Get comprehensive ML model status and performance metrics"""
+    state = recommendation_engine.state
     status = {
         "ml_available": ML_AVAILABLE,
-        "is_trained": recommendation_engine.is_ready_for_ml(),
-        "training_size": len(recommendation_engine.internship_texts) if recommendation_engine.internship_texts else 0,
-        "model_file_exists": os.path.exists(recommendation_engine.model_path),
+        "is_trained": ML_AVAILABLE and state.is_ready(),
+        "training_size": state.tfidf_matrix.shape[0] if state.tfidf_matrix is not None else 0,
+        "model_file_exists": current_version_dir(recommendation_engine.model_path) is not None,
         "model_version": recommendation_engine.model_version,
-        "cache_size": len(recommendation_engine.similarity_cache)
     }
     
+    # Similarity cache usage
+    cache_stats = recommendation_engine.similarity_cache.stats()
+    status["cache_size"] = cache_stats["entries"]
+    status["cache_bytes"] = cache_stats.get("bytes")
+    status["cache_max_bytes"] = cache_stats.get("max_bytes")
+    
     # Add performance metrics if available
-    if recommendation_engine.performance_metrics:
-        status["performance_metrics"] = recommendation_engine.performance_metrics
+    if state.performance_metrics:
+        status["performance_metrics"] = state.performance_metrics
     
     # Add training information if available
-    if recommendation_engine.last_training_time:
-        status["last_training"] = recommendation_engine.last_training_time.isoformat()
+    if state.last_training_time:
+        status["last_training"] = state.last_training_time.isoformat()
     
     # Add vocabulary info if model is trained
-    if recommendation_engine.tfidf_vectorizer:
-        status["vocabulary_size"] = len(recommendation_engine.tfidf_vectorizer.vocabulary_)
+    if state.tfidf_vectorizer:
+        status["vectorizer"] = "hashing" if isinstance(state.tfidf_vectorizer, HashingTfidfVectorizer) else "tfidf"
+        status["vocabulary_size"] = _feature_count(state.tfidf_vectorizer)
+        if state.ann_index is not None:
+            status["ann_index"] = {
+                "tables": state.ann_index.n_tables,
+                "bits": state.ann_index.n_bits,
+                "probes": state.ann_index.n_probes,
+                "bytes": state.ann_index.nbytes,
+                "candidates": ML_ANN_CANDIDATES
+            }
+        latency = state.performance_metrics.get('similarity_latency', {})
+        status["similarity"] = {
+            "mode": state.similarity_mode,
+            "sparse": {
+                "bytes": _sparse_nbytes(state.tfidf_matrix),
+                "ms_per_query": latency.get('sparse_ms')
+            }
+        }
+        if state.projection is not None:
+            status["similarity"]["dense"] = {
+                "dimensions": state.projection.dimensions,
+                "bytes": state.embeddings.nbytes + state.projection.nbytes,
+                "ms_per_query": latency.get('dense_ms'),
+                "explained_variance": state.projection.explained_variance
+            }
+        status["vocabulary_drift"] = {
+            **state.drift,
+            "ratio": round(state.drift_ratio(), 4),
+            "refit_threshold": ML_VOCABULARY_DRIFT_THRESHOLD
+        }
     
     return status
 
@@ -457,8 +1051,8 @@ def retrain_model_if_needed(internships: List[Internship]) -> bool:
         if (not recommendation_engine.is_ready_for_ml() or 
             current_hash != recommendation_engine.training_data_hash):
             
-            logger.info("Data changed, retraining model...")
-            return recommendation_engine.train_manually(internships, force_retrain=True)
+            logger.info("Data changed, updating model...")
+            return recommendation_engine.train_manually(internships)
         
         logger.info("Model is up to date")
         return True
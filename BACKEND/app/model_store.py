@@ -0,0 +1,91 @@
+# Versioned, pickle-free on-disk format for the TF-IDF model
+#
+# <model_dir>/CURRENT            name of the active version directory
+# <model_dir>/<version>/manifest.json
+# <model_dir>/<version>/*.npy    CSR arrays, idf vector, internship ids (memory-mapped on load)
+# <model_dir>/<version>/vocabulary.txt   one term per line, line number = feature index
+import os
+import json
+import shutil
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 2
+
+
+def current_version_dir(model_dir: str) -> Optional[str]:
+    """Path of the active version directory, None if no model was saved"""
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILE)) as f:
+            version_dir = os.path.join(model_dir, f.read().strip())
+    except FileNotFoundError:
+        return None
+    return version_dir if os.path.exists(os.path.join(version_dir, "manifest.json")) else None
+
+
+def save_artifact(model_dir: str, manifest: Dict, arrays: Dict[str, np.ndarray],
+                  vocabulary: Optional[List[str]] = None) -> str:
+    """Write a new version directory and atomically point CURRENT at it"""
+    os.makedirs(model_dir, exist_ok=True)
+    version = datetime.now().strftime("v%Y%m%d%H%M%S%f")
+    tmp_dir = os.path.join(model_dir, f".{version}.tmp")
+    os.makedirs(tmp_dir)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+
+    if vocabulary is not None:
+        with open(os.path.join(tmp_dir, "vocabulary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(vocabulary))
+
+    manifest = {**manifest, "format_version": FORMAT_VERSION, "arrays": sorted(arrays)}
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+    # Publish: rename the finished directory, then swap the pointer file
+    version_dir = os.path.join(model_dir, version)
+    os.rename(tmp_dir, version_dir)
+    pointer_tmp = os.path.join(model_dir, f".{CURRENT_FILE}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(model_dir, CURRENT_FILE))
+
+    _prune_old_versions(model_dir, keep=version)
+    return version_dir
+
+
+def load_artifact(version_dir: str) -> Tuple[Dict, Dict[str, np.ndarray], Optional[List[str]]]:
+    """Read the manifest and memory-map every array read-only"""
+    with open(os.path.join(version_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format {manifest.get('format_version')}")
+
+    arrays = {
+        name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+        for name in manifest["arrays"]
+    }
+
+    vocabulary = None
+    vocabulary_path = os.path.join(version_dir, "vocabulary.txt")
+    if os.path.exists(vocabulary_path):
+        with open(vocabulary_path, encoding="utf-8") as f:
+            vocabulary = f.read().split("\n")
+
+    return manifest, arrays, vocabulary
+
+
+def _prune_old_versions(model_dir: str, keep: str):
+    # Old versions stay valid for workers that still map them until they are unlinked
+    versions = sorted(name for name in os.listdir(model_dir)
+                      if name.startswith("v") and os.path.isdir(os.path.join(model_dir, name)))
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != keep:
+            shutil.rmtree(os.path.join(model_dir, name), ignore_errors=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -18,6 +18,16 @@ sector_skills = Table(
     Column('skill_id', Integer, ForeignKey('skills.id'))
 )
 
+# Many-to-many association table for internships and their additional skills
+internship_skills = Table(
+    'internship_skills',
+    Base.metadata,
+    Column('internship_id', Integer, ForeignKey('internships.id'), primary_key=True),
+    Column('skill_id', Integer, ForeignKey('skills.id'), primary_key=True),
+    # Skill filter: internship ids for a skill straight from the index
+    Index('ix_internship_skills_skill_internship', 'skill_id', 'internship_id')
+)
+
 class Education(Base):
     __tablename__ = "educations"
     
@@ -45,6 +55,7 @@ class Skill(Base):
     
     sectors = relationship("Sector", secondary=sector_skills, back_populates="skills")
     internships = relationship("Internship", back_populates="skill")
+    additional_internships = relationship("Internship", secondary=internship_skills, back_populates="additional_skills")
 
 class Location(Base):
     __tablename__ = "locations"
@@ -74,3 +85,28 @@ class Internship(Base):
     education = relationship("Education")
     sector = relationship("Sector", back_populates="internships")
     location = relationship("Location", back_populates="internships")
+    additional_skills = relationship("Skill", secondary=internship_skills, back_populates="additional_internships")
+    
+    # Search and recommendation pre-filters (crud.internship_filters): each index holds the filter
+    # columns plus the primary key, so matching ids and counts are read from the index alone
+    __table_args__ = (
+        Index("ix_internships_sector_location", "sector_id", "location_id"),
+        Index("ix_internships_location_sector", "location_id", "sector_id"),
+        Index("ix_internships_education_sector", "edu_id", "sector_id"),
+    )
+
+class PrecomputedRecommendation(Base):
+    # Recommendations computed offline for a frequent student form (see precompute_recommendations.py)
+    __tablename__ = "precomputed_recommendations"
+    
+    cache_key = Column(String(32), primary_key=True)  # Same key as the recommendation cache
+    data_version = Column(String(80), nullable=False, index=True)  # Catalog and model the results were computed from
+    use_ml = Column(Boolean, nullable=False)
+    education = Column(String(200), nullable=True)
+    sector = Column(String(200), nullable=True)
+    preferred_location = Column(String(200), nullable=True)
+    skills = Column(Text, nullable=True)  # JSON list
+    description = Column(Text, nullable=True)
+    request_count = Column(Integer, default=0)  # Times the form was seen in the request log
+    recommendations = Column(Text, nullable=False)  # JSON response body
+    computed_at = Column(DateTime, nullable=False)
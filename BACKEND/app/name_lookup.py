@@ -0,0 +1,98 @@
+# Normalized name -> id resolution for the small sector and location tables, so free-text
+# preferences become integer id filters instead of leading-wildcard ILIKE scans
+import re
+import difflib
+from typing import Dict, List, Optional
+
+FUZZY_CUTOFF = 0.8  # difflib similarity a misspelled name needs to count as a match
+FUZZY_MATCHES = 3
+
+# Other spellings users type, normalized -> canonical name as stored in the table
+# (words already inside a name are left out, "ai" and "it" only occur inside other words)
+SECTOR_ALIASES = {
+    "ai": "Artificial Intelligence",
+    "ml": "Artificial Intelligence",
+    "machine learning": "Artificial Intelligence",
+    "it": "Technology",
+    "information technology": "Technology",
+    "software": "Technology",
+    "app development": "Mobile Development",
+    "data analytics": "Data Science",
+    "cyber security": "Cybersecurity",
+    "information security": "Cybersecurity",
+    "devops": "Cloud Computing",
+    "banking": "Finance",
+    "fintech": "Finance",
+    "medical": "Healthcare",
+    "edtech": "Education",
+    "ecommerce": "E-commerce",
+    "retail": "E-commerce",
+    "game development": "Gaming",
+    "crypto": "Blockchain",
+    "hr": "Human Resources",
+    "r and d": "Research & Development",
+    "supply chain": "Logistics",
+    "telecom": "Telecommunications",
+    "clean energy": "Renewable Energy",
+    "solar": "Renewable Energy",
+}
+
+LOCATION_ALIASES = {
+    "new delhi": "Delhi",
+    "ncr": "Delhi",
+    "bombay": "Mumbai",
+    "bengaluru": "Bangalore",
+    "madras": "Chennai",
+    "calcutta": "Kolkata",
+    "poona": "Pune",
+    "cochin": "Kochi",
+    "gurugram": "Gurgaon",
+    "baroda": "Vadodara",
+    "vizag": "Visakhapatnam",
+    "mysuru": "Mysore",
+    "trivandrum": "Thiruvananthapuram",
+    "remote": "Remote Work",
+    "work from home": "Remote Work",
+    "wfh": "Remote Work",
+}
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """Lowercase words only: "Sales & Marketing " -> "sales and marketing", "UI/UX" -> "ui ux\""""
+    text = (text or "").casefold().replace("&", " and ")
+    return " ".join(re.findall(r"[^\W_]+", text))
+
+
+class NameLookup:
+    """Resolves free text to the ids of one reference table, built once per catalog snapshot"""
+
+    def __init__(self, names: Dict[int, str], aliases: Optional[Dict[str, str]] = None,
+                 fuzzy_cutoff: float = FUZZY_CUTOFF):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.names = {}  # normalized name -> ids (names can repeat)
+        for pk, name in names.items():
+            if name:
+                self.names.setdefault(normalize_name(name), []).append(pk)
+
+        # Aliases pointing at names missing from this table are dropped
+        self.aliases = {}
+        for alias, target in (aliases or {}).items():
+            target = normalize_name(target)
+            if target in self.names:
+                self.aliases[normalize_name(alias)] = target
+
+    def resolve(self, text: str) -> List[int]:
+        """
+        Ids of the names matching text: its alias target, otherwise every name containing it
+        (what ILIKE '%text%' matched), otherwise the closest spellings of a name or alias
+        """
+        query = normalize_name(text)
+        query = self.aliases.get(query, query)
+
+        matches = [name for name in self.names if query in name]
+        if not matches:
+            close = difflib.get_close_matches(query, list(self.names) + list(self.aliases),
+                                              n=FUZZY_MATCHES, cutoff=self.fuzzy_cutoff)
+            matches = {self.aliases.get(name, name) for name in close}
+
+        return sorted(pk for name in matches for pk in self.names[name])
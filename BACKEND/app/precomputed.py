@@ -0,0 +1,141 @@
+# Recommendations precomputed offline for frequent student forms, plus the request log they are learned from
+import os
+import json
+import time
+import threading
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app import models, schemas
+
+logger = logging.getLogger(__name__)
+
+# Append-only JSON-lines log of recommendation requests (unset = no logging)
+RECOMMENDATION_REQUEST_LOG = os.getenv("RECOMMENDATION_REQUEST_LOG", "")
+PRECOMPUTED_RECHECK_SECONDS = 300  # How often a missing precomputed_recommendations table is looked for again
+
+_log_lock = threading.Lock()
+
+
+def data_version(catalog, ml_enabled: bool) -> str:
+    """Identifies the catalog and model a recommendation list was computed from"""
+    if not ml_enabled:
+        return f"{catalog.fingerprint}:rules"
+
+    from app.ml_scoring import recommendation_engine
+    state = recommendation_engine.state
+    return f"{catalog.fingerprint}:{state.training_data_hash}:{state.similarity_mode}"
+
+
+def form_fields(student_form: schemas.StudentForm) -> Dict:
+    """Form fields in the same normalized shape as the cache key (skills sorted)"""
+    return {
+        "education": student_form.education,
+        "skills": sorted(student_form.skills) if student_form.skills else [],
+        "sector": student_form.sector,
+        "preferred_location": student_form.preferred_location,
+        "description": student_form.description
+    }
+
+
+def log_requests(student_forms: Iterable[schemas.StudentForm], use_ml: bool):
+    """Append the forms to the request log, one JSON line each"""
+    if not RECOMMENDATION_REQUEST_LOG:
+        return
+    lines = "".join(json.dumps({**form_fields(form), "use_ml": use_ml}, sort_keys=True) + "\n" for form in student_forms)
+    try:
+        with _log_lock, open(RECOMMENDATION_REQUEST_LOG, "a", encoding="utf-8") as f:
+            f.write(lines)
+    except OSError as e:
+        logger.warning(f"Could not write request log: {e}")
+
+
+def frequent_forms(log_path: str, top: int) -> List[Tuple[schemas.StudentForm, bool, int]]:
+    """The top most frequent (form, use_ml) pairs in a request log, with their counts"""
+    counts = Counter()
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                counts[line.strip()] += 1
+
+    forms = []
+    for line, count in counts.most_common():
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            continue
+        use_ml = fields.pop("use_ml", True)
+        forms.append((schemas.StudentForm(**fields), use_ml, count))
+        if len(forms) >= top:
+            break
+    return forms
+
+
+class PrecomputedRecommendations:
+    """Lookups in the precomputed_recommendations table, skipped while the table does not exist"""
+
+    def __init__(self):
+        self._table_checked_at = None
+        self._table_exists = False
+
+    def _available(self, db: Session) -> bool:
+        if self._table_checked_at is None or (
+                not self._table_exists and time.time() - self._table_checked_at >= PRECOMPUTED_RECHECK_SECONDS):
+            self._table_exists = inspect(db.get_bind()).has_table(models.PrecomputedRecommendation.__tablename__)
+            self._table_checked_at = time.time()
+        return self._table_exists
+
+    def get(self, db: Session, cache_key: str, version: str) -> Optional[List[dict]]:
+        """Stored recommendations for the form, None when missing or computed from other data"""
+        if not self._available(db):
+            return None
+        try:
+            row = db.query(models.PrecomputedRecommendation.recommendations).filter(
+                models.PrecomputedRecommendation.cache_key == cache_key,
+                models.PrecomputedRecommendation.data_version == version
+            ).first()
+        except SQLAlchemyError as e:
+            logger.warning(f"Precomputed recommendation lookup failed: {e}")
+            db.rollback()
+            self._table_checked_at = None
+            return None
+        return json.loads(row.recommendations) if row else None
+
+    def store(self, db: Session, entries: List[Dict], batch_size: int = 500) -> int:
+        """
+        Replace all stored recommendations with entries, in one transaction
+        Each entry holds cache_key, data_version, use_ml, form (form_fields), request_count and recommendations
+        """
+        models.PrecomputedRecommendation.__table__.create(bind=db.get_bind(), checkfirst=True)
+        table = models.PrecomputedRecommendation.__table__
+        computed_at = datetime.now()
+
+        db.execute(table.delete())
+        for start in range(0, len(entries), batch_size):
+            db.execute(table.insert(), [
+                {
+                    "cache_key": entry["cache_key"],
+                    "data_version": entry["data_version"],
+                    "use_ml": entry["use_ml"],
+                    "education": entry["form"]["education"],
+                    "sector": entry["form"]["sector"],
+                    "preferred_location": entry["form"]["preferred_location"],
+                    "skills": json.dumps(entry["form"]["skills"]),
+                    "description": entry["form"]["description"],
+                    "request_count": entry.get("request_count", 0),
+                    "recommendations": json.dumps(entry["recommendations"]),
+                    "computed_at": computed_at
+                }
+                for entry in entries[start:start + batch_size]
+            ])
+        db.commit()
+        self._table_checked_at = None
+        return len(entries)
+
+
+# Global instance
+precomputed_recommendations = PrecomputedRecommendations()
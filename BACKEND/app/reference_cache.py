@@ -0,0 +1,142 @@
+# Serialized responses of the reference-data endpoints (educations, sectors, locations, skills),
+# kept in process with an ETag so repeat requests skip the database and can be answered with 304
+import os
+import time
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+from fastapi import Request, Response
+from app import schemas
+from app.serialization import dumps, json_bytes_response
+
+logger = logging.getLogger(__name__)
+
+# Writes through the CRUD create methods invalidate this worker at once; the TTL bounds how long
+# other workers (and writes made outside the API, e.g. seed_data.py) can serve the old lists
+REFERENCE_CACHE_TTL = int(os.getenv("REFERENCE_CACHE_TTL", "300"))
+REFERENCE_CACHE_MAX_AGE = int(os.getenv("REFERENCE_CACHE_MAX_AGE", "60"))  # Browser reuse before revalidating
+
+
+class CachedResponse:
+    """JSON body of one endpoint with its ETag"""
+    __slots__ = ("body", "etag", "created_at")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self.created_at = time.time()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match holds "*" or a list of (possibly weak) entity tags
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class ReferenceDataCache:
+    """Per-key cached responses, all dropped together when reference data is written"""
+
+    def __init__(self, ttl: int = REFERENCE_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, CachedResponse] = {}
+        self._generation = 0
+
+    async def get(self, key: str, load: Callable[[], Awaitable[object]]) -> Optional[CachedResponse]:
+        """Cached response for key, built from load() on a miss; None (not cached) when load returns None"""
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry.created_at < self.ttl:
+            return entry
+
+        generation = self._generation
+        data = await load()
+        if data is None:
+            return None
+
+        entry = CachedResponse(dumps(data))
+        # A write during the load invalidated what was just read
+        if generation == self._generation:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self):
+        """Drop every cached response, called after reference data is created"""
+        self._generation += 1
+        self._entries = {}
+
+    @staticmethod
+    def response(request: Request, entry: CachedResponse) -> Response:
+        """The cached body, or 304 Not Modified when the client already holds this version"""
+        headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={REFERENCE_CACHE_MAX_AGE}"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return json_bytes_response(entry.body, headers=headers)
+
+
+# Loaders: each opens its own session, so cache hits never touch the database
+
+async def load_educations():
+    from app.database import AsyncSessionLocal
+    from app.crud import async_education_crud
+    async with AsyncSessionLocal() as db:
+        return [schemas.Education.model_validate(row).model_dump() for row in await async_education_crud.get_all(db)]
+
+
+async def load_sectors():
+    from app.database import AsyncSessionLocal
+    from app.crud import async_sector_crud
+    async with AsyncSessionLocal() as db:
+        return [schemas.Sector.model_validate(row).model_dump() for row in await async_sector_crud.get_all(db)]
+
+
+async def load_locations():
+    from app.database import AsyncSessionLocal
+    from app.crud import async_location_crud
+    async with AsyncSessionLocal() as db:
+        return [schemas.Location.model_validate(row).model_dump() for row in await async_location_crud.get_all(db)]
+
+
+async def load_skills():
+    from app.database import AsyncSessionLocal
+    from app.crud import async_skill_crud
+    async with AsyncSessionLocal() as db:
+        return [schemas.Skill.model_validate(row).model_dump() for row in await async_skill_crud.get_all(db)]
+
+
+async def load_skills_by_sector(sector_id: int):
+    # None for an unknown sector, so the 404 is not cached
+    from app.database import AsyncSessionLocal
+    from app.crud import async_sector_crud, async_skill_crud
+    async with AsyncSessionLocal() as db:
+        sector = await async_sector_crud.get_by_id(db, sector_id)
+        if not sector:
+            return None
+        skills = await async_skill_crud.get_by_sector_id(db, sector_id)
+        return schemas.SkillsBySectorResponse(
+            sector_id=sector_id,
+            sector_name=sector.name,
+            skills=skills
+        ).model_dump()
+
+
+REFERENCE_LISTS = {
+    "educations": load_educations,
+    "sectors": load_sectors,
+    "locations": load_locations,
+    "skills": load_skills
+}
+
+
+async def warm_reference_cache():
+    """Load the reference lists at startup; a failure only leaves them to load on first request"""
+    try:
+        for key, load in REFERENCE_LISTS.items():
+            await reference_cache.get(key, load)
+        logger.info(f"Reference data cache warmed with {len(REFERENCE_LISTS)} lists")
+    except Exception as e:
+        logger.warning(f"Could not warm reference data cache: {e}")
+
+
+# Global instance
+reference_cache = ReferenceDataCache()
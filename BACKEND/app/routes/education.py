@@ -1,23 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.crud import education_crud
+from app.database import get_async_db
+from app.crud import async_education_crud
+from app.reference_cache import load_educations, reference_cache
 from app import schemas
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Education])
-async def get_all_educations(db: Session = Depends(get_db)):
-    # Get all available educations
-    return education_crud.get_all(db)
+async def get_all_educations(request: Request):
+    # Get all available educations, served from the reference data cache
+    entry = await reference_cache.get("educations", load_educations)
+    return reference_cache.response(request, entry)
 
 
 @router.get("/{education_id}", response_model=schemas.Education)
-async def get_education(education_id: int, db: Session = Depends(get_db)):
+async def get_education(education_id: int, db: AsyncSession = Depends(get_async_db)):
 
     # Get specific education by ID
-    education = education_crud.get_by_id(db, education_id)
+    education = await async_education_crud.get_by_id(db, education_id)
     if not education:
         raise HTTPException(status_code=404, detail="Education not found")
     return education
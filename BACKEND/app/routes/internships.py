@@ -1,37 +1,67 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.database import get_db
-from app.crud import internship_crud
+from app.database import AsyncSessionLocal, get_async_db
+from app.crud import INTERNSHIP_PAGE_MAX, INTERNSHIP_PAGE_SIZE, async_internship_crud
+from app.serialization import json_bytes_response
 from app import schemas
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Internship])
-async def get_all_internships(db: Session = Depends(get_db)):
-    # Get all available internships
-    return internship_crud.get_all(db)
+@router.get("/", response_model=schemas.InternshipPage)
+async def get_all_internships(
+    cursor: int = Query(0, ge=0, description="next_cursor of the previous page, 0 for the first page"),
+    limit: int = Query(INTERNSHIP_PAGE_SIZE, ge=1, le=INTERNSHIP_PAGE_MAX, description="Internships per page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Get one page of internships in id order
+    internships, next_cursor = await async_internship_crud.get_page(db, after_id=cursor, limit=limit)
+    # Validated once while building the page and encoded by pydantic, instead of again through response_model
+    page = schemas.InternshipPage(internships=internships, next_cursor=next_cursor, limit=limit)
+    return json_bytes_response(page.model_dump_json().encode("utf-8"))
 
 
-# @router.get("/search", response_model=schemas.InternshipRecommendationResponse)
-# async def search_internships(
-#     skill_id: Optional[int] = Query(None, description="Filter by skill ID"),
-#     education_id: Optional[int] = Query(None, description="Filter by education ID"),
-#     location_id: Optional[int] = Query(None, description="Filter by location ID"),
-#     db: Session = Depends(get_db)
-# ):
+@router.get("/export")
+async def export_internships():
+    # Stream every internship as NDJSON, one object per line, without building the whole list in memory
+    async def rows():
+        # The session lives as long as the stream, not the request handler
+        async with AsyncSessionLocal() as db:
+            async for internship in async_internship_crud.stream_all(db):
+                yield schemas.Internship.model_validate(internship).model_dump_json() + "\n"
 
-#     # Get internships filtered by skill, education, and location
-#     internships = internship_crud.get_by_filters(
-#         db, 
-#         skill_id=skill_id, 
-#         education_id=education_id, 
-#         location_id=location_id
-#     )
-    
-#     return schemas.InternshipRecommendationResponse(
-#         internships=internships,
-#         total_count=len(internships)
-#     )
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 
+@router.get("/search", response_model=schemas.InternshipSearchResponse)
+async def search_internships(
+    sector_id: Optional[List[int]] = Query(None, description="Filter by sector IDs (any of)"),
+    location_id: Optional[List[int]] = Query(None, description="Filter by location IDs (any of)"),
+    skill_id: Optional[List[int]] = Query(None, description="Filter by skill IDs, primary or additional (any of)"),
+    education_id: Optional[List[int]] = Query(None, description="Filter by education IDs (any of)"),
+    duration: Optional[List[str]] = Query(None, description="Filter by durations (any of)"),
+    cursor: int = Query(0, ge=0, description="next_cursor of the previous page, 0 for the first page"),
+    limit: int = Query(INTERNSHIP_PAGE_SIZE, ge=1, le=INTERNSHIP_PAGE_MAX, description="Internships per page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Get one page of the internships matching every given filter; the total match count is
+    # only computed for the first page, later pages reuse the one the client already has
+    internships, next_cursor, total_count = await async_internship_crud.search(
+        db,
+        after_id=cursor,
+        limit=limit,
+        with_count=cursor == 0,
+        sector_ids=sector_id,
+        location_ids=location_id,
+        skill_ids=skill_id,
+        education_ids=education_id,
+        durations=duration
+    )
+    
+    return json_bytes_response(schemas.InternshipSearchResponse(
+        internships=internships,
+        next_cursor=next_cursor,
+        limit=limit,
+        total_count=total_count
+    ).model_dump_json().encode("utf-8"))
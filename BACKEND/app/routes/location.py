@@ -1,23 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.crud import location_crud
+from app.database import get_async_db
+from app.crud import async_location_crud
+from app.reference_cache import load_locations, reference_cache
 from app import schemas
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Location])
-async def get_all_locations(db: Session = Depends(get_db)):
-    # Get all available locations
-    return location_crud.get_all(db)
+async def get_all_locations(request: Request):
+    # Get all available locations, served from the reference data cache
+    entry = await reference_cache.get("locations", load_locations)
+    return reference_cache.response(request, entry)
 
 
 @router.get("/{location_id}", response_model=schemas.Location)
-async def get_location(location_id: int, db: Session = Depends(get_db)):
+async def get_location(location_id: int, db: AsyncSession = Depends(get_async_db)):
 
     # Get specific location by ID
-    location = location_crud.get_by_id(db, location_id)
+    location = await async_location_crud.get_by_id(db, location_id)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     return location
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app import schemas, crud
+from app.precomputed import log_requests
+from app.serialization import json_bytes_response
 
 router = APIRouter()
 
@@ -13,15 +15,35 @@ def get_recommendations(
     use_ml: bool = Query(True, description="Use ML-enhanced scoring (default: True)")
 ):
     # Get recommendations using hybrid (ML + rules) or pure rule-based approach
-    recommendations = crud.get_recommendations(db, student_form, use_ml=use_ml)
+    log_requests([student_form], use_ml)
+    body = crud.get_recommendations_json(db, student_form, use_ml=use_ml)
     
-    if not recommendations:
+    if body == b"[]":
         raise HTTPException(
             status_code=404, 
             detail="No matching internships found for your profile"
         )
     
-    return recommendations
+    # Already validated and encoded (and cached in this form)
+    return json_bytes_response(body)
+
+
+@router.post("/batch", response_model=List[List[schemas.RecommendationResponse]])
+def get_recommendations_batch(
+    student_forms: List[schemas.StudentForm],
+    db: Session = Depends(get_db),
+    use_ml: bool = Query(True, description="Use ML-enhanced scoring (default: True)")
+):
+    # Recommendations for many students in one call, one list per form in request order (empty when nothing matches)
+    if len(student_forms) > crud.MAX_BATCH_FORMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {crud.MAX_BATCH_FORMS} student forms per batch"
+        )
+    
+    log_requests(student_forms, use_ml)
+    bodies = crud.get_recommendations_batch_json(db, student_forms, use_ml=use_ml)
+    return json_bytes_response(b"[" + b",".join(bodies) + b"]")
 
 
 # @router.post("/compare", response_model=dict)
@@ -50,40 +72,49 @@ def get_model_status():
     return get_model_status()
 
 
-@router.post("/retrain-model")
+@router.get("/cache-stats")
+def get_cache_stats():
+    # Hit/miss/eviction counters of the recommendation cache
+    return crud.recommendation_cache.stats()
+
+
+@router.post("/retrain-model", status_code=202)
 def retrain_model(
-    force: bool = Query(False, description="Force retrain even if not needed"),
-    db: Session = Depends(get_db)
+    request: Request,
+    force: bool = Query(False, description="Force retrain even if not needed")
 ):
-    # Manually retrain the ML model
-    from app.ml_scoring import recommendation_engine, ML_AVAILABLE
-    from app import models
+    # Queue a retrain on the background worker; the current model keeps serving until the new one is published
+    from app.ml_scoring import ML_AVAILABLE
+    from app.training import training_jobs
     
     if not ML_AVAILABLE:
         raise HTTPException(status_code=400, detail="ML libraries not available")
     
-    internships = db.query(models.Internship).all()
+    job = training_jobs.submit(force_retrain=force)
+    job["status_url"] = str(request.url_for("get_retrain_status", job_id=job["job_id"]))
+    return job
+
+
+@router.get("/retrain-model/{job_id}")
+def get_retrain_status(job_id: str):
+    # Progress and result of a retrain job
+    from app.ml_scoring import recommendation_engine
+    from app.training import training_jobs
     
-    try:
-        success = recommendation_engine.train_manually(internships, force_retrain=force)
-        message = f"Model retrained successfully with {len(internships)} internships" if success else "Training failed"
-    except Exception as e:
-        success = False
-        message = f"Training failed: {str(e)}"
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Training job not found")
     
-    return {
-        "success": success,
-        "message": message,
-        "training_size": len(internships),
-        "is_trained": recommendation_engine.is_ready_for_ml()
-    }
+    job["is_trained"] = recommendation_engine.is_ready_for_ml()
+    return job
 
 
 @router.post("/clear-cache")
 def clear_model_cache():
-    # Clear ML model cache to free memory
+    # Clear ML model and recommendation caches (every worker when the backend is shared)
     from app.ml_scoring import clear_model_cache
     clear_model_cache()
+    crud.recommendation_cache.clear()
     return {"message": "Model cache cleared successfully"}
 
 
@@ -110,7 +141,7 @@ def clear_model_cache():
 #     }
     
 #     if ML_AVAILABLE:
-#         score, breakdown = calculate_enhanced_score(internship, student_data, 0)
+#         score, breakdown = calculate_enhanced_score(internship, student_data)
 #         return {
 #             "internship_id": internship_id,
 #             "internship_title": internship.title,
@@ -1,26 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.crud import skill_crud, education_crud, sector_crud
+from app.database import get_async_db
+from app.crud import async_skill_crud, async_education_crud, async_sector_crud
+from app.reference_cache import load_skills, load_skills_by_sector, reference_cache
 from app import schemas
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Skill])
-async def get_all_skills(db: Session = Depends(get_db)):
-    # Get all available skills
-    return skill_crud.get_all(db)
+async def get_all_skills(request: Request):
+    # Get all available skills, served from the reference data cache
+    entry = await reference_cache.get("skills", load_skills)
+    return reference_cache.response(request, entry)
 
 
 # @router.get("/by-education/{education_id}", response_model=schemas.SkillsByEducationResponse)
-# async def get_skills_by_education(education_id: int, db: Session = Depends(get_db)):
+# async def get_skills_by_education(education_id: int, db: AsyncSession = Depends(get_async_db)):
 #     # Get skills based on education ID through sectors
-#     education = education_crud.get_by_id(db, education_id)
+#     education = await async_education_crud.get_by_id(db, education_id)
 #     if not education:
 #         raise HTTPException(status_code=404, detail="Education not found")
     
-#     skills = skill_crud.get_by_education_id(db, education_id)
+#     skills = await async_skill_crud.get_by_education_id(db, education_id)
     
 #     return schemas.SkillsByEducationResponse(
 #         education_id=education_id,
@@ -29,37 +31,30 @@ async def get_all_skills(db: Session = Depends(get_db)):
 #     )
 
 @router.get("/by-sector/{sector_id}", response_model=schemas.SkillsBySectorResponse)
-async def get_skills_by_sector(sector_id: int, db: Session = Depends(get_db)):
-    # Get skills based on sector ID
-    sector = sector_crud.get_by_id(db, sector_id)
-    if not sector:
+async def get_skills_by_sector(sector_id: int, request: Request):
+    # Get skills based on sector ID, served from the reference data cache
+    entry = await reference_cache.get(f"skills_by_sector:{sector_id}", lambda: load_skills_by_sector(sector_id))
+    if entry is None:
         raise HTTPException(status_code=404, detail="Sector not found")
-    
-    skills = skill_crud.get_by_sector_id(db, sector_id)
-    
-    return schemas.SkillsBySectorResponse(
-        sector_id=sector_id,
-        sector_name=sector.name,
-        skills=skills
-    )
+    return reference_cache.response(request, entry)
 
 
 # @router.get("/by-education-and-sector/{education_id}/{sector_id}", response_model=schemas.SkillsByEducationAndSectorResponse)
 # async def get_skills_by_education_and_sector(
 #     education_id: int, 
 #     sector_id: int, 
-#     db: Session = Depends(get_db)
+#     db: AsyncSession = Depends(get_async_db)
 # ):
 #     # Get skills filtered by both education and sector
-#     education = education_crud.get_by_id(db, education_id)
+#     education = await async_education_crud.get_by_id(db, education_id)
 #     if not education:
 #         raise HTTPException(status_code=404, detail="Education not found")
     
-#     sector = sector_crud.get_by_id(db, sector_id)
+#     sector = await async_sector_crud.get_by_id(db, sector_id)
 #     if not sector:
 #         raise HTTPException(status_code=404, detail="Sector not found")
     
-#     skills = skill_crud.get_by_education_and_sector(db, education_id, sector_id)
+#     skills = await async_skill_crud.get_by_education_and_sector(db, education_id, sector_id)
     
 #     return schemas.SkillsByEducationAndSectorResponse(
 #         education_id=education_id,
@@ -71,9 +66,9 @@ async def get_skills_by_sector(sector_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{skill_id}", response_model=schemas.Skill)
-async def get_skill(skill_id: int, db: Session = Depends(get_db)):
+async def get_skill(skill_id: int, db: AsyncSession = Depends(get_async_db)):
     # Get specific skill by ID
-    skill = skill_crud.get_by_id(db, skill_id)
+    skill = await async_skill_crud.get_by_id(db, skill_id)
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     return skill
@@ -102,6 +102,14 @@ class InternshipRecommendationResponse(BaseModel):
     internships: List[Internship]
     total_count: int
 
+class InternshipPage(BaseModel):
+    internships: List[Internship]
+    next_cursor: Optional[int] = None
+    limit: int
+
+class InternshipSearchResponse(InternshipPage):
+    total_count: Optional[int] = None  # First page only
+
 class StudentForm(BaseModel):
     education: str
     skills: List[str]
@@ -1,4 +1,5 @@
-from typing import Dict
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
 from .models import Internship
 
 # Scoring weights
@@ -7,6 +8,19 @@ SECTOR_MATCH_WEIGHT = 2
 LOCATION_MATCH_WEIGHT = 2
 EDUCATION_MATCH_WEIGHT = 1.5
 PERFECT_MATCH_BONUS = 2
+MAX_RULE_POINTS = (SKILL_MATCH_WEIGHT + SECTOR_MATCH_WEIGHT + LOCATION_MATCH_WEIGHT
+                   + EDUCATION_MATCH_WEIGHT + PERFECT_MATCH_BONUS)
+
+# Keywords for partial sector matching
+SECTOR_KEYWORDS = {
+    'technology': ['tech', 'software', 'development', 'programming', 'it'],
+    'analytics': ['data', 'analysis', 'research', 'statistics'],
+    'marketing': ['digital', 'social', 'content', 'advertising'],
+    'finance': ['financial', 'banking', 'investment', 'accounting']
+}
+
+# Column of integer codes per row plus the value each code stands for
+ScoringColumn = Tuple[np.ndarray, Sequence[Optional[str]]]
 
 # Education hierarchy
 EDUCATION_HIERARCHY = {
@@ -18,95 +32,134 @@ EDUCATION_HIERARCHY = {
     "PhD": 5
 }
 
-def calculate_rule_based_score(internship: Internship, student_data: Dict) -> float:
-    # Calculate score based on rules (60% weightage)
-    score = 0
-    max_possible_score = 0
+def _split_skills(skills_text: Optional[str]) -> set:
+    # Normalized set of comma-separated skills
+    if not skills_text:
+        return set()
+    return set(skill.strip().lower() for skill in skills_text.split(','))
+
+def _student_skills(student_data: Dict) -> set:
+    return set(skill.strip().lower() for skill in student_data['skills'])
+
+def _skill_components(internship_skills: set, student_skills: set) -> Tuple[float, float]:
+    # Skill score (Jaccard with partial matches) and exact match ratio
+    if not internship_skills:
+        return 0.0, 0.0
+    
+    intersection = len(internship_skills.intersection(student_skills))
+    skill_match_ratio = intersection / len(internship_skills)
+    
+    if not student_skills:
+        return 0.0, skill_match_ratio
+    
+    # Check partial matches
+    partial_matches = 0
+    for student_skill in student_skills:
+        for internship_skill in internship_skills:
+            if student_skill in internship_skill or internship_skill in student_skill:
+                partial_matches += 1
+                break
+    
+    partial_ratio = partial_matches / len(internship_skills)
+    skill_score = max(skill_match_ratio, partial_ratio * 0.7)
+    return skill_score * SKILL_MATCH_WEIGHT, skill_match_ratio
+
+def _sector_components(sector_name: Optional[str], student_sector: str) -> Tuple[float, bool]:
+    # Sector score and whether the sector matches exactly
+    if not sector_name:
+        return 0.0, False
     
-    # Skills matching with Jaccard similarity
-    internship_skills = set(skill.strip().lower() for skill in internship.skill.description.split(',')) if internship.skill else set()
-    student_skills = set(skill.strip().lower() for skill in student_data['skills'])
+    internship_sector_lower = sector_name.lower()
+    student_sector_lower = student_sector.lower()
     
-    if internship_skills and student_skills:
-        intersection = len(internship_skills.intersection(student_skills))
-        
-        # Check partial matches
-        partial_matches = 0
-        for student_skill in student_skills:
-            for internship_skill in internship_skills:
-                if student_skill in internship_skill or internship_skill in student_skill:
-                    partial_matches += 1
-                    break
-        
-        exact_ratio = intersection / len(internship_skills) if internship_skills else 0
-        partial_ratio = partial_matches / len(internship_skills) if internship_skills else 0
-        
-        skill_score = max(exact_ratio, partial_ratio * 0.7)
-        score += skill_score * SKILL_MATCH_WEIGHT
-    max_possible_score += SKILL_MATCH_WEIGHT
-    
-    # Sector matching
-    if internship.sector and internship.sector.name.lower() == student_data['sector'].lower():
-        score += SECTOR_MATCH_WEIGHT
-    elif internship.sector and student_data['sector']:
-        sector_keywords = {
-            'technology': ['tech', 'software', 'development', 'programming', 'it'],
-            'analytics': ['data', 'analysis', 'research', 'statistics'],
-            'marketing': ['digital', 'social', 'content', 'advertising'],
-            'finance': ['financial', 'banking', 'investment', 'accounting']
-        }
-        
-        student_sector_lower = student_data['sector'].lower()
-        internship_sector_lower = internship.sector.name.lower()
-        
-        for sector, keywords in sector_keywords.items():
+    if internship_sector_lower == student_sector_lower:
+        return SECTOR_MATCH_WEIGHT, True
+    
+    if student_sector:
+        for sector, keywords in SECTOR_KEYWORDS.items():
             if sector in student_sector_lower or sector in internship_sector_lower:
                 if any(keyword in student_sector_lower or keyword in internship_sector_lower for keyword in keywords):
-                    score += SECTOR_MATCH_WEIGHT * 0.5
-                    break
-    max_possible_score += SECTOR_MATCH_WEIGHT
-    
-    # Location matching
-    if internship.location and internship.location.description.lower() == student_data['preferred_location'].lower():
-        score += LOCATION_MATCH_WEIGHT
-    elif internship.location and internship.location.description.lower() == "remote":
-        score += LOCATION_MATCH_WEIGHT * 0.8
-    max_possible_score += LOCATION_MATCH_WEIGHT
-    
-    # Education matching
-    student_edu_level = EDUCATION_HIERARCHY.get(student_data['education'], 3)
-    required_edu_level = EDUCATION_HIERARCHY.get(internship.education.description if internship.education else "Bachelor's", 3)
+                    return SECTOR_MATCH_WEIGHT * 0.5, False
+    return 0.0, False
+
+def _location_components(location_description: Optional[str], preferred_location: str) -> Tuple[float, bool]:
+    # Location score and whether the location matches exactly
+    if not location_description:
+        return 0.0, False
+    
+    location_lower = location_description.lower()
+    if location_lower == preferred_location.lower():
+        return LOCATION_MATCH_WEIGHT, True
+    if location_lower == "remote":
+        return LOCATION_MATCH_WEIGHT * 0.8, False
+    return 0.0, False
+
+def _education_score(education_description: Optional[str], student_education: str) -> float:
+    # Education score based on the hierarchy level gap
+    student_edu_level = EDUCATION_HIERARCHY.get(student_education, 3)
+    required_edu_level = EDUCATION_HIERARCHY.get(education_description or "Bachelor's", 3)
     
     if student_edu_level >= required_edu_level:
-        score += EDUCATION_MATCH_WEIGHT
+        return EDUCATION_MATCH_WEIGHT
     elif student_edu_level >= required_edu_level - 1:
-        score += EDUCATION_MATCH_WEIGHT * 0.8
-    else:
-        score += EDUCATION_MATCH_WEIGHT * 0.3
-    max_possible_score += EDUCATION_MATCH_WEIGHT
-    
-    # Perfect match bonus
-    skill_intersection = len(internship_skills.intersection(student_skills))
-    skill_match_ratio = skill_intersection / len(internship_skills) if internship_skills else 0
-    
-    # Give bonus for good matches
-    if skill_match_ratio >= 0.5:
-        bonus = 0
-        if internship.sector and internship.sector.name.lower() == student_data['sector'].lower():
-            bonus += PERFECT_MATCH_BONUS * 0.6
-        
-        if internship.location and internship.location.description.lower() == student_data['preferred_location'].lower():
-            bonus += PERFECT_MATCH_BONUS * 0.4
-        
-        if skill_match_ratio >= 0.7:
-            bonus += PERFECT_MATCH_BONUS * 0.2
-            
-        score += bonus
-    max_possible_score += PERFECT_MATCH_BONUS
+        return EDUCATION_MATCH_WEIGHT * 0.8
+    return EDUCATION_MATCH_WEIGHT * 0.3
+
+def _match_bonus(skill_match_ratio, sector_exact, location_exact):
+    # Perfect match bonus, works on scalars and NumPy arrays alike
+    bonus = (sector_exact * (PERFECT_MATCH_BONUS * 0.6)
+             + location_exact * (PERFECT_MATCH_BONUS * 0.4)
+             + (skill_match_ratio >= 0.7) * (PERFECT_MATCH_BONUS * 0.2))
+    return bonus * (skill_match_ratio >= 0.5)
+
+def calculate_rule_based_score(internship: Internship, student_data: Dict) -> float:
+    # Calculate score based on rules (60% weightage)
+    student_skills = _student_skills(student_data)
+    internship_skills = _split_skills(internship.skill.description if internship.skill else None)
+    
+    skill_score, skill_match_ratio = _skill_components(internship_skills, student_skills)
+    sector_score, sector_exact = _sector_components(
+        internship.sector.name if internship.sector else None, student_data['sector'])
+    location_score, location_exact = _location_components(
+        internship.location.description if internship.location else None, student_data['preferred_location'])
+    education_score = _education_score(
+        internship.education.description if internship.education else None, student_data['education'])
+    
+    score = skill_score + sector_score + location_score + education_score
+    score += _match_bonus(skill_match_ratio, sector_exact, location_exact)
     
     # Normalize to 0-60
-    normalized_score = (score / max_possible_score) * 60 if max_possible_score > 0 else 0
-    return normalized_score
+    return (score / MAX_RULE_POINTS) * 60
+
+def _per_code(column: ScoringColumn, fn, width: int = 2) -> Tuple[np.ndarray, ...]:
+    # Evaluate fn once per distinct value and broadcast the results to every row
+    codes, values = column
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    results = [fn(values[code] if 0 <= code < len(values) else None) for code in unique_codes]
+    if not results:
+        return tuple(np.zeros(0) for _ in range(width))
+    return tuple(np.asarray(component, dtype=float)[inverse] for component in zip(*results))
+
+def calculate_rule_based_scores_batch(columns: Dict[str, ScoringColumn], student_data: Dict) -> np.ndarray:
+    # Vectorized rule-based scores (0-60) for every row of the scoring columns
+    student_skills = _student_skills(student_data)
+    student_sector = student_data['sector']
+    preferred_location = student_data['preferred_location']
+    student_education = student_data['education']
+    
+    skill_score, skill_match_ratio = _per_code(
+        columns['skill'], lambda text: _skill_components(_split_skills(text), student_skills))
+    sector_score, sector_exact = _per_code(
+        columns['sector'], lambda name: _sector_components(name, student_sector))
+    location_score, location_exact = _per_code(
+        columns['location'], lambda desc: _location_components(desc, preferred_location))
+    education_score, = _per_code(
+        columns['education'], lambda desc: (_education_score(desc, student_education),), width=1)
+    
+    score = skill_score + sector_score + location_score + education_score
+    score += _match_bonus(skill_match_ratio, sector_exact, location_exact)
+    
+    return (score / MAX_RULE_POINTS) * 60
 
 def calculate_description_similarity_mock(internship_desc: str, student_desc: str) -> float:
     # Description similarity with keyword matching (40% weightage)
@@ -174,3 +227,27 @@ def calculate_total_score(internship: Internship, student_data: Dict) -> float:
     total_score = rule_score + ml_score
 
     return min(total_score, 100)
+
+def calculate_total_scores_batch(columns: Dict[str, ScoringColumn], student_data: Dict) -> np.ndarray:
+    # Vectorized equivalent of calculate_total_score over the scoring columns
+    rule_scores = calculate_rule_based_scores_batch(columns, student_data)
+    
+    student_description = student_data.get('description', '')
+    ml_scores, = _per_code(
+        columns['description'],
+        lambda desc: (calculate_description_similarity_mock(desc, student_description),),
+        width=1
+    )
+    
+    return np.minimum(rule_scores + ml_scores, 100)
+
+def select_top_k(scores: np.ndarray, k: int, ids: np.ndarray) -> np.ndarray:
+    # Indexes of the k best scores, best first; ties go to the lower id so results are deterministic
+    if len(scores) > k:
+        kth_score = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth_score)  # Keeps every tie at the boundary
+    else:
+        candidates = np.arange(len(scores))
+    
+    order = np.lexsort((ids[candidates], -scores[candidates]))
+    return candidates[order[:k]]
@@ -0,0 +1,88 @@
+# Inverted index from normalized skill token to the internships that require it
+import threading
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalized token used as the index key for a skill name"""
+    return ' '.join(skill.lower().split())
+
+
+class SkillIndex:
+    """Posting lists of internship ids per skill token, updated one internship at a time"""
+
+    def __init__(self):
+        self._postings: Dict[str, set] = {}
+        self._arrays: Dict[str, np.ndarray] = {}  # Sorted id arrays, materialized on first read
+        self._tokens_by_id: Dict[int, frozenset] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_id)
+
+    def update(self, internship_id: int, skills: Iterable[str]) -> bool:
+        """Replace the skills of one internship, returns True if its postings changed"""
+        tokens = frozenset(normalize_skill(skill) for skill in skills if skill)
+        with self._lock:
+            old_tokens = self._tokens_by_id.get(internship_id, frozenset())
+            if tokens == old_tokens and internship_id in self._tokens_by_id:
+                return False
+
+            for token in old_tokens - tokens:
+                self._postings[token].discard(internship_id)
+                self._arrays.pop(token, None)
+                if not self._postings[token]:
+                    del self._postings[token]
+            for token in tokens - old_tokens:
+                self._postings.setdefault(token, set()).add(internship_id)
+                self._arrays.pop(token, None)
+
+            self._tokens_by_id[internship_id] = tokens
+            return True
+
+    def remove(self, internship_id: int):
+        """Drop an internship from every posting list"""
+        self.update(internship_id, [])
+        with self._lock:
+            self._tokens_by_id.pop(internship_id, None)
+
+    def sync(self, snapshot) -> int:
+        """Apply the differences between the index and a catalog snapshot, returns rows changed"""
+        changed = 0
+        for position, internship_id in enumerate(snapshot.ids.tolist()):
+            changed += self.update(internship_id, snapshot.skills_of(position))
+
+        current_ids = set(snapshot.ids.tolist())
+        for internship_id in [i for i in self._tokens_by_id if i not in current_ids]:
+            self.remove(internship_id)
+            changed += 1
+        return changed
+
+    def freeze(self) -> "SkillPostings":
+        """Read-only view of the current posting lists, unaffected by later updates"""
+        with self._lock:
+            # Arrays are replaced, never modified, so unchanged tokens are shared between views
+            for token, ids in self._postings.items():
+                if token not in self._arrays:
+                    self._arrays[token] = np.array(sorted(ids), dtype=np.int64)
+            return SkillPostings(dict(self._arrays))
+
+
+class SkillPostings:
+    """Sorted internship ids per skill token as of one catalog snapshot"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._arrays = arrays
+
+    def matching_tokens(self, student_skills: Sequence[str]) -> List[str]:
+        """Index tokens that contain any of the student's skills"""
+        needles = [normalize_skill(skill) for skill in student_skills]
+        return [token for token in self._arrays if any(needle in token for needle in needles)]
+
+    def candidates(self, student_skills: Sequence[str]) -> np.ndarray:
+        """Union of the posting lists for the student's skills"""
+        postings = [self._arrays[token] for token in self.matching_tokens(student_skills)]
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(postings))
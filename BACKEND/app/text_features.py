@@ -0,0 +1,142 @@
+# Text features of internships for the ML model
+import re
+import hashlib
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Enhanced technology-specific preprocessing, applied in this order
+TECH_REPLACEMENTS = {
+    'javascript': 'js',
+    'typescript': 'ts',
+    'machine learning': 'ml',
+    'artificial intelligence': 'ai',
+    'user interface': 'ui',
+    'user experience': 'ux',
+    'application programming interface': 'api',
+    'database': 'db',
+    'full stack': 'fullstack',
+    'react native': 'reactnative',
+    'node js': 'nodejs',
+    'spring boot': 'springboot',
+    'after effects': 'aftereffects',
+    'premiere pro': 'premierepro',
+    'adobe xd': 'adobexd',
+    'computer vision': 'computervision',
+    'natural language processing': 'nlp',
+    'big data': 'bigdata',
+    'quality assurance': 'qa',
+    'business intelligence': 'bi',
+    'penetration testing': 'pentest'
+}
+
+_NON_WORD = re.compile(r'[^\w\s]')  # Punctuation, commas included, becomes a space
+_WHITESPACE = re.compile(r'\s+')
+
+# Fields repeated to weight them in the TF-IDF text: title 3x, skill 2x, sector 2x, description, location
+InternshipFields = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def _replace_sequentially(text: str) -> str:
+    for old_term, new_term in TECH_REPLACEMENTS.items():
+        text = text.replace(old_term, new_term)
+    return text
+
+
+def _replacement_table() -> Dict[str, str]:
+    # One scan reproduces the ordered str.replace calls on text made of separate words, which
+    # differs from a single pass in two cases:
+    # - a later term contains the output of an earlier one ("node js" after javascript -> js)
+    # - two terms overlap ("big data" + "database"), where the earlier listed one wins
+    # Both are added as longer terms mapped to the sequential result. Chains of three or more
+    # terms glued without spaces ("databaseusiness intelligence") are not covered and can still
+    # come out differently; such words are rare (6 in 300k generated descriptions) and accepted
+    table = {term: _replace_sequentially(term) for term in TECH_REPLACEMENTS}
+    for term in TECH_REPLACEMENTS:
+        for other_term, other_output in TECH_REPLACEMENTS.items():
+            if other_term == term:
+                continue
+            if other_output in term:
+                spelled_out = term.replace(other_output, other_term)
+                table[spelled_out] = _replace_sequentially(spelled_out)
+            for size in range(1, min(len(term), len(other_term))):
+                if term[-size:] == other_term[:size]:
+                    combined = term + other_term[size:]
+                    table[combined] = _replace_sequentially(combined)
+    return table
+
+
+_REPLACEMENTS = _replacement_table()
+# Longest terms first so "react native" wins over shorter overlapping terms
+_REPLACEMENT_PATTERN = re.compile('|'.join(re.escape(term) for term in sorted(_REPLACEMENTS, key=len, reverse=True)))
+
+
+def preprocess_text(text: str) -> str:
+    """Enhanced text preprocessing for better feature extraction"""
+    if not text:
+        return ""
+
+    # Lowercase, punctuation to spaces, collapse whitespace
+    text = _WHITESPACE.sub(' ', _NON_WORD.sub(' ', text.lower())).strip()
+
+    # All technology terms in one scan
+    return _REPLACEMENT_PATTERN.sub(lambda match: _REPLACEMENTS[match.group(0)], text)
+
+
+def internship_fields(internship) -> InternshipFields:
+    """Plain, picklable copy of the columns the text features read from an internship"""
+    skill = getattr(internship, 'skill', None)
+    sector = getattr(internship, 'sector', None)
+    location = getattr(internship, 'location', None)
+    return (
+        getattr(internship, 'title', None),
+        skill.description if skill else None,
+        sector.name if sector else None,
+        getattr(internship, 'description', None),
+        location.description if location else None
+    )
+
+
+def build_feature_text(fields: InternshipFields) -> str:
+    """Enhanced text feature extraction with weighted importance"""
+    title, skill, sector, description, location = fields
+    text_features = []
+
+    if title:
+        text_features.extend([preprocess_text(title)] * 3)
+    if skill:
+        text_features.extend([preprocess_text(skill)] * 2)
+    if sector:
+        text_features.extend([preprocess_text(sector)] * 2)
+    if description:
+        text_features.append(preprocess_text(description))
+    if location:
+        text_features.append(preprocess_text(location))
+
+    combined_text = ' '.join(filter(None, text_features))
+    return combined_text if combined_text.strip() else "internship opportunity"
+
+
+def text_hash(text: str) -> int:
+    """64-bit content hash of one internship's feature text"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def iter_chunks(items: Iterable, size: int):
+    """Consecutive lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_feature_texts(rows: Iterable[InternshipFields]) -> Iterator[Tuple[str, int]]:
+    """
+    (feature text, content hash) per row, in input order, one row at a time
+    Runs in-process: measured against a process pool (2-4 workers, 500-5000 rows per task, 10k-300k
+    rows) shipping rows and texts between processes cost more than the single-scan replacer saves
+    """
+    for fields in rows:
+        text = build_feature_text(fields)
+        yield text, text_hash(text)
@@ -0,0 +1,134 @@
+# Background model training: fits run off the request path and publish the new model atomically
+import os
+import uuid
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+TRAINING_JOB_HISTORY = int(os.getenv("TRAINING_JOB_HISTORY", "20"))  # Finished jobs kept for status lookups
+
+
+class TrainingJobs:
+    """Queue of model jobs (full retrains and incremental index updates) run one at a time on a worker thread"""
+
+    def __init__(self, max_history: int = TRAINING_JOB_HISTORY):
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-training")
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()  # job_id -> job, oldest first
+        self._lock = threading.Lock()
+
+    def submit(self, force_retrain: bool = False) -> Dict:
+        """Queue a retrain, or return the job already waiting or running"""
+        with self._lock:
+            for job in self._jobs.values():
+                if (job["kind"] == "retrain" and job["status"] in ("queued", "running")
+                        and job["force_retrain"] == force_retrain):
+                    return dict(job)
+            job = self._new_job("retrain", force_retrain=force_retrain)
+
+        self._executor.submit(self._run, job["job_id"], force_retrain)
+        return dict(job)
+
+    def submit_index(self, internship_ids: List[int]) -> Dict:
+        """Queue an incremental index update for new or edited internships"""
+        with self._lock:
+            job = self._new_job("index", internship_ids=list(internship_ids))
+
+        self._executor.submit(self._run_index, job["job_id"], list(internship_ids))
+        return dict(job)
+
+    def _new_job(self, kind: str, **fields) -> Dict:
+        # Caller holds the lock
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "queued",
+            "submitted_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "training_size": None,
+            "success": None,
+            "message": "Waiting for the training worker",
+            **fields
+        }
+        self._jobs[job["job_id"]] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Snapshot of one job, None if unknown or already pruned"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, force_retrain: bool):
+        from app.crud import internship_crud
+        from app.ml_scoring import recommendation_engine, ML_TRAINING_BATCH_SIZE
+
+        self._update(job_id, status="running", started_at=datetime.now().isoformat(),
+                     message="Training in progress")
+        db = SessionLocal()
+        try:
+            # Rows are streamed from the database, each pass issues a fresh query
+            success = recommendation_engine.train_streaming(
+                lambda: internship_crud.stream_for_training(db, batch_size=ML_TRAINING_BATCH_SIZE),
+                force_retrain=force_retrain
+            )
+            training_size = recommendation_engine.state.tfidf_matrix.shape[0] if success else None
+            message = f"Model retrained successfully with {training_size} internships" if success else "Training failed"
+            result = {"success": success, "training_size": training_size, "message": message}
+        except Exception as e:
+            logger.error(f"Training job {job_id} failed: {e}")
+            result = {"success": False, "message": f"Training failed: {str(e)}"}
+        finally:
+            db.close()
+
+        # Status and finish time change together so pollers never see a half-finished job
+        self._update(job_id, status="succeeded" if result["success"] else "failed",
+                     finished_at=datetime.now().isoformat(), **result)
+
+    def _run_index(self, job_id: str, internship_ids: List[int]):
+        from app.crud import internship_crud
+        from app.ml_scoring import recommendation_engine
+
+        self._update(job_id, status="running", started_at=datetime.now().isoformat(),
+                     message="Indexing internships")
+        db = SessionLocal()
+        try:
+            internships = internship_crud.get_by_ids_with_relations(db, internship_ids)
+            needs_refit = recommendation_engine.index_internships(internships)
+            message = f"Indexed {len(internships)} internships"
+            if needs_refit:
+                message += ", vocabulary drift above threshold, full retrain queued"
+            result = {"success": True, "training_size": len(internships), "message": message}
+        except Exception as e:
+            logger.error(f"Index job {job_id} failed: {e}")
+            result = {"success": False, "message": f"Indexing failed: {str(e)}"}
+            needs_refit = False
+        finally:
+            db.close()
+
+        self._update(job_id, status="succeeded" if result["success"] else "failed",
+                     finished_at=datetime.now().isoformat(), **result)
+        if needs_refit:
+            self.submit(force_retrain=True)
+
+    def _prune(self):
+        # Caller holds the lock; drop the oldest finished jobs beyond the history size
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("succeeded", "failed")]
+        for job_id in finished[:max(len(finished) - self.max_history, 0)]:
+            del self._jobs[job_id]
+
+
+# Global instance
+training_jobs = TrainingJobs()
@@ -0,0 +1,106 @@
+# Fixed-memory TF-IDF vectorizer over hashed features, fitted in one streaming pass
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from app.text_features import iter_chunks
+
+
+class HashingTfidfVectorizer:
+    """
+    TF-IDF weighting on top of HashingVectorizer
+    There is no vocabulary: memory is bounded by n_features whatever the corpus size,
+    and the documents are read exactly once, chunk by chunk.
+    max_df and max_features select features like TfidfVectorizer's (document frequency ceiling,
+    then the most frequent ones); dropped features get an idf of 0 and vanish from the vectors
+    """
+
+    def __init__(self, n_features: int = 2 ** 20, ngram_range: Tuple[int, int] = (1, 3),
+                 stop_words: str = 'english', token_pattern: str = r'\b\w+\b',
+                 lowercase: bool = True, sublinear_tf: bool = True, chunk_size: int = 10000,
+                 max_df: float = 1.0, max_features: Optional[int] = None):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.chunk_size = chunk_size
+        self.max_df = max_df
+        self.max_features = max_features
+
+        self._hasher = HashingVectorizer(
+            n_features=n_features, ngram_range=self.ngram_range, stop_words=stop_words,
+            token_pattern=token_pattern, lowercase=lowercase, alternate_sign=False, norm=None
+        )
+        self.idf_ = None
+        self.document_frequency_ = None  # Documents per hashed feature at fit time
+
+    def get_params(self) -> Dict:
+        return {
+            'n_features': self.n_features,
+            'ngram_range': list(self.ngram_range),
+            'stop_words': self.stop_words,
+            'token_pattern': self.token_pattern,
+            'lowercase': self.lowercase,
+            'sublinear_tf': self.sublinear_tf,
+            'chunk_size': self.chunk_size,
+            'max_df': self.max_df,
+            'max_features': self.max_features
+        }
+
+    def build_analyzer(self):
+        return self._hasher.build_analyzer()
+
+    def fit_transform(self, documents: Iterable[str]) -> csr_matrix:
+        """Hash every document once, counting document frequencies as chunks go by"""
+        chunks = []
+        document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        term_frequency = np.zeros(self.n_features, dtype=np.float64)
+        for chunk in iter_chunks(documents, self.chunk_size):
+            counts = self._hasher.transform(chunk)
+            document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+            term_frequency += np.bincount(counts.indices, weights=counts.data, minlength=self.n_features)
+            chunks.append(counts)
+
+        n_documents = sum(counts.shape[0] for counts in chunks)
+        # Same smoothed idf as TfidfTransformer(smooth_idf=True)
+        self.idf_ = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+        self.idf_[~self._selected_features(document_frequency, term_frequency, n_documents)] = 0
+        self.document_frequency_ = document_frequency
+
+        counts = vstack(chunks, format='csr') if chunks else csr_matrix((0, self.n_features))
+        return self._weight(counts)
+
+    def _selected_features(self, document_frequency: np.ndarray, term_frequency: np.ndarray,
+                           n_documents: int) -> np.ndarray:
+        # Without the ceiling and the size limit, rare n-grams (most hashed features) dilute every
+        # vector and cosine similarities shrink to a fraction of the vocabulary model's
+        max_documents = self.max_df if isinstance(self.max_df, int) else self.max_df * n_documents
+        selected = (document_frequency > 0) & (document_frequency <= max_documents)
+        if self.max_features is not None and np.count_nonzero(selected) > self.max_features:
+            candidates = np.flatnonzero(selected)
+            # Most frequent first, ties broken by feature index so fits are reproducible
+            order = np.lexsort((candidates, -term_frequency[candidates]))
+            selected[:] = False
+            selected[candidates[order[:self.max_features]]] = True
+        return selected
+
+    def transform(self, documents: List[str]) -> csr_matrix:
+        return self._weight(self._hasher.transform(documents))
+
+    def unknown_terms(self, documents: List[str]) -> Tuple[int, int]:
+        """(term count, count of terms whose feature never occurred at fit time)"""
+        counts = self._hasher.transform(documents)
+        unseen = self.document_frequency_[counts.indices] == 0
+        return int(counts.data.sum()), int(counts.data[unseen].sum())
+
+    def _weight(self, counts: csr_matrix) -> csr_matrix:
+        counts = counts.astype(np.float64)
+        if self.sublinear_tf:
+            np.log(counts.data, counts.data)
+            counts.data += 1
+        counts.data *= self.idf_[counts.indices]
+        counts.eliminate_zeros()
+        return normalize(counts, norm='l2', copy=False)
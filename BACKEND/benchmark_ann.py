@@ -0,0 +1,100 @@
+import argparse
+import time
+import numpy as np
+from app.database import SessionLocal
+from app.crud import internship_crud
+from app.ml_scoring import recommendation_engine, ML_AVAILABLE
+from app.ann_index import LSHIndex
+
+# Recall and latency of the LSH index against exact cosine similarity.
+# Query profiles are built from randomly sampled internships (title, skill, sector),
+# the same kind of text a student form produces.
+
+def sample_profiles(db, count: int, seed: int):
+    internships = internship_crud.get_all_with_relations(db)
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for idx in rng.choice(len(internships), size=min(count, len(internships)), replace=False):
+        internship = internships[idx]
+        parts = [
+            internship.title,
+            internship.skill.description if internship.skill else "",
+            internship.sector.name if internship.sector else ""
+        ]
+        profiles.append(' '.join(filter(None, parts)))
+    return profiles
+
+
+def benchmark(queries: int = 200, top_n_values=(10, 50, 200), tables: int = 16, bits: int = None,
+              probes: int = None, seed: int = 0):
+    db = SessionLocal()
+
+    try:
+        if not recommendation_engine.is_ready_for_ml():
+            print("🧠 No trained model found, training one first")
+            recommendation_engine.train_streaming(lambda: internship_crud.stream_for_training(db))
+
+        state = recommendation_engine.state
+        matrix = state.tfidf_matrix
+
+        start = time.perf_counter()
+        index = LSHIndex(matrix, n_tables=tables, n_bits=bits, n_probes=probes, seed=seed)
+        build_time = time.perf_counter() - start
+        print(f"📦 {matrix.shape[0]} internships, {matrix.shape[1]} features")
+        print(f"🔧 LSH index: {index.n_tables} tables x {index.n_bits} bits, {index.n_probes} probes, "
+              f"{index.nbytes / 1e6:.1f} MB, built in {build_time * 1000:.0f} ms")
+
+        vectors = [state.tfidf_vectorizer.transform([recommendation_engine._preprocess_text(profile)])
+                   for profile in sample_profiles(db, queries, seed)]
+
+        exact_time = 0.0
+        exact_results = []
+        for vector in vectors:
+            start = time.perf_counter()
+            similarities = (matrix @ vector.T).toarray().ravel()
+            exact_time += time.perf_counter() - start
+            exact_results.append(similarities)
+
+        candidate_counts = []
+        for vector in vectors:
+            candidate_counts.append(len(index.candidates(vector)))
+
+        print(f"⏱️ Exact: {exact_time / len(vectors) * 1000:.2f} ms/query")
+        print(f"🔍 Candidates re-ranked per query: {np.mean(candidate_counts):.0f} "
+              f"({np.mean(candidate_counts) / matrix.shape[0]:.1%} of rows)")
+
+        for top_n in top_n_values:
+            recalls = []
+            ann_time = 0.0
+            for vector, similarities in zip(vectors, exact_results):
+                # Ties at the k-th score are common, so any row scoring at least as high counts as a hit
+                kth_similarity = np.sort(similarities)[::-1][min(top_n, len(similarities)) - 1]
+
+                start = time.perf_counter()
+                rows = index.query(vector, top_n)
+                ann_time += time.perf_counter() - start
+
+                hits = int((similarities[rows] >= kth_similarity - 1e-12).sum())
+                recalls.append(min(hits, top_n) / top_n)
+
+            print(f"✅ Recall@{top_n}: {np.mean(recalls):.3f} "
+                  f"(p10 {np.percentile(recalls, 10):.3f}), ANN {ann_time / len(vectors) * 1000:.2f} ms/query")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if not ML_AVAILABLE:
+        raise SystemExit("❌ ML libraries not available")
+
+    parser = argparse.ArgumentParser(description="Benchmark LSH recall against exact cosine similarity")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--tables", type=int, default=16)
+    parser.add_argument("--bits", type=int, default=None, help="Bits per table (default: from the row count)")
+    parser.add_argument("--probes", type=int, default=None, help="Neighbour buckets probed per table (default: one per bit)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark(args.queries, args.top_n, args.tables, args.bits, args.probes, args.seed)
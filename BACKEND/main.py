@@ -1,9 +1,31 @@
+import logging
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import inspect
+from app import models
 from app.routes import education, location, skills, internships, recommendations, sectors
+from app.database import engine, get_pool_status
+from app.reference_cache import warm_reference_cache
 
-app = FastAPI(title="Internship Recommender API", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+def ensure_internship_skills_table():
+    # Databases created before the internship_skills table would fail every catalog load; the table
+    # starts empty, so additional skills are missing until migrate_internship_skills.py backfills it
+    if not inspect(engine).has_table(models.internship_skills.name):
+        models.Base.metadata.create_all(bind=engine, tables=[models.internship_skills])
+        logger.warning("Created an empty internship_skills table, run migrate_internship_skills.py to backfill it")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ensure_internship_skills_table()
+    # Reference lists are cached before the first form loads them
+    await warm_reference_cache()
+    yield
+
+app = FastAPI(title="Internship Recommender API", version="1.0.0", lifespan=lifespan)
 
 # Enable CORS for all origins
 app.add_middleware(
@@ -28,7 +50,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    # Degraded while a connection pool has no connection left to hand out
+    database_pools = get_pool_status()
+    exhausted = any(pool.get("exhausted") for pool in database_pools.values())
+    return {"status": "degraded" if exhausted else "healthy", "database_pools": database_pools}
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,59 @@
+from typing import List, Optional
+from app.database import SessionLocal, engine
+from app import models
+
+# Backfill migration: move "Additional_Skills_IDs: 3,7,9" out of Internship.details
+# into the internship_skills association table. Safe to run more than once.
+
+def parse_additional_skill_ids(details: Optional[str]) -> List[int]:
+    # Parse the Additional_Skills_IDs list stored in Internship.details
+    if not details or "Additional_Skills_IDs:" not in details:
+        return []
+    try:
+        additional_part = details.split("Additional_Skills_IDs:")[1].split("This")[0]
+        return [int(x.strip()) for x in additional_part.split(",") if x.strip().isdigit()]
+    except Exception:
+        return []
+
+
+def backfill_internship_skills(batch_size: int = 1000):
+    # Create the association table if needed and copy the parsed skill ids into it
+    models.internship_skills.create(bind=engine, checkfirst=True)
+    print("📦 internship_skills table ensured to exist")
+
+    db = SessionLocal()
+
+    try:
+        valid_skill_ids = {skill_id for (skill_id,) in db.query(models.Skill.id)}
+        existing_pairs = set(db.query(models.internship_skills.c.internship_id,
+                                      models.internship_skills.c.skill_id).all())
+
+        # Collect (internship_id, skill_id) pairs first so inserts do not interleave with the streamed read
+        new_pairs = []
+        rows = db.query(models.Internship.id, models.Internship.details).filter(
+            models.Internship.details.like("%Additional_Skills_IDs:%")
+        ).yield_per(batch_size)
+
+        for internship_id, details in rows:
+            for skill_id in parse_additional_skill_ids(details):
+                pair = (internship_id, skill_id)
+                if skill_id in valid_skill_ids and pair not in existing_pairs:
+                    existing_pairs.add(pair)
+                    new_pairs.append({"internship_id": internship_id, "skill_id": skill_id})
+
+        for start in range(0, len(new_pairs), batch_size):
+            db.execute(models.internship_skills.insert(), new_pairs[start:start + batch_size])
+            db.commit()
+
+        print(f"✅ Backfilled {len(new_pairs)} internship skill links")
+
+    except Exception as e:
+        print(f"❌ Error backfilling internship skills: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_internship_skills()
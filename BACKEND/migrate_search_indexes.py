@@ -0,0 +1,19 @@
+from app.database import engine
+from app import models
+
+# Migration: add the composite indexes behind /api/internships/search and the recommendation
+# pre-filter to a database created before they were declared. Safe to run more than once.
+
+
+def create_search_indexes():
+    indexes = list(models.Internship.__table__.indexes) + list(models.internship_skills.indexes)
+
+    for index in sorted(indexes, key=lambda index: index.name):
+        index.create(bind=engine, checkfirst=True)
+        print(f"📦 {index.name} ensured to exist")
+
+    print(f"✅ {len(indexes)} internship indexes checked")
+
+
+if __name__ == "__main__":
+    create_search_indexes()
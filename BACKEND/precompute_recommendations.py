@@ -0,0 +1,104 @@
+import argparse
+import time
+from itertools import combinations
+from typing import List, Tuple
+from app.database import SessionLocal
+from app import models, schemas, crud
+from app.catalog import internship_catalog
+from app.precomputed import data_version, form_fields, frequent_forms, precomputed_recommendations
+
+# Offline job: compute recommendations for the most common student forms and store them in
+# precomputed_recommendations, so those requests skip scoring. Entries are tied to the current
+# catalog and model and are ignored once either changes; run again after retraining or data loads.
+#
+#   python precompute_recommendations.py --from-log requests.jsonl --top 5000
+#   python precompute_recommendations.py --enumerate --max-skills 2
+
+
+def enumerate_forms(db, max_skills: int, limit: int) -> List[schemas.StudentForm]:
+    """Education -> its sectors -> sets of that sector's skills, for every location and "Any", as the frontend sends them"""
+    locations = [location.description for location in db.query(models.Location).order_by(models.Location.id)] + ["Any"]
+    forms = []
+    for education in db.query(models.Education).order_by(models.Education.id):
+        for sector in sorted(education.sectors, key=lambda sector: sector.id):
+            skill_names = [skill.description for skill in sorted(sector.skills, key=lambda skill: skill.id)]
+            for size in range(1, max_skills + 1):
+                for skills in combinations(skill_names, size):
+                    for location in locations:
+                        forms.append(schemas.StudentForm(
+                            education=education.description,
+                            skills=list(skills),
+                            sector=sector.name,
+                            preferred_location=location
+                        ))
+                        if len(forms) >= limit:
+                            return forms
+    return forms
+
+
+def precompute(forms: List[Tuple[schemas.StudentForm, bool, int]]):
+    db = SessionLocal()
+
+    try:
+        catalog = internship_catalog.get(db)
+        entries = []
+        start_time = time.time()
+
+        for use_ml in (True, False):
+            group = [(form, count) for form, form_use_ml, count in forms if form_use_ml == use_ml]
+            if not group:
+                continue
+
+            ml_enabled = crud._ml_ready(use_ml)
+            version = data_version(catalog, ml_enabled)
+            results = crud.get_recommendations_batch(db, [form for form, _ in group], use_ml=use_ml)
+
+            for (form, count), recommendations in zip(group, results):
+                entries.append({
+                    "cache_key": crud.get_cache_key(form, use_ml),
+                    "data_version": version,
+                    "use_ml": use_ml,
+                    "form": form_fields(form),
+                    "request_count": count,
+                    "recommendations": recommendations
+                })
+
+        # Forms differing only in skill order share a cache key
+        entries = list({entry["cache_key"]: entry for entry in entries}.values())
+        stored = precomputed_recommendations.store(db, entries)
+        print(f"✅ Stored {stored} precomputed recommendation lists in {time.time() - start_time:.1f}s")
+
+    except Exception as e:
+        print(f"❌ Error precomputing recommendations: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute recommendations for frequent student forms")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-log", help="Request log written with RECOMMENDATION_REQUEST_LOG")
+    source.add_argument("--enumerate", action="store_true", help="All education/sector/skill/location combinations")
+    parser.add_argument("--top", type=int, default=5000, help="Most frequent forms taken from the log")
+    parser.add_argument("--max-skills", type=int, default=1, help="Largest skill set enumerated per form")
+    parser.add_argument("--limit", type=int, default=50000, help="Most forms enumerated")
+    parser.add_argument("--with-rules", action="store_true", help="Also store rule-based (use_ml=false) results")
+    args = parser.parse_args()
+
+    if args.from_log:
+        forms = frequent_forms(args.from_log, args.top)
+        print(f"📊 {len(forms)} most frequent forms read from {args.from_log}")
+    else:
+        db = SessionLocal()
+        try:
+            enumerated = enumerate_forms(db, args.max_skills, args.limit)
+        finally:
+            db.close()
+        forms = [(form, True, 0) for form in enumerated]
+        if args.with_rules:
+            forms += [(form, False, 0) for form in enumerated]
+        print(f"📊 {len(enumerated)} forms enumerated")
+
+    precompute(forms)
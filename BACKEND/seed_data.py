@@ -458,7 +458,7 @@ def create_sample_data():
         num_sectors = len(all_sectors)
         num_skills = len(all_skills)
 
-        # Generate internships with multiple skills stored in details
+        # Generate internships with additional skills in the internship_skills table
         for i in range(5000):  # Generate 2500 internship positions
             template = random.choice(internship_templates)
             
@@ -476,7 +476,7 @@ def create_sample_data():
                                                      min(len(template["skill_ids"]), 
                                                          random.randint(3, 4)))  # 3-4 skills per internship
             
-            # Use the first skill as primary skill_id, store others in details
+            # Use the first skill as primary skill_id, link the others as additional skills
             primary_skill_id = skills_for_this_internship[0]
             additional_skill_ids = skills_for_this_internship[1:]
             
@@ -488,9 +488,8 @@ def create_sample_data():
             
             # Create details with multiple skills information
             skills_text = ", ".join(skill_names)
-            additional_skills_json = ",".join(map(str, additional_skill_ids)) if additional_skill_ids else ""
             
-            details_text = f"Join {company} as a {title} and gain hands-on experience in {all_sectors[template['sector_id']-1].name}. This {duration} internship offers mentorship, real-world projects, and potential for full-time conversion. Required skills: {skills_text}. Additional_Skills_IDs: {additional_skills_json}"
+            details_text = f"Join {company} as a {title} and gain hands-on experience in {all_sectors[template['sector_id']-1].name}. This {duration} internship offers mentorship, real-world projects, and potential for full-time conversion. Required skills: {skills_text}."
             
             # Ensure IDs are within valid ranges
             if (primary_skill_id <= num_skills and 
@@ -507,7 +506,8 @@ def create_sample_data():
                     location_id=location_id,
                     duration=duration,
                     no_of_post=no_of_posts,
-                    details=details_text
+                    details=details_text,
+                    additional_skills=[all_skills[skill_id-1] for skill_id in additional_skill_ids if skill_id <= num_skills]
                 )
                 internships_to_create.append(internship)
 
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Tests import the app package from BACKEND and run against a throwaway SQLite database;
+# app.database reads DATABASE_URL at import time, so it is set before any app module loads
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+TEST_DIR = tempfile.mkdtemp(prefix="internship-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}")
+os.environ.setdefault("ML_MODEL_PATH", os.path.join(TEST_DIR, "ml_model"))
+os.environ.setdefault("CACHE_BACKEND", "memory")
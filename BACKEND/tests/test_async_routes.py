@@ -0,0 +1,167 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app import models, schemas
+from app.catalog import internship_catalog
+from app.crud import async_location_crud, async_skill_crud, skill_crud
+from app.database import AsyncSessionLocal, SessionLocal, engine
+from main import app
+
+
+@pytest.fixture
+def client():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        yield client
+
+
+def create_location(client, description, state=None):
+    # Runs on the app's event loop, where the aiosqlite connections live
+    async def create():
+        async with AsyncSessionLocal() as db:
+            location = await async_location_crud.create(db, schemas.LocationCreate(description=description, state=state))
+            return location.id
+    return client.portal.call(create)
+
+
+def test_async_lookup_route_reads_through_aiosqlite(client):
+    location_id = create_location(client, "Pune", "Maharashtra")
+
+    response = client.get(f"/api/location/{location_id}")
+    assert response.status_code == 200
+    assert response.json() == {"id": location_id, "description": "Pune", "state": "Maharashtra"}
+
+    assert client.get(f"/api/location/{location_id + 1}").status_code == 404
+
+
+def test_async_create_invalidates_catalog_and_reference_cache(client):
+    assert client.get("/api/location/").json() == []
+    with SessionLocal() as db:
+        before = internship_catalog.get(db)
+
+    location_id = create_location(client, "Mumbai")
+
+    # The cached list is dropped, so the new location is served at once
+    assert client.get("/api/location/").json() == [{"id": location_id, "description": "Mumbai", "state": None}]
+    with SessionLocal() as db:
+        assert internship_catalog.get(db) is not before
+
+
+def test_reference_lists_answer_a_matching_etag_with_304(client):
+    create_location(client, "Pune")
+    first = client.get("/api/location/")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert "max-age" in first.headers["cache-control"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        revalidated = client.get("/api/location/", headers={"If-None-Match": if_none_match})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
+    # A write changes the body, so the old tag no longer matches
+    create_location(client, "Delhi")
+    changed = client.get("/api/location/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert [location["description"] for location in changed.json()] == ["Pune", "Delhi"]
+
+
+def test_unknown_sector_is_not_cached(client):
+    assert client.get("/api/skills/by-sector/1").status_code == 404
+
+    # Written outside the API, so nothing invalidates the reference cache
+    with SessionLocal() as db:
+        db.add(models.Sector(id=1, name="Technology"))
+        db.commit()
+
+    response = client.get("/api/skills/by-sector/1")
+    assert response.status_code == 200
+    assert response.json() == {"sector_id": 1, "sector_name": "Technology", "skills": []}
+
+
+def test_search_counts_matches_on_the_first_page_only(client):
+    with SessionLocal() as db:
+        education, skill = models.Education(description="B.Tech"), models.Skill(description="Python")
+        technology, finance = models.Sector(name="Technology"), models.Sector(name="Finance")
+        pune = models.Location(description="Pune")
+        db.add_all([
+            models.Internship(title=f"Intern {number}", description="Backend work", company_name="Acme",
+                              skill=skill, education=education, sector=technology if number % 2 else finance,
+                              location=pune, duration="3 months")
+            for number in range(1, 8)
+        ])
+        db.commit()
+        technology_id = technology.id
+
+    first = client.get("/api/internships/search", params={"sector_id": technology_id, "limit": 2}).json()
+    assert first["total_count"] == 4
+    assert [internship["title"] for internship in first["internships"]] == ["Intern 1", "Intern 3"]
+
+    second = client.get("/api/internships/search",
+                        params={"sector_id": technology_id, "limit": 2, "cursor": first["next_cursor"]}).json()
+    assert second["total_count"] is None
+    assert [internship["title"] for internship in second["internships"]] == ["Intern 5", "Intern 7"]
+    assert second["next_cursor"] is None
+
+
+def add_internships(count):
+    with SessionLocal() as db:
+        education, skill = models.Education(description="B.Tech"), models.Skill(description="Python")
+        sector, pune = models.Sector(name="Technology"), models.Location(description="Pune")
+        internships = [
+            models.Internship(title=f"Intern {number}", description="Backend work", company_name="Acme",
+                              skill=skill, education=education, sector=sector, location=pune, duration="3 months")
+            for number in range(1, count + 1)
+        ]
+        db.add_all(internships)
+        db.commit()
+        return [internship.id for internship in internships]
+
+
+def test_listing_pages_follow_the_cursor_without_gaps(client):
+    ids = add_internships(7)
+
+    first = client.get("/api/internships/", params={"limit": 3}).json()
+    assert [internship["id"] for internship in first["internships"]] == ids[:3]
+    assert first["next_cursor"] == ids[2]
+
+    # Deleting a row already seen does not shift later pages, unlike an offset
+    with SessionLocal() as db:
+        db.query(models.Internship).filter(models.Internship.id == ids[0]).delete()
+        db.commit()
+
+    second = client.get("/api/internships/", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+    third = client.get("/api/internships/", params={"limit": 3, "cursor": second["next_cursor"]}).json()
+    assert [internship["id"] for internship in second["internships"]] == ids[3:6]
+    assert [internship["id"] for internship in third["internships"]] == ids[6:]
+    assert third["next_cursor"] is None
+
+    assert client.get("/api/internships/", params={"limit": 0}).status_code == 422
+
+
+def test_export_streams_every_internship_as_ndjson(client):
+    add_internships(5)
+
+    response = client.get("/api/internships/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+
+    listed = client.get("/api/internships/", params={"limit": 100}).json()["internships"]
+    assert exported == listed
+    assert exported[0]["sector"]["name"] == "Technology"
+
+
+def test_sync_and_async_skill_create_both_persist(client):
+    with SessionLocal() as db:
+        sync_id = skill_crud.create(db, schemas.SkillCreate(description="Python")).id
+
+    async def create():
+        async with AsyncSessionLocal() as db:
+            return (await async_skill_crud.create(db, schemas.SkillCreate(description="SQL"))).id
+    async_id = client.portal.call(create)
+
+    assert client.get(f"/api/skills/{sync_id}").json() == {"id": sync_id, "description": "Python"}
+    assert client.get(f"/api/skills/{async_id}").json() == {"id": async_id, "description": "SQL"}
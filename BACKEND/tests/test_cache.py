@@ -0,0 +1,226 @@
+import pickle
+import pytest
+from app.cache import CacheBackend, LRUCache, RedisCacheBackend, SQLiteCacheBackend
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_memory_cache_evicts_least_recently_used_entries():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "a")
+    cache.set("b", "b")
+    cache.get("a")  # b is now the least recently used
+    cache.set("c", "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+    assert stats["hit_rate"] == 0.75
+
+
+def test_memory_cache_expires_entries_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_entries=10, ttl=300)
+
+    cache.set("form", b"body")
+    now[0] += 299
+    assert cache.get("form") == b"body"
+
+    now[0] += 2
+    assert cache.get("form") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_memory_cache_stays_within_max_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=2500, sizeof=len)
+    for key in ("a", "b", "c"):
+        cache.set(key, b"x" * 1000)
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 2000
+
+    # A value larger than the whole budget is not cached and evicts nothing
+    cache.set("huge", b"x" * 3000)
+    assert cache.get("huge") is None
+    assert len(cache) == 2
+
+
+def test_sqlite_backend_shares_entries_between_workers(cache_path):
+    # Two instances on one file stand for two workers
+    writer = SQLiteCacheBackend(cache_path, "recommendations")
+    reader = SQLiteCacheBackend(cache_path, "recommendations")
+    other_namespace = SQLiteCacheBackend(cache_path, "similarity")
+
+    writer.set("form", [{"id": 1, "match_score": 42.5}])
+
+    assert reader.get("form") == [{"id": 1, "match_score": 42.5}]
+    assert other_namespace.get("form") is None
+    assert reader.stats()["entries"] == 1
+
+    reader.delete("form")
+    assert writer.get("form", "missing") == "missing"
+
+
+def test_sqlite_backend_expires_entries_after_ttl(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    cache = SQLiteCacheBackend(cache_path, "recommendations", ttl=300)
+
+    cache.set("form", b"body")
+    now[0] += 299
+    assert cache.get("form") == b"body"
+
+    now[0] += 2
+    assert cache.get("form") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_sqlite_backend_evicts_least_recently_used_entries(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    cache = SQLiteCacheBackend(cache_path, "recommendations", max_entries=2)
+
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.set(key, key)
+    now[0] += 1
+    cache.get("a")  # b is now the least recently used
+    now[0] += 1
+    cache.set("c", "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_backend_evicts_to_stay_within_max_bytes(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    payload = b"x" * 1000
+    cache = SQLiteCacheBackend(cache_path, "similarity", max_entries=100, max_bytes=2500)
+
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set(key, payload)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 2500
+    assert stats["entries"] == 2
+    assert cache.get("a") is None
+
+    # A value larger than the whole budget is never stored
+    cache.set("huge", b"x" * 5000)
+    assert cache.get("huge") is None
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis client commands RedisCacheBackend uses"""
+
+    def __init__(self):
+        self.values, self.hashes, self.zsets = {}, {}, {}
+
+    @staticmethod
+    def _key(key):
+        return key.encode() if isinstance(key, str) else key
+
+    def get(self, key):
+        return self.values.get(self._key(key))
+
+    def set(self, key, value, ex=None):
+        self.values[self._key(key)] = value if isinstance(value, bytes) else str(value).encode()
+
+    def delete(self, *keys):
+        for key in map(self._key, keys):
+            self.values.pop(key, None)
+            self.hashes.pop(key, None)
+            self.zsets.pop(key, None)
+
+    def incrby(self, key, amount):
+        self.set(key, int(self.get(key) or 0) + amount)
+
+    def hget(self, key, field):
+        return self.hashes.get(self._key(key), {}).get(self._key(field))
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(self._key(key), {})[self._key(field)] = str(value).encode()
+
+    def hdel(self, key, field):
+        self.hashes.get(self._key(key), {}).pop(self._key(field), None)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(self._key(key), {}).update({self._key(m): score for m, score in mapping.items()})
+
+    def zrem(self, key, member):
+        self.zsets.get(self._key(key), {}).pop(self._key(member), None)
+
+    def zcard(self, key):
+        return len(self.zsets.get(self._key(key), {}))
+
+    def zrange(self, key, start, stop):
+        members = sorted(self.zsets.get(self._key(key), {}).items(), key=lambda item: item[1])
+        return [member for member, _ in members][start:stop + 1]
+
+    def scan_iter(self, match, count=None):
+        prefix = self._key(match.rstrip("*"))
+        return [key for key in list(self.values) if key.startswith(prefix)]
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+def test_redis_backend_enforces_max_bytes(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    client = FakeRedis()
+    cache = RedisCacheBackend("redis://unused", "similarity", max_entries=100, max_bytes=2500, client=client)
+
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set(key, b"x" * 1000)
+
+    stats = cache.stats()
+    assert stats["max_bytes"] == 2500
+    assert stats["bytes"] <= 2500
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert cache.get("a") is None
+    assert cache.get("c") == b"x" * 1000
+
+
+def test_redis_backend_enforces_max_entries_and_forgets_expired_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    client = FakeRedis()
+    cache = RedisCacheBackend("redis://unused", "recommendations", max_entries=2, client=client)
+
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set(key, key)
+    assert cache.stats()["entries"] == 2
+    assert cache.get("a") is None
+
+    # The server expired "b": the next lookup drops it from the totals
+    client.delete("cache:recommendations:b")
+    assert cache.get("b") is None
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == len(pickle.dumps("c", protocol=pickle.HIGHEST_PROTOCOL))
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from app import models, schemas
+from app.catalog import CatalogSnapshot, load_catalog
+from app.crud import _prefiltered_positions
+from app.database import SessionLocal, engine
+from main import app
+
+
+def test_startup_creates_internship_skills_table_on_an_older_database():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    models.internship_skills.drop(bind=engine)
+    assert not inspect(engine).has_table("internship_skills")
+
+    with TestClient(app):
+        assert inspect(engine).has_table("internship_skills")
+
+    with SessionLocal() as db:
+        assert len(load_catalog(db)) == 0
+
+
+def make_snapshot():
+    rows = [
+        SimpleNamespace(id=internship_id, title=f"Intern {internship_id}", company_name="Acme",
+                        description="Work", duration="3 months", skills_id=1, edu_id=1,
+                        sector_id=sector_id, location_id=location_id)
+        for internship_id, sector_id, location_id in [(1, 1, 1), (2, 2, 1), (3, 1, 2), (5, 3, 2)]
+    ]
+    return CatalogSnapshot(
+        rows,
+        skills={1: "Python"},
+        sectors={1: "Artificial Intelligence", 2: "Finance", 3: "Technology"},
+        locations={1: "Mumbai", 2: "Bangalore"},
+        educations={1: "B.Tech"},
+        additional_skills={}
+    )
+
+
+def form(sector="Any", location="Any"):
+    return schemas.StudentForm(education="B.Tech", skills=["Python"], sector=sector,
+                               preferred_location=location, description="")
+
+
+def test_prefilter_resolves_names_to_ids_in_memory():
+    snapshot = make_snapshot()
+    assert _prefiltered_positions(snapshot, form()).tolist() == [0, 1, 2, 3]
+    # Aliases and misspellings resolve like the names themselves
+    assert _prefiltered_positions(snapshot, form(sector="ML")).tolist() == [0, 2]
+    assert _prefiltered_positions(snapshot, form(location="Bengaluru")).tolist() == [2, 3]
+    assert _prefiltered_positions(snapshot, form(sector="Finanse", location="Mumbai")).tolist() == [1]
+    assert _prefiltered_positions(snapshot, form(sector="Agriculture")).tolist() == []
+
+    filter_cache = {}
+    positions = _prefiltered_positions(snapshot, form(sector="ai"), filter_cache)
+    assert _prefiltered_positions(snapshot, form(sector="ai"), filter_cache) is positions
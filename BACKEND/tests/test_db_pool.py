@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine, text
+from app.db_pool import PoolMetrics, TimedQueuePool
+
+
+def timed_engine(tmp_path, max_overflow):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, poolclass=TimedQueuePool, pool_size=1, max_overflow=max_overflow, pool_timeout=0.1)
+    metrics = PoolMetrics()
+    metrics.attach(engine.pool)
+    return engine, metrics
+
+
+def test_pool_is_exhausted_when_size_and_overflow_are_checked_out(tmp_path):
+    engine, metrics = timed_engine(tmp_path, max_overflow=1)
+    with engine.connect() as first, engine.connect() as second:
+        status = metrics.snapshot(engine.pool)
+        assert status["checked_out"] == 2 and status["max_overflow"] == 1
+        assert status["exhausted"] is True
+    assert metrics.snapshot(engine.pool)["exhausted"] is False
+    engine.dispose()
+
+
+def test_pool_with_unlimited_overflow_is_never_exhausted(tmp_path):
+    engine, metrics = timed_engine(tmp_path, max_overflow=-1)
+    connections = [engine.connect() for _ in range(3)]
+    for connection in connections:
+        connection.execute(text("select 1"))
+    status = metrics.snapshot(engine.pool)
+    assert status["checked_out"] == 3
+    assert status["exhausted"] is False
+    for connection in connections:
+        connection.close()
+    engine.dispose()
+    # Pools recreated by dispose() keep the configured overflow
+    assert engine.pool.max_overflow == -1
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app import crud
+from app.ml_scoring import ML_AVAILABLE, HybridRecommendationEngine
+
+pytestmark = pytest.mark.skipif(not ML_AVAILABLE, reason="ML libraries not installed")
+
+SKILLS = ["Python", "React", "SQL", "Figma", "Excel", "Java", "Node.js", "Tableau"]
+SECTORS = ["Technology", "Data Science", "Web Development", "Finance"]
+CITIES = ["Mumbai", "Pune", "Delhi", "Bangalore"]
+
+
+def make_internships(count):
+    return [
+        SimpleNamespace(
+            id=internship_id,
+            title=f"{SKILLS[internship_id % len(SKILLS)]} intern {internship_id}",
+            description=f"Work on {SECTORS[internship_id % len(SECTORS)].lower()} projects using "
+                        f"{SKILLS[(internship_id * 3) % len(SKILLS)]} with the team",
+            skill=SimpleNamespace(description=SKILLS[internship_id % len(SKILLS)]),
+            sector=SimpleNamespace(name=SECTORS[internship_id % len(SECTORS)]),
+            location=SimpleNamespace(description=CITIES[internship_id % len(CITIES)])
+        )
+        for internship_id in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = HybridRecommendationEngine()
+    engine.model_path = str(tmp_path / "ml_model")
+    return engine
+
+
+def test_rows_are_looked_up_by_internship_id(engine):
+    # Trained in an order unrelated to the ids, with gaps
+    internships = [internship for internship in make_internships(30) if internship.id % 4][::-1]
+    assert engine.train_manually(internships, force_retrain=True)
+    state = engine.state
+
+    rows = state.get_rows([internship.id for internship in internships])
+    assert state.internship_ids[rows].tolist() == [internship.id for internship in internships]
+    # Untrained, deleted, negative and out-of-range ids have no row
+    assert state.get_rows([4, 8, -1, 31, 10 ** 6]).tolist() == [-1] * 5
+
+    profile = "python developer for technology projects"
+    ids = np.array([4, 5, 10 ** 6, 30])
+    scores = engine.calculate_ml_similarity_batch(profile, ids)
+    assert scores.tolist() == [engine.calculate_ml_similarity(profile, internship_id) for internship_id in ids]
+    assert scores[0] == scores[2] == 25.0
+
+
+def test_incremental_retrain_after_only_deletions_drops_removed_rows(engine):
+    internships = make_internships(40)
+    assert engine.train_manually(internships, force_retrain=True)
+    previous = engine.state
+
+    # Delete internships, then retrain without force: only removals, no changed texts
+    removed = {7, 23}
+    remaining = [internship for internship in internships if internship.id not in removed]
+    assert engine.train_manually(remaining)
+
+    state = engine.state
+    assert state is not previous
+    assert state.tfidf_matrix.shape[0] == len(remaining)
+    assert (state.get_rows(sorted(removed)) == -1).all()
+    assert set(state.internship_ids.tolist()) == {internship.id for internship in remaining}
+    assert state.drift == previous.drift
+
+    # Remaining rows keep their vectors
+    rows = state.get_rows([1, 40])
+    previous_rows = previous.get_rows([1, 40])
+    assert np.allclose(state.tfidf_matrix[rows].toarray(), previous.tfidf_matrix[previous_rows].toarray())
+
+
+def test_failed_incremental_retrain_keeps_previous_model(engine, monkeypatch):
+    internships = make_internships(40)
+    assert engine.train_manually(internships, force_retrain=True)
+    previous = engine.state
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("index update failed")
+
+    monkeypatch.setattr(engine, "_index_rows", fail)
+    assert engine.train_manually(internships[:-1]) is False
+    assert engine.state is previous
+
+
+def test_ann_index_is_built_with_the_model_on_large_catalogs(engine, monkeypatch):
+    monkeypatch.setattr("app.ml_scoring.ML_ANN_CANDIDATES", 50)
+    assert engine.train_manually(make_internships(40), force_retrain=True)
+    assert engine.state.ann_index is None
+    assert len(engine.nearest_internships("python developer for technology projects", 10)) == 0
+
+    monkeypatch.setattr("app.ml_scoring.ML_ANN_MIN_ROWS", 20)
+    assert engine.train_manually(make_internships(40), force_retrain=True)
+    assert engine.state.ann_index is not None
+    assert len(engine.nearest_internships("python developer for technology projects", 10)) > 0
+
+
+def test_other_workers_reload_a_model_saved_to_the_store(engine, monkeypatch):
+    monkeypatch.setattr("app.ml_scoring.ML_MODEL_RECHECK_SECONDS", 0)
+    other_worker = HybridRecommendationEngine()
+    other_worker.model_path = engine.model_path
+    assert not other_worker.reload_if_updated()
+
+    internships = make_internships(40)
+    assert engine.train_manually(internships, force_retrain=True)
+    # The training worker does not reload what it saved itself
+    assert not engine.reload_if_updated()
+
+    assert other_worker.reload_if_updated()
+    assert other_worker.state.training_data_hash == engine.state.training_data_hash
+    assert not other_worker.reload_if_updated()
+
+    assert engine.train_manually(internships[:-1])
+    assert other_worker.reload_if_updated()
+    assert other_worker.state.training_data_hash == engine.state.training_data_hash
+    assert other_worker.state.tfidf_matrix.shape[0] == 39
+
+
+def test_recommendation_cache_key_follows_the_published_model(engine, monkeypatch):
+    monkeypatch.setattr("app.ml_scoring.recommendation_engine", engine)
+    assert crud.model_cache_key(use_ml=True) == "rules"
+
+    internships = make_internships(40)
+    assert engine.train_manually(internships, force_retrain=True)
+    first = crud.model_cache_key(use_ml=True)
+    assert engine.state.training_data_hash in first
+    assert crud.model_cache_key(use_ml=False) == "rules"
+
+    assert engine.train_manually(internships[:-1])
+    assert crud.model_cache_key(use_ml=True) != first
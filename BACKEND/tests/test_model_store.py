@@ -0,0 +1,94 @@
+import os
+import numpy as np
+import pytest
+from app import ml_scoring
+from app.ml_scoring import ML_AVAILABLE, HybridRecommendationEngine
+from app.model_store import KEEP_VERSIONS, current_version_dir, load_artifact, save_artifact
+from test_vectorizers import PROFILES, make_internships
+
+
+def test_artifact_round_trip_memory_maps_arrays(tmp_path):
+    model_dir = str(tmp_path / "model")
+    arrays = {"data": np.arange(6, dtype=np.float32), "indices": np.array([3, 1, 2], dtype=np.int32)}
+    vocabulary = ["python", "machine learning", "développeur"]
+
+    version_dir = save_artifact(model_dir, {"model_version": "test"}, arrays, vocabulary)
+    assert current_version_dir(model_dir) == version_dir
+
+    manifest, loaded, loaded_vocabulary = load_artifact(version_dir)
+    assert manifest["model_version"] == "test"
+    assert loaded_vocabulary == vocabulary
+    for name, array in arrays.items():
+        assert isinstance(loaded[name], np.memmap)
+        assert loaded[name].dtype == array.dtype
+        assert np.array_equal(loaded[name], array)
+    assert not [name for name in os.listdir(version_dir) if name.endswith((".pkl", ".pickle"))]
+
+
+def test_only_the_latest_versions_are_kept(tmp_path):
+    model_dir = str(tmp_path / "model")
+    versions = [save_artifact(model_dir, {}, {"idf": np.ones(3)}) for _ in range(KEEP_VERSIONS + 2)]
+
+    assert current_version_dir(model_dir) == versions[-1]
+    assert [os.path.exists(version) for version in versions] == [False] * 2 + [True] * KEEP_VERSIONS
+
+
+def test_unknown_format_version_is_rejected(tmp_path):
+    version_dir = save_artifact(str(tmp_path / "model"), {}, {"idf": np.ones(3)})
+    manifest_path = os.path.join(version_dir, "manifest.json")
+    with open(manifest_path) as f:
+        manifest = f.read()
+    with open(manifest_path, "w") as f:
+        f.write(manifest.replace('"format_version": 1', '"format_version": 99'))
+
+    with pytest.raises(ValueError):
+        load_artifact(version_dir)
+
+
+@pytest.mark.skipif(not ML_AVAILABLE, reason="ML libraries not installed")
+@pytest.mark.parametrize("vectorizer", ["tfidf", "hashing"])
+def test_saved_model_loads_with_the_same_similarities(monkeypatch, tmp_path, vectorizer):
+    monkeypatch.setattr(ml_scoring, "ML_VECTORIZER", vectorizer)
+    trained = HybridRecommendationEngine()
+    trained.model_path = str(tmp_path / "model")
+    internships = make_internships()
+    assert trained.train_manually(internships, force_retrain=True)
+
+    loaded = HybridRecommendationEngine()
+    loaded.model_path = trained.model_path
+    loaded._load_model()
+    assert loaded.is_ready_for_ml()
+    # A view of the read-only file mapping, not a copy
+    matrix_data = loaded.state.tfidf_matrix.data
+    assert not matrix_data.flags.owndata and not matrix_data.flags.writeable
+
+    ids = np.array([internship.id for internship in internships])
+    for profile in PROFILES:
+        assert np.array_equal(loaded.calculate_ml_similarity_batch(profile, ids),
+                              trained.calculate_ml_similarity_batch(profile, ids))
+
+
+@pytest.mark.skipif(not ML_AVAILABLE, reason="ML libraries not installed")
+def test_dense_embeddings_are_saved_and_loaded(monkeypatch, tmp_path):
+    monkeypatch.setattr(ml_scoring, "ML_SIMILARITY_MODE", "dense")
+    monkeypatch.setattr(ml_scoring, "ML_DENSE_DIMENSIONS", 32)
+    trained = HybridRecommendationEngine()
+    trained.model_path = str(tmp_path / "model")
+    internships = make_internships()
+    assert trained.train_manually(internships, force_retrain=True)
+    assert trained.state.similarity_mode == "dense"
+    assert "dense_embeddings" in load_artifact(trained.version_dir)[0]["arrays"]
+
+    loaded = HybridRecommendationEngine()
+    loaded.model_path = trained.model_path
+    loaded._load_model()
+    assert loaded.state.similarity_mode == "dense"
+    assert np.array_equal(loaded.state.embeddings, trained.state.embeddings)
+
+    ids = np.array([internship.id for internship in internships])
+    profile_batch = loaded.profile_batch(PROFILES)
+    for index, profile in enumerate(PROFILES):
+        expected = trained.calculate_ml_similarity_batch(profile, ids)
+        np.testing.assert_allclose(loaded.calculate_ml_similarity_batch(profile, ids), expected)
+        # Float32 embeddings: the batch projection may round differently in the last bits
+        np.testing.assert_allclose(profile_batch.ml_scores(index, ids), expected, rtol=1e-5)
@@ -0,0 +1,48 @@
+import json
+from app import crud, models
+from app.catalog import internship_catalog
+from app.precomputed import frequent_forms, log_requests
+from precompute_recommendations import precompute
+from test_recommendations import db, forms  # noqa: F401 (fixture)
+
+
+def test_request_log_yields_the_most_frequent_forms(monkeypatch, tmp_path):
+    log_path = tmp_path / "requests.jsonl"
+    monkeypatch.setattr("app.precomputed.RECOMMENDATION_REQUEST_LOG", str(log_path))
+    python, finance = forms()[0], forms()[3]
+    reordered = finance.model_copy(update={"skills": list(reversed(finance.skills))})
+
+    log_requests([python, finance], use_ml=True)
+    log_requests([reordered, finance], use_ml=True)
+    log_requests([finance], use_ml=False)
+
+    # Skill order does not make a different form; ties keep first-seen order
+    top = frequent_forms(str(log_path), top=2)
+    assert [(form.sector, use_ml, count) for form, use_ml, count in top] == [("Finance", True, 3), ("Technology", True, 1)]
+    assert top[0][0].skills == sorted(finance.skills)
+
+
+def test_precomputed_lists_are_served_until_the_catalog_changes(db):
+    student_form = forms()[0]
+    live = crud.get_recommendations(db, student_form, use_ml=False)
+    precompute([(student_form, False, 1)])
+
+    row = db.query(models.PrecomputedRecommendation).one()
+    assert json.loads(row.recommendations) == live
+
+    # Mark the stored list so a response can only have come from the table
+    row.recommendations = json.dumps([{**recommendation, "match_score": 99.0} for recommendation in live])
+    db.commit()
+    crud.recommendation_cache.clear()
+    assert [recommendation["match_score"] for recommendation in crud.get_recommendations(db, student_form, use_ml=False)] \
+        == [99.0] * len(live)
+
+    # Any catalog change makes the stored list stale
+    db.query(models.Internship).filter(models.Internship.id == live[0]["id"]).update({"title": "Renamed intern"})
+    db.commit()
+    internship_catalog.invalidate()
+    crud.recommendation_cache.clear()
+    recommendations = crud.get_recommendations(db, student_form, use_ml=False)
+    assert [recommendation["match_score"] for recommendation in recommendations] == \
+        [recommendation["match_score"] for recommendation in live]
+    assert recommendations[0]["title"] == "Renamed intern"
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app import crud, models, schemas
+from app.catalog import internship_catalog, load_catalog
+from app.database import SessionLocal, engine
+from app.ml_scoring import (ML_AVAILABLE, calculate_enhanced_score, calculate_enhanced_scores_batch,
+                            recommendation_engine)
+from app.scoring import calculate_total_score, calculate_total_scores_batch
+from main import app
+
+SKILLS = ["Python", "React", "SQL", "Figma", "Excel", "Java"]
+SECTORS = ["Technology", "Data Science", "Web Development", "Finance"]
+CITIES = ["Mumbai", "Pune", "Delhi", "Remote"]
+EDUCATIONS = ["Bachelor's", "Master's", "PhD"]
+
+
+@pytest.fixture
+def db():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        educations = [models.Education(description=name) for name in EDUCATIONS]
+        skills = [models.Skill(description=name) for name in SKILLS]
+        sectors = [models.Sector(name=name) for name in SECTORS]
+        cities = [models.Location(description=name) for name in CITIES]
+        db.add_all([
+            models.Internship(title=f"{SKILLS[number % len(SKILLS)]} developer intern",
+                              description=f"Work on {SECTORS[number % len(SECTORS)].lower()} projects "
+                                          f"with {SKILLS[(number * 5) % len(SKILLS)]}",
+                              company_name="Acme", duration="3 months", education=educations[number % len(educations)],
+                              skill=skills[number % len(skills)], sector=sectors[number % len(sectors)],
+                              location=cities[(number // 3) % len(cities)])
+            for number in range(60)
+        ])
+        # No skill, sector, location or education to fall back on
+        db.add(models.Internship(title="General intern", description="Help the team", company_name="Acme"))
+        db.commit()
+        internship_catalog.invalidate()
+        crud.recommendation_cache.clear()
+        yield db
+
+
+def forms():
+    return [
+        schemas.StudentForm(education="B.Tech", skills=skills, sector=sector, preferred_location=location,
+                            description=description)
+        for skills, sector, location, description in [
+            (["Python"], "Technology", "Pune", "Python developer intern for technology projects"),
+            (["React", "Figma"], "Web Development", "Any", "React developer intern, web development"),
+            ([], "Any", "Mumbai", ""),
+            (["SQL", "Excel"], "Finance", "Delhi", "SQL developer intern in finance"),
+            (["Java"], "Data Science", "Any", "Java developer intern for data science projects"),
+        ]
+    ]
+
+
+@pytest.mark.skipif(not ML_AVAILABLE, reason="ML libraries not installed")
+@pytest.mark.parametrize("use_ml", [True, False])
+def test_batch_recommendations_equal_one_call_per_form(db, use_ml):
+    assert recommendation_engine.train_manually(db.query(models.Internship).all(), force_retrain=True)
+
+    single = []
+    for student_form in forms():
+        crud.recommendation_cache.clear()
+        single.append(crud.get_recommendations(db, student_form, use_ml=use_ml))
+    crud.recommendation_cache.clear()
+    batch = crud.get_recommendations_batch(db, forms(), use_ml=use_ml)
+
+    assert all(single)
+    assert batch == single
+
+
+def test_batch_rule_scores_equal_scalar_scores(db):
+    internships = db.query(models.Internship).order_by(models.Internship.id).all()
+    catalog = load_catalog(db)
+    columns = catalog.scoring_columns(np.arange(len(catalog)))
+
+    for student_form in forms():
+        student_data = crud._student_data(student_form)
+        expected = [calculate_total_score(internship, student_data) for internship in internships]
+        np.testing.assert_allclose(calculate_total_scores_batch(columns, student_data), expected)
+
+
+@pytest.mark.skipif(not ML_AVAILABLE, reason="ML libraries not installed")
+def test_batch_enhanced_scores_equal_scalar_scores(db):
+    internships = db.query(models.Internship).order_by(models.Internship.id).all()
+    assert recommendation_engine.train_manually(internships, force_retrain=True)
+    catalog = load_catalog(db)
+    columns = catalog.scoring_columns(np.arange(len(catalog)))
+
+    for student_form in forms():
+        student_data = crud._student_data(student_form)
+        scores, breakdown = calculate_enhanced_scores_batch(columns, student_data, catalog.ids)
+        expected = [calculate_enhanced_score(internship, student_data) for internship in internships]
+        np.testing.assert_allclose(scores, [total for total, _ in expected])
+        np.testing.assert_allclose(breakdown["ml_based"], [details["ml_based"]["final_score"] for _, details in expected])
+
+
+def test_snapshot_rows_match_the_orm(db):
+    internships = db.query(models.Internship).order_by(models.Internship.id).all()
+    skills = db.query(models.Skill).order_by(models.Skill.id).all()
+    internships[0].additional_skills = [skills[2], skills[4]]
+    internships[1].additional_skills = [skills[0]]
+    db.commit()
+
+    catalog = load_catalog(db)
+    assert catalog.ids.tolist() == [internship.id for internship in internships]
+    for position, internship in enumerate(internships):
+        assert catalog.record(position) == {
+            "id": internship.id,
+            "title": internship.title,
+            "company_name": internship.company_name,
+            "sector": internship.sector.name if internship.sector else None,
+            "location": internship.location.description if internship.location else None,
+            "duration": internship.duration,
+            "description": internship.description
+        }
+        primary = [internship.skill.description] if internship.skill else []
+        additional = sorted(internship.additional_skills, key=lambda skill: skill.id)
+        assert catalog.skills_of(position) == primary + [skill.description for skill in additional]
+
+
+def test_rule_based_recommendations_score_like_the_orm(db):
+    internships = {internship.id: internship for internship in db.query(models.Internship)}
+
+    for student_form in forms():
+        student_data = crud._student_data(student_form)
+        recommendations = crud.get_recommendations(db, student_form, use_ml=False)
+        assert recommendations
+        for recommendation in recommendations:
+            internship = internships[recommendation["id"]]
+            assert recommendation["match_score"] == round(calculate_total_score(internship, student_data), 2)
+            assert recommendation["title"] == internship.title
+            assert recommendation["skills"] == (internship.skill.description if internship.skill else "Not specified")
+
+
+def test_repeated_forms_are_served_from_the_recommendation_cache(db):
+    body = forms()[0].model_dump()
+    with TestClient(app) as client:
+        first = client.post("/api/recommendations/?use_ml=false", json=body)
+        before = client.get("/api/recommendations/cache-stats").json()
+        second = client.post("/api/recommendations/?use_ml=false", json=body)
+        after = client.get("/api/recommendations/cache-stats").json()
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+    assert after["entries"] == before["entries"] >= 1
+
+
+def test_sector_and_location_aliases_filter_like_the_stored_names(db):
+    def recommended(sector, location):
+        student_form = schemas.StudentForm(education="B.Tech", skills=["React"], sector=sector,
+                                           preferred_location=location, description="")
+        recommendations = crud.get_recommendations(db, student_form, use_ml=False)
+        assert {(item["sector"], item["location"]) for item in recommendations} == {("Finance", "Delhi")}
+        return sorted(item["id"] for item in recommendations)
+
+    # Scores still compare the typed sector text, the filter admits the same internships
+    assert recommended("fintech", "New Delhi") == recommended(" finance ", "NCR") == recommended("Finance", "Delhi")
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from app.ml_scoring import ML_SCORE_CEILING, ML_SCORE_FLOOR, _rows_that_can_reach_top_k
+from app.scoring import select_top_k
+
+
+def exhaustive_top_k(scores, k, ids):
+    # Full sort: best score first, lower id first among ties
+    return sorted(range(len(scores)), key=lambda idx: (-scores[idx], ids[idx]))[:k]
+
+
+@pytest.mark.parametrize("k", [1, 5, 20, 200])
+def test_select_top_k_matches_a_full_sort_with_ties(k):
+    rng = np.random.default_rng(k)
+    scores = rng.integers(0, 10, size=100).astype(float)  # Many ties, also at the k-th score
+    ids = rng.permutation(1000)[:100]
+
+    assert select_top_k(scores, k, ids).tolist() == exhaustive_top_k(scores, k, ids)
+
+
+def test_select_top_k_breaks_ties_by_id_not_by_position():
+    scores = np.array([50.0, 70.0, 50.0, 50.0])
+    ids = np.array([9, 4, 2, 7])
+    assert select_top_k(scores, 3, ids).tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pruned_rows_cannot_reach_the_top_k(seed):
+    rng = np.random.default_rng(seed)
+    rule_scores = np.round(rng.uniform(0, 60, size=500), 1)
+    ml_scores = rng.uniform(ML_SCORE_FLOOR, ML_SCORE_CEILING, size=500)
+    ids = np.arange(500)
+    totals = np.minimum(rule_scores + ml_scores, 100)
+
+    # Pruned rows skip ML scoring and are ranked last, as in calculate_enhanced_scores_batch
+    active = _rows_that_can_reach_top_k(rule_scores, 20)
+    assert not active.all()
+    pruned_totals = np.where(active, totals, -np.inf)
+
+    assert select_top_k(pruned_totals, 20, ids).tolist() == exhaustive_top_k(totals, 20, ids)
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app import schemas, serialization
+from app.serialization import dumps, loads
+from main import app
+from test_recommendations import db, forms  # noqa: F401 (fixture)
+
+DATA = [{"id": 1, "title": "Développeur intern", "match_score": 72.58, "sector": None, "tags": ["a", "b"]}, []]
+
+
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_dumps_matches_starlette_json_response(monkeypatch, orjson_available):
+    if orjson_available and not serialization.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", orjson_available)
+
+    body = dumps(DATA)
+    assert body == JSONResponse(DATA).body
+    assert loads(body) == DATA
+
+
+def test_recommendation_body_is_what_response_model_would_produce(db):
+    body = forms()[1].model_dump()
+    with TestClient(app) as client:
+        single = client.post("/api/recommendations/?use_ml=false", json=body)
+        batch = client.post("/api/recommendations/batch?use_ml=false", json=[body, body])
+
+    assert single.headers["content-type"] == "application/json"
+    # Fields outside RecommendationResponse (scoring_details) are dropped, as response_model did
+    validated = [schemas.RecommendationResponse.model_validate(item) for item in single.json()]
+    assert single.content == JSONResponse(jsonable_encoder(validated)).body
+    assert "scoring_details" not in single.json()[0]
+
+    assert batch.json() == [single.json(), single.json()]
+    assert batch.content == dumps(batch.json())
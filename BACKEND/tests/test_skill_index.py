@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+from app.catalog import CatalogSnapshot
+from app.skill_index import SkillIndex
+
+SKILLS = {1: "Python", 2: "JavaScript", 3: "Machine  Learning", 4: "SQL"}
+
+
+def make_snapshot(primary_skills, additional_skills=None):
+    rows = [
+        SimpleNamespace(id=internship_id, title="Intern", company_name="Acme", description="Work",
+                        duration="3 months", skills_id=skill_id, edu_id=None, sector_id=None, location_id=None)
+        for internship_id, skill_id in sorted(primary_skills.items())
+    ]
+    return CatalogSnapshot(rows, skills=SKILLS, sectors={}, locations={}, educations={},
+                           additional_skills=additional_skills or {})
+
+
+def test_sync_updates_only_changed_postings():
+    index = SkillIndex()
+    assert index.sync(make_snapshot({1: 1, 2: 2, 3: 1, 4: None}, {3: [4]})) == 4
+    before = index.freeze()
+    assert before.candidates(["python"]).tolist() == [1, 3]
+    assert before.candidates(["SQL"]).tolist() == [3]
+
+    # Same data again: nothing to touch
+    assert index.sync(make_snapshot({1: 1, 2: 2, 3: 1, 4: None}, {3: [4]})) == 0
+
+    # Internship 1 changes skill, 2 is deleted, 5 is added
+    assert index.sync(make_snapshot({1: 3, 3: 1, 4: None, 5: 2}, {3: [4]})) == 3
+    after = index.freeze()
+    assert after.candidates(["Python"]).tolist() == [3]
+    assert after.candidates(["javascript"]).tolist() == [5]
+    assert after.candidates(["machine learning"]).tolist() == [1]
+    assert len(index) == 4
+
+    # Earlier views keep the postings of their own snapshot
+    assert before.candidates(["python"]).tolist() == [1, 3]
+    assert before.candidates(["javascript"]).tolist() == [2]
+
+
+def test_candidates_match_skills_contained_in_the_internship_skills():
+    index = SkillIndex()
+    index.sync(make_snapshot({1: 1, 2: 2, 3: 3, 4: 4}))
+    postings = index.freeze()
+
+    assert postings.candidates(["script"]).tolist() == [2]
+    assert postings.candidates(["learning", "sql"]).tolist() == [3, 4]
+    assert postings.candidates(["Rust"]).tolist() == []
+    assert postings.candidates([]).tolist() == []
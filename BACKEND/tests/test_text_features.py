@@ -0,0 +1,42 @@
+import random
+import re
+import pytest
+from app.text_features import TECH_REPLACEMENTS, preprocess_text
+
+
+def sequential_preprocess(text):
+    # The replacement chain the single scan replaced: normalize, then one str.replace per term in order
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', re.sub(r'[^\w\s,]', ' ', text.lower()).replace(',', ' ')).strip()
+    for old_term, new_term in TECH_REPLACEMENTS.items():
+        text = text.replace(old_term, new_term)
+    return text
+
+
+@pytest.mark.parametrize("text", [
+    "Full-stack JavaScript developer",
+    "React Native, Node.js and TypeScript",
+    "Machine Learning / Artificial Intelligence",
+    # Chained: "javascript" becomes "js", which completes "node js"
+    "node javascript runtime",
+    # Overlapping: "big data" and "database" share "data", the earlier term wins
+    "bigdatabase tuning",
+    "big database",
+    "Business Intelligence & Quality Assurance",
+    "penetration testing, computer vision, natural language processing",
+    "",
+])
+def test_single_scan_matches_sequential_replacements(text):
+    assert preprocess_text(text) == sequential_preprocess(text)
+
+
+def test_single_scan_matches_sequential_replacements_on_generated_text():
+    words = ["python", "developer", "data", "base", "user", "node", "java", "script", "react", "native",
+             "big", "intelligence", "business", "js", "testing", "learning"]
+    terms = list(TECH_REPLACEMENTS)
+    rng = random.Random(3)
+    for _ in range(2000):
+        parts = [rng.choice(terms) if rng.random() < 0.4 else rng.choice(words) for _ in range(rng.randint(1, 8))]
+        text = rng.choice([" ", ", ", "/"]).join(parts)
+        assert preprocess_text(text) == sequential_preprocess(text), text
@@ -0,0 +1,78 @@
+import random
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app import ml_scoring
+from app.ml_scoring import ML_AVAILABLE, HybridRecommendationEngine
+from app.text_features import preprocess_text
+from app.vectorizers import HashingTfidfVectorizer
+
+pytestmark = pytest.mark.skipif(not ML_AVAILABLE, reason="ML libraries not installed")
+
+TOPICS = {
+    "Technology": "python django api backend server database cloud docker",
+    "Design": "figma sketch prototype typography branding illustration layout",
+    "Finance": "excel accounting audit valuation budgeting forecasting ledger",
+    "Marketing": "seo campaign content social media analytics copywriting",
+    "Data Science": "pandas statistics regression visualization tableau machine learning",
+}
+PROFILES = [
+    "python backend developer with docker and cloud",
+    "designer skilled in figma typography and branding",
+    "accounting student who knows excel and budgeting",
+    "seo and social media content writer",
+    "statistics regression and tableau visualization",
+]
+
+
+def make_internships(count=300, seed=7):
+    rng = random.Random(seed)
+    internships = []
+    for internship_id in range(1, count + 1):
+        sector = rng.choice(list(TOPICS))
+        words = TOPICS[sector].split()
+        internships.append(SimpleNamespace(
+            id=internship_id,
+            title=f"{sector} intern",
+            description=" ".join(rng.sample(words, 4) + [f"project{rng.randrange(1000)}", "internship", "team"]),
+            skill=SimpleNamespace(description=", ".join(rng.sample(words, 2))),
+            sector=SimpleNamespace(name=sector),
+            location=SimpleNamespace(description=rng.choice(["Pune", "Delhi", "Mumbai"]))
+        ))
+    return internships
+
+
+def profile_similarities(monkeypatch, tmp_path, vectorizer):
+    monkeypatch.setattr(ml_scoring, "ML_VECTORIZER", vectorizer)
+    engine = HybridRecommendationEngine()
+    engine.model_path = str(tmp_path / vectorizer)
+    assert engine.train_manually(make_internships(), force_retrain=True)
+    state = engine.state
+    vectors = state.tfidf_vectorizer.transform([preprocess_text(profile) for profile in PROFILES])
+    return (vectors @ state.tfidf_matrix.T).toarray()
+
+
+def test_hashing_vectorizer_ranks_like_the_tfidf_vectorizer(monkeypatch, tmp_path):
+    tfidf = profile_similarities(monkeypatch, tmp_path, "tfidf")
+    hashing = profile_similarities(monkeypatch, tmp_path, "hashing")
+
+    # Similarities on the same scale, so ML scores are not all clamped to the floor
+    assert np.allclose(hashing.max(axis=1), tfidf.max(axis=1), rtol=0.1)
+    for tfidf_row, hashing_row in zip(tfidf, hashing):
+        top_tfidf = set(np.argsort(-tfidf_row, kind="stable")[:20])
+        top_hashing = set(np.argsort(-hashing_row, kind="stable")[:20])
+        assert len(top_tfidf & top_hashing) >= 16
+
+
+def test_hashing_vectorizer_drops_features_above_max_df_and_beyond_max_features():
+    documents = ["common alpha", "common beta", "common gamma", "common alpha beta"]
+    vectorizer = HashingTfidfVectorizer(n_features=2 ** 10, ngram_range=(1, 1), stop_words=None,
+                                        max_df=0.9, max_features=2)
+    matrix = vectorizer.fit_transform(documents)
+
+    features = {term: vectorizer.transform([term]).indices.tolist() for term in ("common", "alpha", "beta", "gamma")}
+    # "common" is in every document, "gamma" is the least frequent of the rest
+    assert features["common"] == [] and features["gamma"] == []
+    assert len(features["alpha"]) == 1 and len(features["beta"]) == 1
+    assert matrix[2].nnz == 0
+    assert np.allclose(matrix[3].toarray().sum(), np.sqrt(2))